@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class ApiConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'api'
+
+    def ready(self):
+        # counters for the tables behind the ETags (conditional.py)
+        from django.db.models.signals import post_migrate
+        from .conditional import create_table_versions
+        post_migrate.connect(create_table_versions, sender=self)
@@ -0,0 +1,40 @@
+# backend/api/authentication.py
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+
+from apps.Users.roles import auth_state
+
+
+class RoleTokenUser(TokenUser):
+    """Request user built from the access token claims, no BaseUser row behind it."""
+
+    @cached_property
+    def roles(self):
+        return self.token.get("roles", [])
+
+    @cached_property
+    def primary_role(self):
+        return self.token.get("primary_role")
+
+
+class RoleClaimsAuthentication(JWTStatelessUserAuthentication):
+    """JWT authentication that trusts the role claims instead of loading the user.
+
+    The only lookup is the user's role_version and is_active, so deactivated
+    users and tokens issued before a role change are turned away. It comes
+    from settings.ROLE_VERSION_CACHE when that names a shared cache, and is
+    one indexed read of the user row otherwise. Views that need the full
+    model (e.g. to save it) should use JWTAuthentication instead.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        row = auth_state(user.id)
+        if row is None or not row[1]:
+            raise AuthenticationFailed(_("User not found or inactive."), code="user_inactive")
+        if validated_token.get("rv") != row[0]:
+            raise InvalidToken(_("Roles changed since this token was issued."))
+        return user
@@ -0,0 +1,158 @@
+# backend/api/batch.py
+"""
+Several API calls in one HTTP round trip.
+
+Each sub-request is resolved and run in-process with the caller's headers
+(so the same token authorizes it) and rendered the way it would be on its
+own. Consecutive GET/HEAD sub-requests run concurrently on a thread pool;
+anything else waits for the ones before it and holds back the ones after,
+so writes keep their order. Sub-requests skip the middleware, the batch
+request itself goes through it once.
+"""
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connection, connections
+from django.urls import Resolver404, resolve
+from rest_framework import serializers
+
+from .renderers import dumps
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD")
+# Request headers a sub-request never inherits from the batch request
+DROPPED_HEADERS = ("CONTENT_TYPE", "CONTENT_LENGTH", "HTTP_ACCEPT_ENCODING", "HTTP_IF_NONE_MATCH",
+                   "HTTP_IF_MODIFIED_SINCE")
+
+
+def max_requests():
+    return getattr(settings, "BATCH_MAX_REQUESTS", 20)
+
+
+def max_workers():
+    return getattr(settings, "BATCH_MAX_WORKERS", 4)
+
+
+class SubRequestSerializer(serializers.Serializer):
+    # Echoed back so the client can match responses without counting
+    id = serializers.CharField(required=False, max_length=100)
+    method = serializers.ChoiceField(choices=["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE"], default="GET")
+    # Absolute path (/api/users/?page_size=5) or a full URL such as a `next` link
+    path = serializers.CharField(max_length=2000)
+    body = serializers.JSONField(required=False)
+    headers = serializers.DictField(child=serializers.CharField(), required=False)
+
+    def validate_path(self, value):
+        parts = urlsplit(value)
+        path = parts.path
+        if not path.startswith("/"):
+            raise serializers.ValidationError("Use an absolute path such as /api/users/.")
+        return path + (f"?{parts.query}" if parts.query else "")
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = SubRequestSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, value):
+        if len(value) > max_requests():
+            raise serializers.ValidationError(f"At most {max_requests()} requests per batch.")
+        return value
+
+
+def _environ(request, call):
+    """WSGI environ for `call`, based on the batch request's own."""
+    path, _, query = call["path"].partition("?")
+    environ = {k: v for k, v in request.META.items() if k not in DROPPED_HEADERS}
+    body = dumps(call["body"]) if "body" in call else b""
+    environ.update({
+        "REQUEST_METHOD": call["method"],
+        "PATH_INFO": path,
+        "SCRIPT_NAME": "",
+        "QUERY_STRING": query,
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": io.BytesIO(body),
+    })
+    if body:
+        environ["CONTENT_TYPE"] = "application/json"
+    for name, value in call.get("headers", {}).items():
+        environ["HTTP_" + name.upper().replace("-", "_")] = value
+    return environ
+
+
+def _body(response):
+    if not response.content:
+        return None
+    if response.get("Content-Type", "").startswith("application/json"):
+        return json.loads(response.content)
+    return response.content.decode(response.charset or "utf-8", errors="replace")
+
+
+def run_one(request, call, batch_path):
+    """Status, headers and decoded body of one sub-request."""
+    result = {"status": 500, "headers": {}, "body": None}
+    if "id" in call:
+        result["id"] = call["id"]
+    path = call["path"].partition("?")[0]
+    if path == batch_path:
+        return {**result, "status": 400, "body": {"detail": "Batches can't be nested."}}
+    try:
+        match = resolve(path, getattr(request, "urlconf", None))
+    except Resolver404:
+        return {**result, "status": 404, "body": {"detail": "Not found."}}
+
+    sub_request = WSGIRequest(_environ(request, call))
+    sub_request.resolver_match = match
+    try:
+        response = match.func(sub_request, *match.args, **match.kwargs)
+        if hasattr(response, "render"):
+            response.render()
+        if response.streaming:
+            return {**result, "status": 400, "body": {"detail": "Streamed responses can't be batched."}}
+        return {**result, "status": response.status_code, "headers": dict(response.items()), "body": _body(response)}
+    except Exception:
+        logger.exception("Batch sub-request %s %s failed", call["method"], call["path"])
+        return {**result, "body": {"detail": "Server error."}}
+
+
+def _run_in_thread(request, call, batch_path):
+    try:
+        return run_one(request, call, batch_path)
+    finally:
+        # Worker threads open their own connections, don't leave them behind
+        connections.close_all()
+
+
+def run_batch(request, calls, batch_path):
+    """Results of `calls` in order; runs of GET/HEAD calls go out concurrently."""
+    results = [None] * len(calls)
+    # Other threads can't see an open transaction's rows (ATOMIC_REQUESTS, tests)
+    concurrent = max_workers() > 1 and not connection.in_atomic_block
+    groups, current = [], []
+    for index, call in enumerate(calls):
+        if call["method"] in SAFE_METHODS and concurrent:
+            current.append(index)
+            continue
+        if current:
+            groups.append(current)
+            current = []
+        groups.append([index])
+    if current:
+        groups.append(current)
+
+    with ThreadPoolExecutor(max_workers=max_workers()) if concurrent else nullcontext() as pool:
+        for group in groups:
+            if len(group) == 1:
+                results[group[0]] = run_one(request, calls[group[0]], batch_path)
+                continue
+            futures = {index: pool.submit(_run_in_thread, request, calls[index], batch_path) for index in group}
+            for index, future in futures.items():
+                results[index] = future.result()
+    return results
+
@@ -0,0 +1,148 @@
+# backend/api/conditional.py
+"""
+Conditional GET from per-table change counters.
+
+Every tracked table has a version counter in the api_table_version table,
+bumped by the model's post_save/post_delete (or m2m_changed) signals. A
+view's ETag is built from the versions of the tables it reads plus the
+request path and user, so `If-None-Match` is answered with a 304 before
+the queryset is touched or anything is serialized.
+
+The counters live in the database so every worker sees the same ones, and
+a bump inside a transaction becomes visible together with the rows it
+describes. No Last-Modified is sent: with whole-second resolution a second
+change within the same second would be answered with a stale 304.
+
+Bulk writes (bulk_create, QuerySet.update/delete) send no signals; code
+doing them calls bump_table_version() itself.
+"""
+import hashlib
+import time
+
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from .models import TableVersion
+
+# Tables registered through track_table_changes()
+_tracked = set()
+
+
+def _table(model):
+    return model._meta.db_table
+
+
+def table_versions(*models):
+    """Current version of each model's table, in one query once the counters exist."""
+    tables = [_table(model) for model in models]
+    found = dict(TableVersion.objects.filter(table__in=tables).values_list("table", "version"))
+    missing = [table for table in tables if table not in found]
+    if missing:
+        _create_counters(missing)
+        found.update(TableVersion.objects.filter(table__in=missing).values_list("table", "version"))
+    return [found[table] for table in tables]
+
+
+def _create_counters(tables):
+    # A new counter starts from the clock, never below a version a client may still hold
+    start = int(time.time() * 1000)
+    TableVersion.objects.bulk_create(
+        [TableVersion(table=table, version=start) for table in tables], ignore_conflicts=True
+    )
+
+
+def bump_table_version(*models):
+    tables = [_table(model) for model in models]
+    if TableVersion.objects.filter(table__in=tables).update(version=F("version") + 1) < len(tables):
+        # First change to some of them, existing counters are left alone
+        _create_counters(tables)
+
+
+def create_table_versions(sender=None, using="default", **kwargs):
+    """post_migrate hook, every tracked table gets its counter so reading them stays one query."""
+    start = int(time.time() * 1000)
+    TableVersion.objects.using(using).bulk_create(
+        [TableVersion(table=table, version=start) for table in sorted(_tracked)], ignore_conflicts=True
+    )
+
+
+def track_table_changes(*models):
+    """Bump a model's version whenever one of its rows is saved or deleted."""
+    for model in models:
+        _tracked.add(_table(model))
+        if model._meta.auto_created:
+            # Many-to-many through table, changed via m2m_changed only
+            m2m_changed.connect(_bump_m2m, sender=model, dispatch_uid=f"table_version_{_table(model)}")
+            continue
+        post_save.connect(_bump_row, sender=model, dispatch_uid=f"table_version_save_{_table(model)}")
+        post_delete.connect(_bump_row, sender=model, dispatch_uid=f"table_version_delete_{_table(model)}")
+
+
+def _bump_row(sender, **kwargs):
+    bump_table_version(sender)
+
+
+def _bump_m2m(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_table_version(sender)
+
+
+class NotModified(APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+
+
+def _strip_weak(etag):
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+class ConditionalGetMixin:
+    """
+    ETag for GET views from the versions of `conditional_models`, checked
+    after authentication and permissions and before the handler runs.
+    """
+    conditional_models = ()
+
+    def get_versions(self, request):
+        """Versions the representation depends on."""
+        return table_versions(*self.conditional_models)
+
+    def get_etag(self, request):
+        versions = self.get_versions(request)
+        user_id = getattr(request.user, "pk", None) or getattr(request.user, "id", "")
+        # Path and query string pick the representation, the user who may see it
+        key = f"{request.get_full_path()}|{user_id}|{request.headers.get('Accept', '')}"
+        digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+        return f'W/"{"-".join(str(v) for v in versions)}-{digest}"'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = None
+        if request.method not in ("GET", "HEAD") or not self.conditional_models:
+            return
+        self.etag = etag = self.get_etag(request)
+
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            if if_none_match.strip() == "*" or _strip_weak(etag) in map(_strip_weak, parse_etags(if_none_match)):
+                raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            # No body, only the validators
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, "etag", None)
+        if etag and response.status_code in (200, 304):
+            response["ETag"] = etag
+            # Clients keep the copy but must ask before reusing it
+            response["Cache-Control"] = "private, no-cache"
+            patch_vary_headers(response, ("Authorization", "Accept"))
+        return response
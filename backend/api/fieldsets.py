@@ -0,0 +1,142 @@
+# backend/api/fieldsets.py
+"""
+Sparse fieldsets and on-demand expansion.
+
+`?fields=id,username` keeps only the listed fields, `?expand=<name>` adds
+a nested object listed in the serializer's `Meta.expandable_fields`.
+Dotted names reach into nested serializers (`?fields=user.username`).
+The view mixin narrows the queryset to match: `only()` the columns that
+are rendered, `select_related()` only the relations that are.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+def split_names(value):
+    """`"a, b,,c"` -> `["a", "b", "c"]`."""
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+def _nested(names):
+    """Top-level names, and what follows each of them after a dot."""
+    top, rest = [], {}
+    for name in names:
+        head, _, tail = name.partition(".")
+        if head not in top:
+            top.append(head)
+        if tail:
+            rest.setdefault(head, []).append(tail)
+    return top, rest
+
+
+class DynamicFieldsMixin:
+    """
+    ModelSerializer mixin for `fields` / `expand`, given as keyword arguments
+    or, on the top-level serializer, taken from the request's query string.
+
+    Meta.expandable_fields maps a field name to `(serializer class, kwargs)`;
+    such fields are only rendered when expanded.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sparse_fields = fields
+        self._expand = expand
+
+    def _requested(self):
+        fields, expand = self._sparse_fields, self._expand
+        request = self.context.get("request")
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if request is not None and parent is None:
+            params = request.query_params
+            if fields is None and params.get(FIELDS_PARAM):
+                fields = split_names(params[FIELDS_PARAM])
+            if expand is None:
+                expand = split_names(params.get(EXPAND_PARAM))
+        return fields, expand or []
+
+    def get_fields(self):
+        fields = super().get_fields()
+        only, expand = self._requested()
+        expand, expand_rest = _nested(expand)
+        for name, (serializer_class, options) in getattr(self.Meta, "expandable_fields", {}).items():
+            if name in expand:
+                fields[name] = serializer_class(read_only=True, **options)
+
+        if only is not None:
+            only, only_rest = _nested(only)
+            # An expanded field is asked for explicitly, keep it
+            fields = {name: f for name, f in fields.items() if name in only or name in expand}
+        else:
+            only_rest = {}
+
+        for name, field in fields.items():
+            if isinstance(field, DynamicFieldsMixin):
+                field._sparse_fields = only_rest.get(name, field._sparse_fields)
+                field._expand = expand_rest.get(name, field._expand)
+        return fields
+
+    def optimize_queryset(self, queryset, extra=()):
+        """`queryset` reading only what this serializer renders, plus the `extra` columns."""
+        columns, related = query_plan(self)
+        if related:
+            queryset = queryset.select_related(*related)
+        if columns is not None:
+            queryset = queryset.only(*dict.fromkeys([*columns, *extra]))
+        return queryset
+
+
+def query_plan(serializer, prefix=""):
+    """
+    (columns, relations) a model serializer reads, for `only()` and
+    `select_related()`. Columns is None when some field reads something
+    other than a plain column; the queryset then loads every column.
+    """
+    model = serializer.Meta.model
+    columns, related = [prefix + model._meta.pk.name], []
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if isinstance(field, (serializers.ManyRelatedField, serializers.ListSerializer)):
+            # Not a column, fetched by the serializer or the view
+            continue
+        source = field.source
+        if source == "*" or "." in source:
+            columns = None
+            continue
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            # Property or method, may read anything
+            columns = None
+            continue
+        if not model_field.concrete or model_field.many_to_many:
+            continue
+        if columns is not None:
+            columns.append(prefix + source)
+        if isinstance(field, serializers.ModelSerializer):
+            nested_columns, nested_related = query_plan(field, prefix + source + "__")
+            related += [prefix + source, *nested_related]
+            if nested_columns is None:
+                columns = None
+            elif columns is not None:
+                columns += nested_columns
+    return columns, related
+
+
+class DynamicFieldsViewMixin:
+    """Narrows get_queryset() to the fields the request's serializer renders."""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer = self.get_serializer()
+        if not isinstance(serializer, DynamicFieldsMixin):
+            return queryset
+        # Ordering columns are read back by cursor pagination
+        ordering = [f for f in getattr(self, "ordering_fields", None) or () if f != "__all__"]
+        return serializer.optimize_queryset(queryset, extra=ordering)
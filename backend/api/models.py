@@ -0,0 +1,11 @@
+# backend/api/models.py
+from django.db import models
+
+
+class TableVersion(models.Model):
+    """Change counter of one database table, see api/conditional.py."""
+    table = models.CharField(max_length=100, primary_key=True)
+    version = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.table} v{self.version}"
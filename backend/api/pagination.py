@@ -0,0 +1,14 @@
+# backend/api/pagination.py
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """Keyset pagination on the primary key.
+
+    Each page is a `WHERE id > cursor LIMIT n` query, so deep pages cost the
+    same as the first one, unlike OFFSET based pagination.
+    """
+    ordering = "id"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
@@ -0,0 +1,53 @@
+# backend/api/permissions.py
+from rest_framework.permissions import BasePermission
+
+from apps.Users.roles import resolve_roles
+
+
+def request_roles(request):
+    """Roles of the requesting user, from the token when available."""
+    user = request.user
+    if not user or not user.is_authenticated:
+        return []
+    roles = getattr(user, "roles", None)
+    if roles is None:
+        # Model user (session or JWTAuthentication), fall back to the role cache
+        roles, _ = resolve_roles(user.pk)
+    return roles
+
+
+class HasRole(BasePermission):
+    """Allows the request when the user holds any of `required_roles`."""
+    required_roles = ()
+
+    def has_permission(self, request, view):
+        return any(role in self.required_roles for role in request_roles(request))
+
+
+def role_required(*roles):
+    """Build a HasRole permission class for the given roles."""
+    return type("HasRole_" + "_".join(roles), (HasRole,), {"required_roles": roles})
+
+
+class IsAdminRole(HasRole):
+    required_roles = ("admin",)
+
+
+class IsFaculty(HasRole):
+    required_roles = ("faculty",)
+
+
+class IsStaff(HasRole):
+    required_roles = ("staff",)
+
+
+class IsStudent(HasRole):
+    required_roles = ("student",)
+
+
+class IsRegistrar(HasRole):
+    required_roles = ("registrar",)
+
+
+class IsOrgOfficer(HasRole):
+    required_roles = ("org_officer",)
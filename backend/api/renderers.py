@@ -0,0 +1,73 @@
+# backend/api/renderers.py
+"""
+JSON rendering and parsing through orjson, falling back to DRF's stdlib
+implementation when orjson is not installed or a response asks for
+indentation (browsable API, `Accept: application/json; indent=4`).
+"""
+import json
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional, the stdlib json module is used instead
+    orjson = None
+
+# DRF's encoder formats datetimes, decimals, lazy strings and the like;
+# orjson hands it every type it doesn't serialize natively
+_encoder = JSONEncoder()
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+
+def dumps(data):
+    """JSON bytes for `data`, the same text DRF's JSONRenderer produces (compact)."""
+    if orjson is not None:
+        ret = orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS)
+        # DRF escapes these so the output stays a strict JavaScript subset
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+    ret = json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":"))
+    return ret.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+def stream_json_array(chunks):
+    """
+    Yield a JSON array piece by piece from an iterable of lists, so a large
+    listing is sent while later rows are still being read and serialized.
+    """
+    yield b"["
+    first = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if not first:
+            yield b","
+        yield dumps(chunk)[1:-1]
+        first = False
+    yield b"]"
@@ -0,0 +1,188 @@
+# backend/api/throttling.py
+"""
+Sliding-window throttles kept in the Django cache.
+
+A window is approximated from two fixed-window counters, the current one and
+the previous one weighted by how much of it still overlaps the window. That
+is two integers per client, bumped with cache.incr(), where DRF's
+SimpleRateThrottle keeps a list with one timestamp per request. Every counter
+expires after two windows and lives in the THROTTLE_CACHE alias, so a flood
+from many addresses or identifiers culls throttle entries, not the role cache.
+
+Throttles run in APIView.initial(), so a rejected login never reaches the
+password check. DRF asks every throttle even after one has refused, so views
+using these take SlidingWindowThrottleMixin, which counts a request only once
+all of them let it through.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+RATE_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """Rate string to (count, seconds): "5/15m" -> (5, 900), "60/m" -> (60, 60)."""
+    num, period = rate.split("/")
+    count = period[:-1] or "1"
+    return int(num), int(count) * RATE_PERIODS[period[-1]]
+
+
+def throttle_cache():
+    try:
+        return caches[getattr(settings, "THROTTLE_CACHE", "throttle")]
+    except InvalidCacheBackendError:
+        return caches["default"]
+
+
+class SlidingWindowCounter:
+    def __init__(self, prefix, limit, window):
+        self.prefix = prefix
+        self.limit = limit
+        self.window = window
+
+    def _keys(self, ident, now):
+        index = int(now // self.window)
+        current = f"throttle:{self.prefix}:{ident}:{index}"
+        previous = f"throttle:{self.prefix}:{ident}:{index - 1}"
+        # Share of the previous window still inside the sliding one
+        overlap = 1 - (now % self.window) / self.window
+        return current, previous, overlap
+
+    def count(self, ident, now=None):
+        current, previous, overlap = self._keys(ident, time.time() if now is None else now)
+        found = throttle_cache().get_many([current, previous])
+        return found.get(current, 0) + found.get(previous, 0) * overlap
+
+    def hit(self, ident, now=None):
+        current, _, _ = self._keys(ident, time.time() if now is None else now)
+        store = throttle_cache()
+        # Kept for two windows, the current one and as the next one's previous
+        if not store.add(current, 1, self.window * 2):
+            try:
+                store.incr(current)
+            except ValueError:
+                # Expired or culled in between
+                store.set(current, 1, self.window * 2)
+
+    def release(self, ident, now=None):
+        """Take back one hit of the current window."""
+        current, _, _ = self._keys(ident, time.time() if now is None else now)
+        try:
+            throttle_cache().decr(current)
+        except ValueError:
+            pass
+
+    def reset(self, ident, now=None):
+        current, previous, _ = self._keys(ident, time.time() if now is None else now)
+        throttle_cache().delete_many([current, previous])
+
+    def wait(self, now=None):
+        """Seconds until the current window rolls over, when the count starts to drop."""
+        now = time.time() if now is None else now
+        return max(self.window - now % self.window, 1)
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Rate from REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"][scope]. Every allowed
+    request is counted (record_attempt(), called by SlidingWindowThrottleMixin);
+    with `refunds_success` record_success() takes its hit back, leaving failed
+    and in-flight attempts. With `counts_failures` only record_failure() adds
+    to the count and success clears it.
+    """
+    scope = None
+    counts_failures = False
+    refunds_success = False
+
+    def __init__(self):
+        limit, window = parse_rate(api_settings.DEFAULT_THROTTLE_RATES[self.scope])
+        self.counter = SlidingWindowCounter(self.scope, limit, window)
+        self.wait_time = None
+
+    def get_ident_key(self, request):
+        """Who is counted, None to let the request through uncounted."""
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        ident = self.get_ident_key(request)
+        if ident is None:
+            return True
+        if self.counter.count(ident) >= self.counter.limit:
+            self.wait_time = self.counter.wait()
+            return False
+        return True
+
+    def record_attempt(self, request):
+        ident = self.get_ident_key(request)
+        if ident is not None and not self.counts_failures:
+            self.counter.hit(ident)
+
+    def record_failure(self, request):
+        ident = self.get_ident_key(request)
+        if ident is not None and self.counts_failures:
+            self.counter.hit(ident)
+
+    def record_success(self, request):
+        ident = self.get_ident_key(request)
+        if ident is None:
+            return
+        if self.counts_failures:
+            self.counter.reset(ident)
+        elif self.refunds_success:
+            self.counter.release(ident)
+
+    def wait(self):
+        return self.wait_time
+
+
+class SlidingWindowThrottleMixin:
+    """
+    For views throttled with SlidingWindowThrottle: a request one throttle
+    refuses is not counted by the others, so e.g. an address isn't charged
+    for attempts its locked identifier never got to make.
+    """
+
+    def check_throttles(self, request):
+        super().check_throttles(request)
+        for throttle in self.get_throttles():
+            if isinstance(throttle, SlidingWindowThrottle):
+                throttle.record_attempt(request)
+
+
+class LoginIPThrottle(SlidingWindowThrottle):
+    """
+    Login attempts from one address that failed or are still running. Counted
+    up front so a concurrent burst can't get past the check all at once;
+    successful logins don't count, so a campus behind one NAT address isn't
+    throttled for its own traffic.
+    """
+    scope = "login_ip"
+    refunds_success = True
+
+    def get_ident_key(self, request):
+        return self.get_ident(request)
+
+
+class LoginIdentifierThrottle(SlidingWindowThrottle):
+    """
+    Failed logins for one username or email from one address. Counting per
+    address too means failures from elsewhere can't lock the owner out of
+    their account; guessing from many addresses is still bounded by each
+    address's LoginIPThrottle.
+    """
+    scope = "login_identifier"
+    counts_failures = True
+
+    def get_ident_key(self, request):
+        identifier = request.data.get("identifier") if hasattr(request.data, "get") else None
+        if not isinstance(identifier, str) or not identifier:
+            return None
+        key = f"{identifier.strip().lower()}|{self.get_ident(request)}"
+        # Fixed-length keys whatever an attacker sends, and no identifiers in the cache
+        return hashlib.blake2b(key.encode(), digest_size=12).hexdigest()
@@ -0,0 +1,9 @@
+# backend/api/urls.py
+from django.urls import path
+
+from .views import BatchAPIView, RequestStatsAPIView
+
+urlpatterns = [
+    path("batch/", BatchAPIView.as_view(), name="batch"),
+    path("stats/requests/", RequestStatsAPIView.as_view(), name="request-stats"),
+]
@@ -0,0 +1,41 @@
+# backend/api/views.py
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.Users.roles import role_cache
+from middleware.mw import endpoint_stats
+
+from .batch import BatchSerializer, run_batch
+from .permissions import IsAdminRole
+
+
+class RequestStatsAPIView(APIView):
+    """Rolling per-endpoint latency of this worker process, slowest first. DELETE resets it."""
+    permission_classes = [IsAdminRole]
+
+    def get(self, request):
+        return Response({"endpoints": endpoint_stats.snapshot(), "role_cache": role_cache.stats()})
+
+    def delete(self, request):
+        endpoint_stats.reset()
+        return Response(status=204)
+
+
+class BatchAPIView(APIView):
+    """
+    Runs a list of API calls and returns every response in one payload.
+
+    Body: {"requests": [{"id": "users", "method": "GET", "path": "/api/users/?page_size=50"}, ...]}
+    Returns {"responses": [{"id": "users", "status": 200, "headers": {...}, "body": ...}, ...]} in
+    request order. Sub-requests authenticate with this request's Authorization header.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        ser = BatchSerializer(data=request.data)
+        if not ser.is_valid():
+            return Response({"errors": ser.errors}, status=status.HTTP_400_BAD_REQUEST)
+        responses = run_batch(request._request, ser.validated_data["requests"], request.path)
+        return Response({"responses": responses}, status=status.HTTP_200_OK)
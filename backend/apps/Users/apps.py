@@ -10,6 +10,11 @@ class UsersConfig(AppConfig):
         # import signals
         from . import signals
 
+        # keep the SQLite search shadow table wired up after migrations
+        from django.db.models.signals import post_migrate
+        from .search import restore_search_index
+        post_migrate.connect(restore_search_index, sender=self)
+
         # ensure roles exist
         from .roles import ensure_roles
         try:
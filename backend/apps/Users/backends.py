@@ -0,0 +1,28 @@
+# backend/apps/Users/backends.py
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .lookups import find_user
+
+User = get_user_model()
+
+
+class IdentifierBackend(ModelBackend):
+    """
+    ModelBackend that takes a username or an email, resolved in one query
+    through the Lower() indexes (see lookups.py). Inactive accounts fail like
+    a wrong password, and authenticate() still sends user_login_failed.
+    """
+
+    def authenticate(self, request, username=None, password=None, identifier=None, **kwargs):
+        identifier = identifier or username or kwargs.get(User.USERNAME_FIELD)
+        if not identifier or password is None:
+            return None
+        user = find_user(identifier)
+        if user is None:
+            # Hash anyway so unknown accounts cost the same as known ones
+            User().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,246 @@
+# backend/apps/Users/campus.py
+"""
+Deterministic synthetic campus for benchmarks and load tests.
+
+The same seed and sizes always produce the same programs, sections,
+departments, accounts and profiles, so numbers from different runs and
+machines compare. Everything goes in with bulk_create and every account
+shares one password hash, hashing once instead of per user.
+
+Generated accounts carry the CAMPUS_PREFIX institutional id, so they can be
+found and removed again without touching real ones. Organizations,
+memberships, classes, announcements and messages get a step in
+CampusGenerator.run() once those apps have models.
+"""
+import random
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from .models import (
+    FacultyDepartment, FacultyProfile, Position, Program, Section,
+    StaffProfile, StudentProfile,
+)
+from api.conditional import bump_table_version
+
+from .roles import group_id
+
+User = get_user_model()
+
+CAMPUS_PREFIX = "CAMPUS-"
+CAMPUS_ADMIN = "campus_admin"
+CAMPUS_PASSWORD = "password123"
+DEFAULT_SEED = 2025
+BATCH_SIZE = 2000
+
+# (program, section code)
+PROGRAMS = [
+    ("BS Information Technology", "IT"),
+    ("BS Computer Science", "CS"),
+    ("BS Information Systems", "IS"),
+    ("BS Civil Engineering", "CE"),
+    ("BS Mechanical Engineering", "ME"),
+    ("BS Electrical Engineering", "EE"),
+    ("BS Agriculture", "AG"),
+    ("BS Agricultural Engineering", "AE"),
+    ("BS Forestry", "FO"),
+    ("BS Biology", "BIO"),
+    ("BS Chemistry", "CHM"),
+    ("BS Mathematics", "MTH"),
+    ("BS Nursing", "NUR"),
+    ("BS Accountancy", "ACC"),
+    ("BS Business Administration", "BA"),
+    ("BS Hospitality Management", "HM"),
+    ("BS Secondary Education", "SED"),
+    ("BS Elementary Education", "EED"),
+    ("BA Communication", "COM"),
+    ("BA Psychology", "PSY"),
+]
+DEPARTMENTS = [
+    "CISC", "Engineering", "Agriculture", "Forestry", "Natural Sciences",
+    "Nursing", "Business", "Education", "Arts and Sciences", "Registrar",
+]
+POSITIONS = [
+    "Instructor 1", "Instructor 2", "Instructor 3",
+    "Assistant Professor", "Associate Professor", "Professor",
+]
+JOB_TITLES = ["clerk", "registrar", "librarian", "guidance counselor", "technician", "cashier"]
+FIRST_NAMES = [
+    "Juan", "Maria", "Jose", "Ana", "Mark", "Angel", "John", "Mary", "James", "Grace",
+    "Paolo", "Camille", "Miguel", "Andrea", "Carlo", "Nicole", "Rafael", "Patricia", "Gabriel", "Kristine",
+    "Adrian", "Bea", "Christian", "Danica", "Emmanuel", "Faith", "Gerald", "Hazel", "Ivan", "Joy",
+]
+LAST_NAMES = [
+    "Dela Cruz", "Santos", "Reyes", "Cruz", "Bautista", "Ocampo", "Garcia", "Mendoza", "Torres", "Flores",
+    "Gonzales", "Ramos", "Aquino", "Castillo", "Villanueva", "Rivera", "Navarro", "Domingo", "Salazar", "Mercado",
+    "Lim", "Tan", "Sy", "Uy", "Go", "Abad", "Baluyot", "Cabrera", "Dizon", "Estrada",
+]
+SECTIONS_PER_YEAR = 3
+YEAR_LEVELS = 4
+
+
+@dataclass
+class CampusSummary:
+    students: int = 0
+    faculty: int = 0
+    staff: int = 0
+    programs: int = 0
+    sections: int = 0
+    departments: int = 0
+    seconds: float = 0.0
+
+    @property
+    def users(self):
+        return self.students + self.faculty + self.staff + 1
+
+
+def campus_users():
+    """Every generated account, admin included."""
+    return User.objects.filter(institutional_id__startswith=CAMPUS_PREFIX)
+
+
+def campus_exists():
+    return campus_users().exists()
+
+
+class CampusGenerator:
+    def __init__(self, students=30000, faculty=1500, staff=500, seed=DEFAULT_SEED, batch_size=BATCH_SIZE):
+        self.students = students
+        self.faculty = faculty
+        self.staff = staff
+        self.seed = seed
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+
+    def run(self):
+        start = time.perf_counter()
+        summary = CampusSummary()
+        self.password = make_password(CAMPUS_PASSWORD)
+        with transaction.atomic():
+            self._lookups(summary)
+            self._admin()
+            self._students(summary)
+            self._faculty(summary)
+            self._staff(summary)
+        bump_table_version(User, User.groups.through, StudentProfile, FacultyProfile, StaffProfile)
+        summary.seconds = time.perf_counter() - start
+        return summary
+
+    def flush(self):
+        """Delete the generated accounts (profiles and memberships cascade)."""
+        deleted, _ = campus_users().delete()
+        return deleted
+
+    def _lookups(self, summary):
+        programs = [Program(program_name=name) for name, _ in PROGRAMS]
+        sections = [
+            Section(section_name=f"{code}-{year}{chr(65 + n)}")
+            for _, code in PROGRAMS
+            for year in range(1, YEAR_LEVELS + 1)
+            for n in range(SECTIONS_PER_YEAR)
+        ]
+        Program.objects.bulk_create(programs, ignore_conflicts=True)
+        Section.objects.bulk_create(sections, ignore_conflicts=True)
+        FacultyDepartment.objects.bulk_create(
+            [FacultyDepartment(department_name=name) for name in DEPARTMENTS], ignore_conflicts=True,
+        )
+        Position.objects.bulk_create([Position(position_name=name) for name in POSITIONS], ignore_conflicts=True)
+
+        # ignore_conflicts leaves pks unset, read them back by name
+        self.program_ids = dict(Program.objects.filter(program_name__in=[p for p, _ in PROGRAMS])
+                                .values_list("program_name", "id"))
+        self.section_ids = dict(Section.objects.filter(section_name__in=[s.section_name for s in sections])
+                                .values_list("section_name", "id"))
+        self.department_ids = list(FacultyDepartment.objects.filter(department_name__in=DEPARTMENTS)
+                                   .order_by("department_name").values_list("id", flat=True))
+        self.position_ids = list(Position.objects.filter(position_name__in=POSITIONS)
+                                 .order_by("position_name").values_list("id", flat=True))
+        summary.programs = len(self.program_ids)
+        summary.sections = len(self.section_ids)
+        summary.departments = len(self.department_ids)
+
+    def _person(self, role, username, inst_id):
+        first = self.rng.choice(FIRST_NAMES)
+        last = self.rng.choice(LAST_NAMES)
+        return User(
+            username=username,
+            email=f"{username}@cmu.edu.ph",
+            password=self.password,
+            first_name=first,
+            last_name=last,
+            institutional_id=f"{CAMPUS_PREFIX}{inst_id}",
+            role_type=role,
+        )
+
+    def _bulk_people(self, role, count, make_user, make_profile, profile_model):
+        """Create users, their profiles and role membership in batches of batch_size."""
+        Membership = User.groups.through
+        role_group = group_id(role)
+        for offset in range(0, count, self.batch_size):
+            chunk = range(offset, min(offset + self.batch_size, count))
+            # User and profile draws interleave per row, so batch_size doesn't change the data
+            rows = [(make_user(n), make_profile(n)) for n in chunk]
+            users = User.objects.bulk_create([user for user, _ in rows])
+            profile_model.objects.bulk_create(
+                [profile_model(user_id=user.pk, **profile) for user, (_, profile) in zip(users, rows)]
+            )
+            Membership.objects.bulk_create(Membership(baseuser_id=user.pk, group_id=role_group) for user in users)
+
+    def _admin(self):
+        admin = self._person("admin", CAMPUS_ADMIN, "A-00001")
+        admin.is_staff = True
+        admin.save()
+        admin.groups.add(group_id("admin"))
+
+    def _students(self, summary):
+        programs = [(self.program_ids[name], code) for name, code in PROGRAMS]
+
+        def make_user(n):
+            return self._person("student", f"stu{n + 1:06d}", f"S-{n + 1:06d}")
+
+        def make_profile(n):
+            program_id, code = self.rng.choice(programs)
+            year = self.rng.randint(1, YEAR_LEVELS)
+            section = f"{code}-{year}{chr(65 + self.rng.randrange(SECTIONS_PER_YEAR))}"
+            return {
+                "program_id": program_id,
+                "section_id": self.section_ids[section],
+                "year_level": year,
+                "indiv_points": self.rng.randrange(500),
+            }
+
+        self._bulk_people("student", self.students, make_user, make_profile, StudentProfile)
+        summary.students = self.students
+
+    def _faculty(self, summary):
+        first_hire = date(1995, 6, 1)
+
+        def make_user(n):
+            return self._person("faculty", f"fac{n + 1:05d}", f"F-{n + 1:05d}")
+
+        def make_profile(n):
+            return {
+                "faculty_department_id": self.rng.choice(self.department_ids),
+                "position_id": self.rng.choice(self.position_ids),
+                "hire_date": first_hire + timedelta(days=self.rng.randrange(30 * 365)),
+            }
+
+        self._bulk_people("faculty", self.faculty, make_user, make_profile, FacultyProfile)
+        summary.faculty = self.faculty
+
+    def _staff(self, summary):
+        def make_user(n):
+            return self._person("staff", f"stf{n + 1:05d}", f"T-{n + 1:05d}")
+
+        def make_profile(n):
+            return {
+                "faculty_department_id": self.rng.choice(self.department_ids),
+                "job_title": self.rng.choice(JOB_TITLES),
+            }
+
+        self._bulk_people("staff", self.staff, make_user, make_profile, StaffProfile)
+        summary.staff = self.staff
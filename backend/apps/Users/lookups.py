@@ -0,0 +1,68 @@
+# backend/apps/Users/lookups.py
+"""
+Case-insensitive user lookups by username, email or institutional ID.
+
+`username__iexact` compiles to UPPER(col) = UPPER(%s) on PostgreSQL and to
+LIKE ... ESCAPE on SQLite, neither of which the plain unique indexes can
+serve, so every such lookup is a sequential scan. The lookups here compare
+LOWER(col) against an already lowercased value, the exact expression of the
+users_*_lower_idx indexes on BaseUser.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Lower
+
+User = get_user_model()
+
+IDENTIFIER_FIELDS = ("username", "email", "institutional_id")
+
+
+def _alias(field):
+    return f"{field}_lower"
+
+
+def with_lower(queryset, fields=IDENTIFIER_FIELDS):
+    """`queryset` with a `<field>_lower` alias per field, filterable through the Lower() indexes."""
+    return queryset.alias(**{_alias(field): Lower(field) for field in fields})
+
+
+def matching(identifier, fields=("username", "email"), queryset=None):
+    """
+    Users whose `fields` equal `identifier` ignoring case, best match first:
+    the exact username, then the username in another case, then the rest
+    in `fields` order. Emails are only compared when there is an "@".
+    """
+    queryset = User.objects.all() if queryset is None else queryset
+    value = identifier.lower()
+    fields = [f for f in fields if f != "email" or "@" in value]
+    if not fields:
+        return queryset.none()
+    lookup = Q()
+    for field in fields:
+        lookup |= Q(**{_alias(field): value})
+    rank = [When(username=identifier, then=Value(0))] if "username" in fields else []
+    rank += [When(**{_alias(field): value}, then=Value(i + 1)) for i, field in enumerate(fields)]
+    return (
+        with_lower(queryset, fields)
+        .filter(lookup)
+        # Ranks only the matched rows, the filter above still goes through the indexes
+        .order_by(Case(*rank, default=Value(len(fields) + 1), output_field=IntegerField()))
+    )
+
+
+def find_user(identifier, fields=("username", "email")):
+    """The best match for `identifier`, or None."""
+    return matching(identifier, fields).first()
+
+
+def taken(field, values, queryset=None):
+    """Lowercased `values` already used by some user's `field`, in one indexed query."""
+    queryset = User.objects.all() if queryset is None else queryset
+    wanted = {value.lower() for value in values if value}
+    if not wanted:
+        return set()
+    return set(
+        queryset.annotate(**{_alias(field): Lower(field)})
+        .filter(**{f"{_alias(field)}__in": wanted})
+        .values_list(_alias(field), flat=True)
+    )
@@ -0,0 +1,75 @@
+# backend/apps/Users/management/commands/bench_login.py
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.Users.campus import CAMPUS_PASSWORD
+from apps.Users.views import UserLoginAPIView
+
+User = get_user_model()
+
+# First generated student, see seed_campus
+BENCH_USER = "stu000001"
+
+
+class Command(BaseCommand):
+    help = "Report logins per second for UserLoginAPIView against the seed_campus dataset"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--email", action="store_true", help="Log in with the email instead of the username")
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        client = APIClient(SERVER_NAME="localhost")
+        url = reverse("user-login")
+
+        user = User.objects.filter(username=BENCH_USER).first()
+        if user is None:
+            raise CommandError("No campus to benchmark against, run seed_campus first")
+        identifier = user.email.lower() if options["email"] else user.username
+        payload = {"identifier": identifier, "password": CAMPUS_PASSWORD}
+
+        # Measures lookups and hashing, not the login throttles
+        throttle_classes = UserLoginAPIView.throttle_classes
+        UserLoginAPIView.throttle_classes = []
+        try:
+            self._bench(client, url, payload, iterations)
+        finally:
+            UserLoginAPIView.throttle_classes = throttle_classes
+
+    def _bench(self, client, url, payload, iterations):
+        # First login fills the role cache, the rest measure the steady state
+        cold = self._count_queries(client, url, payload)
+        warm = self._count_queries(client, url, payload)
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            self._login(client, url, payload)
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(f"Queries per login: {cold} cold, {warm} cached")
+        self.stdout.write(
+            f"{iterations} logins in {elapsed:.2f}s -> {iterations / elapsed:.1f} logins/sec"
+        )
+
+    def _login(self, client, url, payload):
+        resp = client.post(url, payload, format="json")
+        if resp.status_code != 200:
+            raise CommandError(f"Login failed: HTTP {resp.status_code} {resp.content[:200]}")
+        return resp
+
+    def _count_queries(self, client, url, payload):
+        executed = []
+
+        def counter(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(counter):
+            self._login(client, url, payload)
+        return len(executed)
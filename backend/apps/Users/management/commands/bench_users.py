@@ -0,0 +1,102 @@
+# backend/apps/Users/management/commands/bench_users.py
+import itertools
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api.renderers import FastJSONRenderer
+from apps.Users.campus import CAMPUS_ADMIN
+from apps.Users.tokens import RoleRefreshToken
+from apps.Users.views import UserViewSet
+from common.benchmark import run_concurrent
+
+User = get_user_model()
+
+RENDERERS = {"fast": FastJSONRenderer, "stdlib": JSONRenderer}
+
+
+class Command(BaseCommand):
+    help = (
+        "Report requests per second on the users endpoints for every combination of "
+        "--conn-max-age, --renderer and --accept-encoding, e.g. --conn-max-age 0 60 to compare "
+        "per-request connections with persistent ones"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument(
+            "--conn-max-age", type=int, nargs="+",
+            help="CONN_MAX_AGE values to compare (default: the configured one)",
+        )
+        parser.add_argument("--renderer", nargs="+", choices=sorted(RENDERERS), default=["fast"])
+        parser.add_argument(
+            "--accept-encoding", nargs="+", default=["identity"],
+            help="Accept-Encoding values to compare, e.g. identity gzip br",
+        )
+        parser.add_argument(
+            "--endpoint", nargs="+", choices=["list", "search", "export"], default=["list", "search"],
+        )
+        parser.add_argument("--query", default="santos", help="Search term for /api/users/search/")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=CAMPUS_ADMIN).first()
+        if user is None:
+            raise CommandError("No campus to benchmark against, run seed_campus first")
+        access = str(RoleRefreshToken.for_user(user).access_token)
+
+        urls = {
+            "list": reverse("user-list"),
+            "search": f"{reverse('user-search')}?q={options['query']}",
+            "export": reverse("user-export"),
+        }
+        db_settings = connections.settings[DEFAULT_DB_ALIAS]
+        configured = db_settings["CONN_MAX_AGE"]
+        renderer_classes = UserViewSet.renderer_classes
+        self.stdout.write(
+            f"{db_settings['ENGINE'].rsplit('.', 1)[-1]}, {options['requests']} requests "
+            f"per endpoint, {options['concurrency']} threads"
+        )
+
+        combinations = itertools.product(
+            options["conn_max_age"] or [configured], options["renderer"], options["accept_encoding"],
+        )
+        try:
+            for max_age, renderer, encoding in combinations:
+                # Read by every connection opened from here on
+                db_settings["CONN_MAX_AGE"] = max_age
+                connections.close_all()
+                UserViewSet.renderer_classes = [RENDERERS[renderer]]
+                for name in options["endpoint"]:
+                    sizes = []
+                    stats = run_concurrent(
+                        lambda: self._worker(access, urls[name], encoding, sizes),
+                        options["requests"],
+                        options["concurrency"],
+                    )
+                    self.stdout.write(
+                        f"CONN_MAX_AGE={max_age:<4} {renderer:<6} {encoding:<8} {name:<7} "
+                        f"{stats['rps']:>8.1f} req/s  p50 {stats['p50_ms']:.1f}ms  "
+                        f"p95 {stats['p95_ms']:.1f}ms  p99 {stats['p99_ms']:.1f}ms  "
+                        f"{sum(sizes) // max(len(sizes), 1)} bytes"
+                    )
+        finally:
+            db_settings["CONN_MAX_AGE"] = configured
+            UserViewSet.renderer_classes = renderer_classes
+
+    def _worker(self, access, url, encoding, sizes):
+        client = APIClient(SERVER_NAME="localhost")
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        def call():
+            resp = client.get(url, HTTP_ACCEPT_ENCODING=encoding)
+            if resp.status_code != 200:
+                raise CommandError(f"GET {url} failed: HTTP {resp.status_code} {resp.content[:200]}")
+            body = b"".join(resp.streaming_content) if resp.streaming else resp.content
+            sizes.append(len(body))
+
+        return call
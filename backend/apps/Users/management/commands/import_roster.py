@@ -0,0 +1,39 @@
+# backend/apps/Users/management/commands/import_roster.py
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.Users.roster import DEFAULT_BATCH_SIZE, RosterFormatError, RosterImporter, read_roster, roster_format
+
+
+class Command(BaseCommand):
+    help = "Bulk import students, faculty and staff from a CSV, JSON or JSON lines roster"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Roster file, or - to read from stdin")
+        parser.add_argument("--format", choices=["csv", "json", "jsonl"], help="Defaults to the file extension")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--workers", type=int, default=None, help="Hashing processes, 0 hashes in-process")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or roster_format(path)
+        importer = RosterImporter(batch_size=options["batch_size"], workers=options["workers"])
+
+        try:
+            if path == "-":
+                importer.run(read_roster(sys.stdin, fmt))
+            else:
+                with open(path, encoding="utf-8-sig", newline="") as stream:
+                    importer.run(read_roster(stream, fmt))
+        except RosterFormatError as e:
+            # Batches before the bad line are already in
+            raise CommandError(f"Could not read {path}: {e}") from e
+
+        for err in importer.errors:
+            self.stderr.write(f"Row {err['row']}: {err['error']}")
+        self.stdout.write(
+            f"Created {importer.created}, skipped {importer.skipped} existing, "
+            f"{len(importer.errors)} errors in {importer.elapsed:.2f}s "
+            f"({importer.rows_per_second:.1f} rows/sec)"
+        )
@@ -0,0 +1,152 @@
+# backend/apps/Users/management/commands/loadtest.py
+import contextlib
+import json
+import logging
+import shutil
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.Users.campus import CampusGenerator
+from common.benchmark import LocalServer
+from common.loadtest import LoadTest
+from middleware.mw import endpoint_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive concurrent desktop client sessions against a local server on a throwaway "
+        "seed_campus database and report throughput, latency percentiles and errors per endpoint"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=20)
+        parser.add_argument("--admins", type=int, default=2, help="How many of the clients are admins")
+        parser.add_argument("--duration", type=float, default=30, help="Seconds")
+        parser.add_argument("--think-time", type=float, default=0, help="Average pause between actions, seconds")
+        parser.add_argument(
+            "--students", type=int, default=30000,
+            help="Campus size of the throwaway database, or of the --url server's; the flood targets these students",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--flood", type=int, default=0,
+            help="Attacker threads sending wrong-password logins during the second half of the run",
+        )
+        parser.add_argument("--flood-addresses", type=int, default=1, help="Source addresses the attackers share")
+        parser.add_argument(
+            "--url", help="Test a running server instead, it must already hold a seed_campus dataset",
+        )
+        parser.add_argument("--output-dir", default=str(Path(settings.BASE_DIR) / "loadtest_results"))
+        parser.add_argument("--compare", help="Earlier results file to print the differences against")
+
+    def handle(self, *args, **options):
+        run = LoadTest(
+            None,
+            clients=options["clients"],
+            admins=options["admins"],
+            duration=options["duration"],
+            think_time=options["think_time"],
+            seed=options["seed"],
+            flood=options["flood"],
+            flood_addresses=options["flood_addresses"],
+            students=options["students"],
+        )
+        if options["url"]:
+            run.base_url = options["url"]
+            report = run.run()
+        else:
+            with self.throwaway_database(options["students"]), LocalServer() as server:
+                run.base_url = server.url
+                endpoint_stats.reset()
+                # Under load most requests cross SLOW_REQUEST_MS, and a flood is all 4xx
+                # warnings; the server stats below cover both
+                quiet = [logging.getLogger(name) for name in ("middleware.mw", "django.request")]
+                for logger in quiet:
+                    logger.disabled = True
+                try:
+                    report = run.run()
+                finally:
+                    for logger in quiet:
+                        logger.disabled = False
+                report["server"] = endpoint_stats.snapshot()
+        if not report["requests"]:
+            raise CommandError("No requests were made, is the campus seeded?")
+
+        report["commit"] = self.commit()
+        report["config"] = {
+            key: options[key] for key in ("clients", "admins", "duration", "think_time", "students", "seed", "flood", "flood_addresses", "url")
+        }
+        self.print_report(report)
+        path = self.save(report, Path(options["output_dir"]))
+        self.stdout.write(f"Saved {path}")
+        if options["compare"]:
+            with open(options["compare"]) as fh:
+                self.print_comparison(json.load(fh), report)
+
+    @contextlib.contextmanager
+    def throwaway_database(self, students):
+        """Migrated database holding a fresh campus, dropped afterwards."""
+        tmpdir = tempfile.mkdtemp(prefix="vhub-loadtest-")
+        if connection.vendor == "sqlite":
+            # A file, not the in-memory default, so every server thread sees the same data
+            connection.settings_dict["TEST"]["NAME"] = str(Path(tmpdir) / "loadtest.sqlite3")
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.stdout.write(f"Seeding a campus of {students} students...")
+            CampusGenerator(students=students, faculty=max(students // 20, 1), staff=max(students // 60, 1)).run()
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    def commit(self):
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return "unknown"
+
+    def save(self, report, output_dir):
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        path = output_dir / f"{stamp}-{report['commit']}.json"
+        report["timestamp"] = stamp
+        path.write_text(json.dumps(report, indent=2))
+        return path
+
+    def print_report(self, report):
+        self.stdout.write(
+            f"{report['requests']} requests in {report['seconds']}s: {report['rps']} req/s, "
+            f"{report['errors']} errors ({report['error_rate']:.2%})"
+        )
+        self.stdout.write(f"{'endpoint':<58} {'req':>6} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'err%':>6}")
+        for label, e in report["endpoints"].items():
+            self.stdout.write(
+                f"{label:<58} {e['requests']:>6} {e['rps']:>8.1f} {e['p50_ms']:>6.1f}ms "
+                f"{e['p95_ms']:>6.1f}ms {e['p99_ms']:>6.1f}ms {e['error_rate']:>6.1%}"
+            )
+        if "flood" in report:
+            statuses = ", ".join(f"{code}: {n}" for code, n in report["flood"]["statuses"].items())
+            flood = report["flood"]
+            self.stdout.write(f"Flood of {flood['attackers']} attackers from {flood['addresses']} addresses got {statuses}")
+
+    def print_comparison(self, before, after):
+        self.stdout.write(f"Against {before.get('commit', '?')} ({before.get('timestamp', '?')}):")
+        self.stdout.write(f"  total req/s {before['rps']} -> {after['rps']}")
+        for label, e in after["endpoints"].items():
+            old = before["endpoints"].get(label)
+            if old is None:
+                self.stdout.write(f"  {label}: new")
+                continue
+            self.stdout.write(
+                f"  {label}: req/s {old['rps']} -> {e['rps']}, p95 {old['p95_ms']} -> {e['p95_ms']}ms, "
+                f"errors {old['error_rate']:.1%} -> {e['error_rate']:.1%}"
+            )
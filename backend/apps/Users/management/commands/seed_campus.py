@@ -0,0 +1,39 @@
+# backend/apps/Users/management/commands/seed_campus.py
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.Users.campus import (
+    BATCH_SIZE, CAMPUS_ADMIN, CAMPUS_PASSWORD, DEFAULT_SEED, CampusGenerator, campus_exists,
+)
+
+
+class Command(BaseCommand):
+    help = "Build the deterministic synthetic campus every benchmark and load test runs against"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=30000)
+        parser.add_argument("--faculty", type=int, default=1500)
+        parser.add_argument("--staff", type=int, default=500)
+        parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--flush", action="store_true", help="Delete a previously generated campus first")
+
+    def handle(self, *args, **options):
+        generator = CampusGenerator(
+            students=options["students"],
+            faculty=options["faculty"],
+            staff=options["staff"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+        )
+        if campus_exists():
+            if not options["flush"]:
+                raise CommandError("A campus is already generated, pass --flush to rebuild it")
+            self.stdout.write(f"Deleted {generator.flush()} rows from the previous campus")
+
+        summary = generator.run()
+        self.stdout.write(
+            f"Created {summary.users} accounts ({summary.students} students, {summary.faculty} faculty, "
+            f"{summary.staff} staff) across {summary.programs} programs, {summary.sections} sections "
+            f"and {summary.departments} departments in {summary.seconds:.1f}s"
+        )
+        self.stdout.write(f"Benchmarks log in as {CAMPUS_ADMIN} / {CAMPUS_PASSWORD}")
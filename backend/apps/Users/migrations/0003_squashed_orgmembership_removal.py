@@ -0,0 +1,36 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # 0003_remove_orgmembership_organization_and_more drops the `organization`
+    # column before the unique_together that names it, which fails on a fresh
+    # database. Databases that already applied it keep it; fresh ones run
+    # this copy, with the constraint removed first.
+    replaces = [
+        ('users', '0003_remove_orgmembership_organization_and_more'),
+    ]
+
+    dependencies = [
+        ('users', '0002_organization_orgmembership'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='orgmembership',
+            unique_together=None,
+        ),
+        migrations.RemoveField(
+            model_name='orgmembership',
+            name='organization',
+        ),
+        migrations.RemoveField(
+            model_name='orgmembership',
+            name='student',
+        ),
+        migrations.DeleteModel(
+            name='Organization',
+        ),
+        migrations.DeleteModel(
+            name='OrgMembership',
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from apps.Users.search import install_search_index
+    install_search_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    from apps.Users.search import uninstall_search_index
+    uninstall_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_baseuser_email_lower_idx'),
+    ]
+
+    operations = [
+        # Trigram indexes on PostgreSQL, FTS5 shadow table on SQLite (see apps/Users/search.py)
+        migrations.RunPython(install, uninstall),
+    ]
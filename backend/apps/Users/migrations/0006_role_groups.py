@@ -0,0 +1,22 @@
+from django.db import migrations
+
+ROLE_GROUPS = ["student", "faculty", "staff", "admin", "org_officer", "registrar"]
+
+
+def create_role_groups(apps, schema_editor):
+    Group = apps.get_model("auth", "Group")
+    for name in ROLE_GROUPS:
+        Group.objects.get_or_create(name=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0005_user_search_index'),
+    ]
+
+    operations = [
+        # Role groups exist up front so their ids can be cached (roles.group_id)
+        migrations.RunPython(create_role_groups, migrations.RunPython.noop),
+    ]
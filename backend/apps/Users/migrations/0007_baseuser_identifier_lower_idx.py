@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 01:12
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0006_role_groups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='baseuser',
+            index=models.Index(django.db.models.functions.text.Lower('username'), name='users_username_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='baseuser',
+            index=models.Index(django.db.models.functions.text.Lower('institutional_id'), name='users_inst_id_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 01:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_baseuser_identifier_lower_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='baseuser',
+            name='role_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
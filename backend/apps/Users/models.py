@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
+from django.db.models.functions import Lower
 
 # Create your models here.
 
@@ -44,6 +45,17 @@ class BaseUser(AbstractUser):
         ("staff", "Staff"),
     ]
     role_type = models.CharField(max_length=20, choices=ROLE_CHOICES, blank=True, null=True)
+    # Bumped on every group change; access tokens carry it as `rv` and stop
+    # working once it moves on (apps/Users/roles.py, api/authentication.py)
+    role_version = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Identifiers match case-insensitively, see apps/Users/lookups.py
+            models.Index(Lower("email"), name="users_email_lower_idx"),
+            models.Index(Lower("username"), name="users_username_lower_idx"),
+            models.Index(Lower("institutional_id"), name="users_inst_id_lower_idx"),
+        ]
 
 class FacultyProfile(models.Model):
     user               = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="faculty_profile")
@@ -0,0 +1,104 @@
+# backend/apps/Users/navigation.py
+"""
+Per-role navigation trees from the desktop client's nav definition
+(settings.NAVIGATION_FILE, frontend/utils/navbar.json).
+
+The trees for every role are built together and rebuilt only when the
+file's mtime or size changes, so a request gets its tree from one stat()
+and a dict lookup instead of filtering the whole definition. A user with
+several roles gets one tree holding what any of them may open, built once
+per combination.
+"""
+import json
+import logging
+import os
+import threading
+
+from django.conf import settings
+
+from .roles import ROLES
+
+logger = logging.getLogger(__name__)
+
+
+def allows(access, role):
+    """`access` is a single role or a list of them."""
+    return access == role if isinstance(access, str) else role in access
+
+
+def build_tree(definition, roles):
+    """The definition with only the parents, mains and modulars one of `roles` may open."""
+    def allowed(access):
+        return any(allows(access, role) for role in roles)
+
+    parents = []
+    for parent in definition.get("parents", []):
+        mains = []
+        for main in parent.get("mains", []):
+            if not allowed(main.get("access", [])):
+                continue
+            # Modulars without their own access inherit the main's
+            modulars = [mod for mod in main.get("modulars", [])
+                        if allowed(mod.get("access", main["access"]))]
+            mains.append({**main, "modulars": modulars})
+        if mains:
+            parents.append({**parent, "mains": mains})
+    return {"parents": parents}
+
+
+def build_trees(definition, roles=ROLES):
+    """role -> the definition with only the parents, mains and modulars the role may open."""
+    return {role: build_tree(definition, [role]) for role in roles}
+
+
+class NavigationIndex:
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stamp = None
+        # (definition, sorted role tuple -> tree), swapped as a whole on rebuild
+        self._built = ({"parents": []}, {})
+
+    def refresh(self):
+        """Rebuild the trees when the definition file changed since the last build."""
+        path = self.path or settings.NAVIGATION_FILE
+        try:
+            st = os.stat(path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = st = None
+        if stamp == self._stamp:
+            return
+        with self._lock:
+            if stamp == self._stamp:
+                return
+            definition = {"parents": []}
+            if st is not None:
+                try:
+                    with open(path, encoding="utf-8") as fh:
+                        definition = json.load(fh)
+                except ValueError:
+                    # Caught mid-edit, keep serving the last good trees
+                    logger.warning("Navigation definition %s is not valid JSON", path)
+                    return
+            trees = {(role,): tree for role, tree in build_trees(definition).items()}
+            self._built = (definition, trees)
+            self._stamp = stamp
+
+    def version(self):
+        """Version of the definition, for ETags."""
+        self.refresh()
+        return self._stamp[0] if self._stamp else 0
+
+    def tree_for(self, *roles):
+        """What any of `roles` may open, sub-roles (org_officer, registrar) included."""
+        self.refresh()
+        definition, trees = self._built
+        roles = tuple(sorted(set(roles)))
+        if roles not in trees:
+            # Racing threads build the same tree, whichever lands first is kept
+            trees.setdefault(roles, build_tree(definition, roles))
+        return trees[roles]
+
+
+navigation = NavigationIndex()
@@ -1,5 +1,10 @@
 # backend/apps/Users/roles.py
+from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
+from django.core.cache import cache, caches
+from django.db import transaction
+from django.db.models import F
 
 ROLES = [
     "student",
@@ -8,6 +13,154 @@ ROLES = [
     "admin",
 ]
 
+# Granted on top of a base role by an admin
+SUB_ROLES = [
+    "org_officer",
+    "registrar",
+]
+
+# Highest priority first, decides which dashboard the client opens
+ROLE_PRIORITY = ["admin", "faculty", "staff", "student"]
+
+# Resolved roles are kept for as long as an access token lives
+ROLE_CACHE_TIMEOUT = 60 * 15
+
+# role name -> Group id, role groups are never renamed so this is filled once per process
+_group_ids = {}
+
 def ensure_roles():
-    for name in ROLES:
+    for name in ROLES + SUB_ROLES:
         Group.objects.get_or_create(name=name)
+
+def group_id(name):
+    if name not in _group_ids:
+        _group_ids[name] = Group.objects.get_or_create(name=name)[0].pk
+    return _group_ids[name]
+
+def forget_group_ids():
+    _group_ids.clear()
+
+def primary_role_for(roles):
+    return next((r for r in ROLE_PRIORITY if r in roles), None)
+
+def _roles_key(user_id, version):
+    return f"users:roles:{user_id}:{version}"
+
+def role_versions(user_ids):
+    """{user_id: role_version} from the database, in one query."""
+    User = get_user_model()
+    versions = dict(User.objects.filter(pk__in=user_ids).values_list("pk", "role_version"))
+    return {pk: versions.get(pk, 0) for pk in user_ids}
+
+class RoleCache:
+    """Per-user (roles, primary_role) in the Django cache, keyed by user id and role version.
+
+    The version is BaseUser.role_version, which invalidate() bumps for every
+    change to BaseUser.groups (see the m2m_changed receiver in signals.py).
+    Entries of older versions are never read again, so a cache that is local
+    to one process, evicts, or restarts empty can't serve roles from before a
+    change. A hit costs no query when the caller knows the version, one
+    otherwise. hits/misses count lookups in this process.
+    """
+
+    def __init__(self, timeout=ROLE_CACHE_TIMEOUT):
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id, version=None):
+        user_id = int(user_id)
+        versions = None if version is None else {user_id: version}
+        return self.get_many([user_id], versions)[user_id]
+
+    def get_many(self, user_ids, versions=None):
+        """{user_id: (roles, primary_role)}, versions and all misses loaded with one query each."""
+        # Token claims carry the id as a string
+        user_ids = [int(pk) for pk in user_ids]
+        if versions is None:
+            versions = role_versions(user_ids)
+        keys = {_roles_key(pk, versions[pk]): pk for pk in user_ids}
+        found = cache.get_many(keys)
+        result = {keys[key]: (entry["roles"], entry["primary_role"]) for key, entry in found.items()}
+        missing = [pk for pk in user_ids if pk not in result]
+        self.hits += len(result)
+        self.misses += len(missing)
+        if not missing:
+            return result
+
+        loaded = {pk: [] for pk in missing}
+        Membership = Group.user_set.through
+        for pk, name in Membership.objects.filter(baseuser_id__in=missing).values_list("baseuser_id", "group__name"):
+            loaded[pk].append(name)
+        fresh = {}
+        for pk, roles in loaded.items():
+            primary_role = primary_role_for(roles)
+            result[pk] = (roles, primary_role)
+            fresh[_roles_key(pk, versions[pk])] = {"roles": roles, "primary_role": primary_role}
+        cache.set_many(fresh, self.timeout)
+        return result
+
+    def invalidate(self, *user_ids):
+        # In the database, so every process sees it and tokens stamped with
+        # an older version stay invalid after evictions and restarts
+        get_user_model().objects.filter(pk__in=user_ids).update(role_version=F("role_version") + 1)
+        forget_auth_state(*user_ids)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+        }
+
+
+role_cache = RoleCache()
+
+def resolve_roles(user_id, version=None):
+    """Return (roles, primary_role) for a user id, cached. Pass the role version when known."""
+    return role_cache.get(user_id, version)
+
+def get_role_version(user_id):
+    """Counter stamped into tokens as the `rv` claim, bumped on every role change."""
+    return role_versions([int(user_id)])[int(user_id)]
+
+def _auth_cache():
+    # settings.ROLE_VERSION_CACHE names a cache every worker shares; a
+    # per-process one would keep serving a version another worker moved on
+    alias = getattr(settings, "ROLE_VERSION_CACHE", None)
+    return caches[alias] if alias else None
+
+def _auth_key(user_id):
+    return f"users:auth:{user_id}"
+
+def auth_state(user_id):
+    """(role_version, is_active) of a user, None when there is no such user.
+
+    From ROLE_VERSION_CACHE when one is configured, the user row otherwise
+    and on a miss.
+    """
+    store = _auth_cache()
+    key = _auth_key(user_id)
+    if store is not None:
+        state = store.get(key)
+        if state is not None:
+            return tuple(state)
+    row = get_user_model().objects.filter(pk=user_id).values_list("role_version", "is_active").first()
+    if row is not None and store is not None:
+        store.set(key, row, ROLE_CACHE_TIMEOUT)
+    return row
+
+def forget_auth_state(*user_ids):
+    """Drop cached auth state, from role changes and user saves. QuerySet.update() callers call it themselves."""
+    store = _auth_cache()
+    if store is None or not user_ids:
+        return
+    keys = [_auth_key(pk) for pk in user_ids]
+    store.delete_many(keys)
+    # Again once committed, a read in between may have cached the old row
+    transaction.on_commit(lambda: store.delete_many(keys))
+
+def invalidate_roles(*user_ids):
+    if user_ids:
+        role_cache.invalidate(*user_ids)
@@ -0,0 +1,291 @@
+# backend/apps/Users/roster.py
+"""
+Bulk roster import for students, faculty and staff.
+
+Rows are read as a stream (CSV, JSON lines or a JSON array) and written in
+batches: passwords are hashed in a process pool, then users, profiles and
+group memberships go in with one bulk_create each. post_save signals do
+not fire for bulk_create, so the role group is assigned here directly.
+
+Recognised columns: username, email, password, first_name, middle_name,
+last_name, suffix, institutional_id, phone_number, role_type, plus
+program, section, year_level (students), department, position, hire_date
+(faculty) and department, job_title (staff).
+"""
+import csv
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from api.conditional import bump_table_version
+
+from .lookups import taken
+from .roles import group_id
+from .models import (
+    FacultyDepartment, FacultyProfile, Position, Program, Section,
+    StaffProfile, StudentProfile,
+)
+
+User = get_user_model()
+
+ROSTER_ROLES = ("student", "faculty", "staff", "admin")
+USER_FIELDS = (
+    "username", "email", "first_name", "middle_name", "last_name",
+    "suffix", "institutional_id", "phone_number", "role_type",
+)
+DEFAULT_BATCH_SIZE = 500
+
+# Column -> max_length of the field it is stored in, checked before insert
+# so one long value is reported instead of failing its whole batch
+MAX_LENGTHS = {
+    **{f: User._meta.get_field(f).max_length for f in USER_FIELDS},
+    "program": Program._meta.get_field("program_name").max_length,
+    "section": Section._meta.get_field("section_name").max_length,
+    "department": FacultyDepartment._meta.get_field("department_name").max_length,
+    "position": Position._meta.get_field("position_name").max_length,
+    "job_title": StaffProfile._meta.get_field("job_title").max_length,
+}
+
+
+class RosterFormatError(ValueError):
+    """The upload is not valid CSV, JSON or JSON lines (or not UTF-8)."""
+
+
+def read_roster(stream, fmt="csv"):
+    """Yield one dict per roster row from a text stream.
+
+    Raises RosterFormatError when the stream cannot be parsed; rows yielded
+    before that point have already been handed out.
+    """
+    try:
+        if fmt == "csv":
+            yield from csv.DictReader(stream)
+        elif fmt == "jsonl":
+            for line_no, line in enumerate(stream, start=1):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise RosterFormatError(f"line {line_no}: {e}") from e
+        elif fmt == "json":
+            rows = json.load(stream)
+            if not isinstance(rows, list):
+                raise RosterFormatError("expected a JSON array of rows")
+            yield from rows
+        else:
+            raise ValueError(f"Unknown roster format: {fmt}")
+    except (UnicodeDecodeError, csv.Error, json.JSONDecodeError) as e:
+        raise RosterFormatError(str(e)) from e
+
+
+def roster_format(filename, default="csv"):
+    ext = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    return ext if ext in ("csv", "json", "jsonl") else default
+
+
+def _init_hasher_process(settings_module):
+    # Spawned workers (Windows, macOS) start without Django configured
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+    django.setup()
+
+
+class LookupMap:
+    """name -> id for a lookup table, loaded once and extended on demand."""
+
+    def __init__(self, model, field):
+        self.model = model
+        self.field = field
+        self.ids = dict(model.objects.values_list(field, "id"))
+
+    def resolve(self, names):
+        missing = {n for n in names if n and n not in self.ids}
+        if missing:
+            self.model.objects.bulk_create(
+                [self.model(**{self.field: n}) for n in missing], ignore_conflicts=True
+            )
+            self.ids.update(
+                self.model.objects.filter(**{f"{self.field}__in": missing}).values_list(self.field, "id")
+            )
+
+    def get(self, name):
+        return self.ids.get(name) if name else None
+
+
+class RosterImporter:
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, workers=None):
+        self.batch_size = batch_size
+        # workers=0 hashes in this process (tests, tiny rosters)
+        self.workers = os.cpu_count() if workers is None else workers
+        self.created = 0
+        self.skipped = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        total = self.created + self.skipped + len(self.errors)
+        return total / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return {
+            "created": self.created,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "seconds": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+    def run(self, rows):
+        start = time.perf_counter()
+        self.programs = LookupMap(Program, "program_name")
+        self.sections = LookupMap(Section, "section_name")
+        self.departments = LookupMap(FacultyDepartment, "department_name")
+        self.positions = LookupMap(Position, "position_name")
+        self.group_ids = {name: group_id(name) for name in ROSTER_ROLES}
+
+        executor = None
+        if self.workers:
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_hasher_process,
+                initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "config.settings"),),
+            )
+        try:
+            batch = []
+            for line_no, row in enumerate(rows, start=1):
+                batch.append((line_no, row))
+                if len(batch) >= self.batch_size:
+                    self._import_batch(batch, executor)
+                    batch = []
+            if batch:
+                self._import_batch(batch, executor)
+        finally:
+            if executor:
+                executor.shutdown()
+        self.elapsed = time.perf_counter() - start
+        return self
+
+    def _clean(self, row):
+        if not isinstance(row, dict):
+            raise ValueError(f"expected an object, got {type(row).__name__}")
+        row = {k.strip(): (v.strip() if isinstance(v, str) else v) for k, v in row.items() if k}
+        for required in ("username", "institutional_id"):
+            if not row.get(required):
+                raise ValueError(f"missing {required}")
+        role = (row.get("role_type") or "student").lower()
+        if role not in ROSTER_ROLES:
+            raise ValueError(f"unknown role_type '{role}'")
+        row["role_type"] = role
+        for column, limit in MAX_LENGTHS.items():
+            value = row.get(column)
+            if value is not None and len(str(value)) > limit:
+                raise ValueError(f"{column} is longer than {limit} characters")
+        if role == "student":
+            row["year_level"] = int(row.get("year_level") or 1)
+        if row.get("hire_date"):
+            row["hire_date"] = date.fromisoformat(row["hire_date"])
+        return row
+
+    def _new_user(self, row, hashed):
+        fields = {f: row.get(f) or None for f in USER_FIELDS}
+        # NOT NULL columns inherited from AbstractUser
+        for f in ("email", "first_name", "last_name"):
+            fields[f] = fields[f] or ""
+        return User(password=hashed, **fields)
+
+    def _import_batch(self, batch, executor):
+        rows = []
+        for line_no, raw in batch:
+            try:
+                rows.append((line_no, self._clean(raw)))
+            except (ValueError, TypeError) as e:
+                self.errors.append({"row": line_no, "error": str(e)})
+
+        # Skip accounts that already exist, ignoring case like login does,
+        # one query per identifier column
+        taken_usernames = taken("username", {r["username"] for _, r in rows})
+        taken_ids = taken("institutional_id", {r["institutional_id"] for _, r in rows})
+        fresh, seen_usernames, seen_ids = [], set(), set()
+        for line_no, r in rows:
+            username, inst_id = r["username"].lower(), r["institutional_id"].lower()
+            if username in taken_usernames or inst_id in taken_ids:
+                self.skipped += 1
+                continue
+            # Either one repeated within the batch would fail the whole insert
+            if username in seen_usernames:
+                self.errors.append({"row": line_no, "error": f"duplicate username '{r['username']}'"})
+                continue
+            if inst_id in seen_ids:
+                self.errors.append({"row": line_no, "error": f"duplicate institutional_id '{r['institutional_id']}'"})
+                continue
+            seen_usernames.add(username)
+            seen_ids.add(inst_id)
+            fresh.append(r)
+        if not fresh:
+            return
+
+        passwords = [r.get("password") or None for r in fresh]
+        if executor:
+            hashes = list(executor.map(make_password, passwords, chunksize=max(len(passwords) // (self.workers * 4), 1)))
+        else:
+            hashes = [make_password(p) for p in passwords]
+
+        self.programs.resolve(r.get("program") for r in fresh)
+        self.sections.resolve(r.get("section") for r in fresh)
+        self.departments.resolve(r.get("department") for r in fresh)
+        self.positions.resolve(r.get("position") for r in fresh)
+
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                [self._new_user(r, hashed) for r, hashed in zip(fresh, hashes)]
+            )
+
+            students, faculty, staff, memberships = [], [], [], []
+            Membership = User.groups.through
+            for user, r in zip(users, fresh):
+                role = r["role_type"]
+                memberships.append(Membership(baseuser_id=user.pk, group_id=self.group_ids[role]))
+                if role == "student":
+                    students.append(StudentProfile(
+                        user_id=user.pk,
+                        program_id=self.programs.get(r.get("program")),
+                        section_id=self.sections.get(r.get("section")),
+                        year_level=r["year_level"],
+                    ))
+                elif role == "faculty":
+                    faculty.append(FacultyProfile(
+                        user_id=user.pk,
+                        faculty_department_id=self.departments.get(r.get("department")),
+                        position_id=self.positions.get(r.get("position")),
+                        hire_date=r.get("hire_date"),
+                    ))
+                elif role == "staff":
+                    staff.append(StaffProfile(
+                        user_id=user.pk,
+                        faculty_department_id=self.departments.get(r.get("department")),
+                        job_title=r.get("job_title") or "",
+                    ))
+
+            StudentProfile.objects.bulk_create(students)
+            FacultyProfile.objects.bulk_create(faculty)
+            StaffProfile.objects.bulk_create(staff)
+            Membership.objects.bulk_create(memberships)
+
+        # bulk_create sends no post_save, move the ETags of the user endpoints on by hand
+        bump_table_version(User, Membership, StudentProfile, FacultyProfile, StaffProfile)
+        self.created += len(users)
+
+
+def import_uploaded_roster(uploaded, batch_size=DEFAULT_BATCH_SIZE, workers=None):
+    """Import an uploaded file (Django UploadedFile) and return the summary."""
+    fmt = roster_format(uploaded.name)
+    stream = io.TextIOWrapper(uploaded.file, encoding="utf-8-sig", newline="")
+    return RosterImporter(batch_size=batch_size, workers=workers).run(read_roster(stream, fmt)).summary()
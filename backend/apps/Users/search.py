@@ -0,0 +1,186 @@
+# backend/apps/Users/search.py
+"""
+Indexed user directory search.
+
+PostgreSQL: pg_trgm GIN indexes on UPPER(column), which is exactly the
+expression Django emits for icontains/istartswith, so the lookups below
+are served by the index instead of a sequential scan.
+
+SQLite (db.sqlite3 for development): an FTS5 shadow table kept in sync by
+triggers, queried with prefix terms and ranked with bm25.
+
+The two don't match the same rows. PostgreSQL finds a term anywhere in a
+column ("ruz" finds "Dela Cruz"), FTS5 only at the start of a word ("cru"
+does, "ruz" doesn't). Every word prefix is also a substring, so a search
+that works on SQLite finds at least the same users on PostgreSQL.
+"""
+import re
+
+from django.db import connection, connections
+from django.db.models import Case, IntegerField, Q, When
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+
+SEARCH_FIELDS = ["username", "first_name", "last_name", "email", "institutional_id"]
+# Fields where a prefix hit ranks the user higher
+PREFIX_FIELDS = ["username", "first_name", "last_name", "institutional_id"]
+
+TABLE = "users_baseuser"
+FTS_TABLE = "users_baseuser_fts"
+# bm25 weights, same order as SEARCH_FIELDS
+FTS_WEIGHTS = "10.0, 5.0, 5.0, 2.0, 8.0"
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def search_terms(query):
+    return re.findall(r"\w+", query or "")
+
+
+def _uses_fts(conn=None):
+    return (conn or connection).vendor == "sqlite"
+
+
+def _fts_match(terms):
+    # Every term must match somewhere, each as a prefix
+    return " ".join(f'"{t}"*' for t in terms)
+
+
+def _terms_q(terms):
+    q = Q()
+    for term in terms:
+        any_field = Q()
+        for field in SEARCH_FIELDS:
+            any_field |= Q(**{f"{field}__icontains": term})
+        q &= any_field
+    return q
+
+
+def filter_users(queryset, query):
+    """Restrict a user queryset to matches, keeping its ordering. See the module docstring for how terms match."""
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+    if _uses_fts():
+        return queryset.filter(pk__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [_fts_match(terms)]
+        ))
+    return queryset.filter(_terms_q(terms))
+
+
+def ranked_user_ids(query, limit=DEFAULT_LIMIT, queryset=None):
+    """Ids of the best `limit` matches, best first."""
+    terms = search_terms(query)
+    if not terms:
+        return []
+    if _uses_fts():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+                f"ORDER BY bm25({FTS_TABLE}, {FTS_WEIGHTS}) LIMIT %s",
+                [_fts_match(terms), limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    from django.contrib.auth import get_user_model
+    from django.contrib.postgres.search import TrigramSimilarity
+    from django.db.models.functions import Greatest
+
+    queryset = queryset if queryset is not None else get_user_model().objects.all()
+    first = terms[0]
+    prefix_hit = Q()
+    for field in PREFIX_FIELDS:
+        prefix_hit |= Q(**{f"{field}__istartswith": first})
+    return list(
+        queryset.filter(_terms_q(terms))
+        .annotate(
+            prefix_rank=Case(When(prefix_hit, then=1), default=0, output_field=IntegerField()),
+            similarity=Greatest(*(TrigramSimilarity(f, query) for f in PREFIX_FIELDS)),
+        )
+        .order_by("-prefix_rank", "-similarity", "id")
+        .values_list("id", flat=True)[:limit]
+    )
+
+
+class UserSearchFilter(BaseFilterBackend):
+    """`?search=` backed by the indexes above instead of SearchFilter's icontains scans."""
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        return filter_users(queryset, request.query_params.get(self.search_param, ""))
+
+
+# ---------------------------------------------------------------- index setup
+
+_PG_SQL = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"] + [
+    f'CREATE INDEX IF NOT EXISTS users_{field}_trgm_idx ON {TABLE} '
+    f'USING gin (UPPER("{field}"::text) gin_trgm_ops)'
+    for field in SEARCH_FIELDS
+]
+
+_PG_DROP_SQL = [f"DROP INDEX IF EXISTS users_{field}_trgm_idx" for field in SEARCH_FIELDS]
+
+_columns = ", ".join(SEARCH_FIELDS)
+_new_values = ", ".join(f"new.{f}" for f in SEARCH_FIELDS)
+_old_values = ", ".join(f"old.{f}" for f in SEARCH_FIELDS)
+
+_SQLITE_TRIGGERS = {
+    f"{FTS_TABLE}_ai": f"""
+        CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values});
+        END""",
+    f"{FTS_TABLE}_ad": f"""
+        CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+        END""",
+    f"{FTS_TABLE}_au": f"""
+        CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF {_columns} ON {TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+            INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values});
+        END""",
+}
+
+
+def install_search_index(conn):
+    """Create the search indexes for `conn`'s backend. Safe to run repeatedly."""
+    with conn.cursor() as cursor:
+        if conn.vendor == "postgresql":
+            for sql in _PG_SQL:
+                cursor.execute(sql)
+            return
+        if conn.vendor != "sqlite":
+            return
+
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"{_columns}, content='{TABLE}', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [TABLE])
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = [name for name in _SQLITE_TRIGGERS if name not in existing]
+        for name in missing:
+            cursor.execute(_SQLITE_TRIGGERS[name])
+        if missing:
+            # Triggers are lost when SQLite rebuilds the table during a migration,
+            # so anything written in between has to be re-indexed
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def uninstall_search_index(conn):
+    with conn.cursor() as cursor:
+        if conn.vendor == "postgresql":
+            for sql in _PG_DROP_SQL:
+                cursor.execute(sql)
+        elif conn.vendor == "sqlite":
+            for name in _SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def restore_search_index(sender, using="default", **kwargs):
+    """post_migrate hook, SQLite drops the triggers whenever a migration rebuilds the user table."""
+    conn = connections[using]
+    if conn.vendor == "sqlite" and TABLE in conn.introspection.table_names():
+        install_search_index(conn)
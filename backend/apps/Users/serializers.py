@@ -1,7 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate, get_user_model
-from rest_framework_simplejwt.tokens import RefreshToken
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from .models import BaseUser
+from .tokens import RoleRefreshToken
 
 # serializers.py
 from rest_framework import serializers
@@ -10,6 +12,8 @@ from .models import (
     BaseUser, FacultyDepartment, Position, Program, Section,
     FacultyProfile, StudentProfile, StaffProfile
 )
+from .roles import SUB_ROLES, resolve_roles, role_cache
+from api.fieldsets import DynamicFieldsMixin
 User=get_user_model()
 
 class FacultyDepartmentSerializer(serializers.ModelSerializer):
@@ -32,7 +36,7 @@ class SectionSerializer(serializers.ModelSerializer):
         model = Section
         fields = ["id", "section_name"]
 
-class BaseUserSerializer(serializers.ModelSerializer):
+class BaseUserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = BaseUser
         fields = [
@@ -44,13 +48,14 @@ class BaseUserSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "institutional_id", "username", "email"]
 
-class FacultyProfileSerializer(serializers.ModelSerializer):
+class FacultyProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = BaseUserSerializer(read_only=True)
     user_id = serializers.PrimaryKeyRelatedField(
         queryset=BaseUser.objects.all(),
         write_only=True,
         source="user"
     )
+    # Joined into the profile query, and left out with ?fields= when not needed
     faculty_department_detail = FacultyDepartmentSerializer(source="faculty_department", read_only=True)
     position_detail = PositionSerializer(source="position", read_only=True)
 
@@ -64,7 +69,7 @@ class FacultyProfileSerializer(serializers.ModelSerializer):
         ]
 
 
-class StudentProfileSerializer(serializers.ModelSerializer):
+class StudentProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = BaseUserSerializer(read_only=True)
     user_id = serializers.PrimaryKeyRelatedField(
         queryset=BaseUser.objects.all(),
@@ -84,7 +89,7 @@ class StudentProfileSerializer(serializers.ModelSerializer):
         ]
 
 
-class StaffProfileSerializer(serializers.ModelSerializer):
+class StaffProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = BaseUserSerializer(read_only=True)
     user_id = serializers.PrimaryKeyRelatedField(
         queryset=BaseUser.objects.all(),
@@ -107,37 +112,56 @@ class LoginSerializer(serializers.Serializer):
     def validate(self, attrs):
         identifier = attrs.get("identifier")
         password = attrs.get("password")
-        user = authenticate(username=identifier, password=password)
-        roles = list(user.groups.values_list("name", flat=True))
-
-        if user is None and "@" in identifier:
-            try:
-                u = User.objects.get(email__iexact=identifier)
-                user = authenticate(username=u.username, password=password)
-            except User.DoesNotExist:
-                pass
 
+        # IdentifierBackend resolves username or email in one indexed query;
+        # going through authenticate() keeps user_login_failed and any other backend
+        user = authenticate(self.context.get("request"), identifier=identifier, password=password)
         if user is None:
+            # Same answer for unknown, wrong password and inactive accounts
             raise serializers.ValidationError("Invalid credentials.")
-        if not user.is_active:
-            raise serializers.ValidationError("Account is inactive.")
-
-        refresh = RefreshToken.for_user(user)
-        roles = list(user.groups.values_list("name", flat=True))
 
-        # Implement custom permissions
-        ROLE_PRIORITY = ["admin", "faculty", "staff", "student"]
-        primary_role = next((r for r in ROLE_PRIORITY if r in roles), None)
+        refresh = RoleRefreshToken.for_user(user)
+        # Just loaded by authenticate(), saves minting the access token a query
+        refresh.role_version = user.role_version
+        roles, primary_role = resolve_roles(user.pk, user.role_version)
 
         return {
             "user": user,
             "access_token": str(refresh.access_token),
+            "refresh_token": str(refresh),
             "roles": roles,
             "primary_role": primary_role,
         }
     
 
-class AdminUserListSerializer(serializers.ModelSerializer):
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    # Access tokens minted on refresh pick up the user's current roles
+    token_class = RoleRefreshToken
+
+
+class BatchRoleChangeSerializer(serializers.Serializer):
+    role = serializers.ChoiceField(choices=SUB_ROLES)
+    action = serializers.ChoiceField(choices=["grant", "revoke"])
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=1000
+    )
+
+
+def _has_role_version(user):
+    return "role_version" not in user.get_deferred_fields()
+
+
+class AdminUserListListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        users = list(data.all() if hasattr(data, "all") else data)
+        if "groups" in self.child.fields:
+            # Roles for the whole page in one cache round trip, at most one query for misses
+            versions = {u.pk: u.role_version for u in users} if users and _has_role_version(users[0]) else None
+            self.context["roles"] = role_cache.get_many([u.pk for u in users], versions)
+        return super().to_representation(users)
+
+
+class AdminUserListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     # show group names as a comma-join-friendly list
     groups = serializers.SlugRelatedField(
         many=True, read_only=True, slug_field="name"
@@ -150,4 +174,28 @@ class AdminUserListSerializer(serializers.ModelSerializer):
             "first_name", "last_name",
             "is_active", "is_staff", "is_superuser",
             "groups",
-        ]
\ No newline at end of file
+        ]
+        list_serializer_class = AdminUserListListSerializer
+
+    @cached_property
+    def column_names(self):
+        return [name for name in self.fields if name != "groups"]
+
+    def optimize_queryset(self, queryset, extra=()):
+        if "groups" in self.fields:
+            # Role cache keys carry the version, read it along with the row
+            extra = [*extra, "role_version"]
+        return super().optimize_queryset(queryset, extra)
+
+    def to_representation(self, instance):
+        # Every field is a plain column, build the dict directly instead of
+        # going through one field object per column per row
+        data = {name: getattr(instance, name) for name in self.column_names}
+        if "groups" not in self.fields:
+            return data
+        # Group names are the user's roles, served by the role cache
+        roles = self.context.get("roles", {}).get(instance.pk)
+        if roles is None:
+            roles = role_cache.get(instance.pk, instance.role_version if _has_role_version(instance) else None)
+        data["groups"] = list(roles[0])
+        return data
@@ -1,19 +1,62 @@
-from django.contrib.auth.models import Group
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from api.conditional import bump_table_version
+
+from .roles import SUB_ROLES, group_id, invalidate_roles
+
+User = get_user_model()
 
 # Sample code to manipulate group membership
+# Cached roles are dropped by the m2m_changed receiver in signals.py
 class OrgOfficer:
     def grant(user):
-        group, _ = Group.objects.get_or_create(name="org_officer")
-        user.groups.add(group)
+        user.groups.add(group_id("org_officer"))
 
     def revoke(user):
-        group, _ = Group.objects.get_or_create(name="org_officer")
-        user.groups.remove(group)
+        user.groups.remove(group_id("org_officer"))
 
 class Registrar:
     def grant(user):
-        group, _ = Group.objects.get_or_create(name="registrar")
-        user.groups.add(group)
+        user.groups.add(group_id("registrar"))
     def revoke(user):
-        group, _ = Group.objects.get_or_create(name="registrar")
-        user.groups.remove(group)
+        user.groups.remove(group_id("registrar"))
+
+
+def change_role(role, user_ids, grant):
+    """Grant or revoke a sub-role for many users at once.
+
+    Membership rows are written with one bulk insert or one delete on the
+    groups through-table. Returns {user_id: status}, where status is one of
+    granted, already_granted, revoked, not_granted or not_found.
+    """
+    if role not in SUB_ROLES:
+        raise ValueError(f"Unknown role '{role}'")
+    gid = group_id(role)
+    Membership = User.groups.through
+    user_ids = list(dict.fromkeys(user_ids))
+
+    with transaction.atomic():
+        found = set(User.objects.filter(pk__in=user_ids).values_list("pk", flat=True))
+        members = set(
+            Membership.objects.filter(group_id=gid, baseuser_id__in=found).values_list("baseuser_id", flat=True)
+        )
+        if grant:
+            changed = [pk for pk in user_ids if pk in found and pk not in members]
+            Membership.objects.bulk_create(
+                [Membership(baseuser_id=pk, group_id=gid) for pk in changed], ignore_conflicts=True
+            )
+        else:
+            changed = [pk for pk in user_ids if pk in members]
+            Membership.objects.filter(group_id=gid, baseuser_id__in=changed).delete()
+
+    # Bulk writes skip m2m_changed, so drop cached roles and ETags here
+    invalidate_roles(*changed)
+    if changed:
+        bump_table_version(Membership)
+
+    unchanged = "already_granted" if grant else "not_granted"
+    done = "granted" if grant else "revoked"
+    return {
+        pk: "not_found" if pk not in found else done if pk in changed else unchanged
+        for pk in user_ids
+    }
@@ -1,11 +1,48 @@
 # backend/apps/Users/signals.py
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 
+from api.conditional import track_table_changes
+
+from .models import FacultyDepartment, FacultyProfile, Position, Program, Section, StaffProfile, StudentProfile
+from .roles import forget_auth_state, forget_group_ids, invalidate_roles
+
 User = get_user_model()
 
+# Table versions behind the ETags of the user endpoints (api/conditional.py)
+track_table_changes(
+    User, User.groups.through, StudentProfile, FacultyProfile, StaffProfile,
+    Program, Section, FacultyDepartment, Position,
+)
+
+@receiver([post_save, post_delete], sender=Group)
+def reset_group_ids(sender, **kwargs):
+    forget_group_ids()
+
+@receiver(m2m_changed, sender=User.groups.through)
+def drop_cached_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    # reverse=True means the change came from the group side (group.user_set)
+    if action == "pre_clear" and reverse:
+        # Remember the members before the rows are gone
+        instance._cleared_user_ids = list(instance.user_set.values_list("pk", flat=True))
+        return
+    if action in ("post_add", "post_remove"):
+        if not pk_set:
+            return
+        user_ids = pk_set if reverse else [instance.pk]
+    elif action == "post_clear":
+        user_ids = getattr(instance, "_cleared_user_ids", []) if reverse else [instance.pk]
+    else:
+        return
+    invalidate_roles(*user_ids)
+
+@receiver([post_save, post_delete], sender=User)
+def drop_auth_state(sender, instance, **kwargs):
+    # is_active lives next to role_version in the cached auth state
+    forget_auth_state(instance.pk)
+
 @receiver(post_save, sender=User)
 def assign_default_role(sender, instance, created, **kwargs):
     if not created:
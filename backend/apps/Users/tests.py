@@ -1,3 +1,941 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_login_failed
+from django.contrib.auth.models import Group
+from django.core.cache import cache, caches
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.models import TableVersion
+from api.renderers import FastJSONRenderer
+from api.throttling import SlidingWindowCounter
+from middleware.mw import endpoint_stats
+
+from .lookups import IDENTIFIER_FIELDS, find_user, matching, taken, with_lower
+from .models import Program, StudentProfile
+from .navigation import NavigationIndex, navigation
+from .roles import get_role_version, group_id, resolve_roles, role_cache
+from .serializers import StudentProfileSerializer
+from .tokens import RoleRefreshToken
+from .services import OrgOfficer, Registrar
+
+User = get_user_model()
+
+# PBKDF2 makes every login cross SLOW_REQUEST_MS and flood the run with warnings
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class LoginTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["throttle"].clear()
+        self.client = APIClient()
+        self.url = reverse("user-login")
+        self.user = User.objects.create_user(
+            username="Andrea",
+            email="Andrea.R@cmu.edu.ph",
+            password="password123",
+            institutional_id="456456456",
+            role_type="student",
+        )
+
+    def login(self, identifier, password="password123"):
+        return self.client.post(self.url, {"identifier": identifier, "password": password}, format="json")
+
+    def test_login_with_username(self):
+        resp = self.login("Andrea")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data["roles"], ["student"])
+        self.assertEqual(resp.data["primary_role"], "student")
+        self.assertTrue(resp.data["access_token"])
+
+    def test_login_with_email_is_case_insensitive(self):
+        resp = self.login("andrea.r@CMU.edu.ph")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data["user"]["username"], "Andrea")
+
+    def test_login_with_username_ignores_case_but_prefers_exact_match(self):
+        self.assertEqual(self.login("ANDREA").data["user"]["username"], "Andrea")
+        User.objects.create_user(username="andrea", password="password123", institutional_id="456456457")
+        self.assertEqual(self.login("andrea").data["user"]["username"], "andrea")
+        self.assertEqual(self.login("Andrea").data["user"]["username"], "Andrea")
+
+    def test_wrong_password_and_unknown_user_are_rejected(self):
+        self.assertEqual(self.login("Andrea", "nope").status_code, 400)
+        self.assertEqual(self.login("ghost").status_code, 400)
+
+    def test_inactive_user_is_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+        resp = self.login("Andrea")
+        self.assertEqual(resp.status_code, 400)
+        # Indistinguishable from a wrong password
+        self.assertIn("Invalid credentials.", str(resp.data))
+        self.assertNotIn("inactive", str(resp.data))
+
+    def test_failed_login_sends_user_login_failed(self):
+        failed = []
+        handler = lambda sender, credentials, **kwargs: failed.append(credentials)
+        user_login_failed.connect(handler)
+        self.addCleanup(user_login_failed.disconnect, handler)
+        self.login(self.user.username, "nope")
+        self.assertEqual(len(failed), 1)
+        self.assertNotEqual(failed[0]["password"], "nope")
+
+    def test_cached_login_uses_a_single_query(self):
+        self.login("Andrea")
+        with self.assertNumQueries(1):
+            self.assertEqual(self.login("Andrea").status_code, 200)
+
+    def test_role_change_refreshes_cached_roles(self):
+        self.login("Andrea")
+        OrgOfficer.grant(self.user)
+        resp = self.login("Andrea")
+        self.assertCountEqual(resp.data["roles"], ["student", "org_officer"])
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class TokenRefreshTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        User.objects.create_user(
+            username="Lorna", password="password123", institutional_id="789789789", role_type="faculty"
+        )
+
+    def test_refresh_token_issues_new_access_token(self):
+        login = self.client.post(
+            reverse("user-login"), {"identifier": "Lorna", "password": "password123"}, format="json"
+        )
+        refresh = login.data["refresh_token"]
+        resp = self.client.post(reverse("token-refresh"), {"refresh": refresh}, format="json")
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.data["access"])
+
+    def test_invalid_refresh_token_is_rejected(self):
+        resp = self.client.post(reverse("token-refresh"), {"refresh": "garbage"}, format="json")
+        self.assertEqual(resp.status_code, 401)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class RoleClaimsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username="admin", password="admin123", institutional_id="ADM-0001", role_type="admin"
+        )
+        self.admin.groups.add(Group.objects.get_or_create(name="admin")[0])
+        self.student = User.objects.create_user(
+            username="Andrea", password="password123", institutional_id="456456456", role_type="student"
+        )
+
+    def token_for(self, username, password):
+        resp = self.client.post(
+            reverse("user-login"), {"identifier": username, "password": password}, format="json"
+        )
+        return resp.data["access_token"]
+
+    def promote(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return self.client.post(f"/api/users/roles/registrar/{self.student.pk}/promote/")
+
+    def test_access_token_carries_role_claims(self):
+        token = AccessToken(self.token_for("admin", "admin123"))
+        self.assertEqual(token["roles"], ["admin"])
+        self.assertEqual(token["primary_role"], "admin")
+
+    def test_role_check_reads_only_the_role_version(self):
+        token = self.token_for("Andrea", "password123")
+        # role_version and is_active, the roles come from the token
+        with self.assertNumQueries(1):
+            self.assertEqual(self.promote(token).status_code, 403)
+
+    def test_admin_role_can_promote(self):
+        token = self.token_for("admin", "admin123")
+        self.assertEqual(self.promote(token).status_code, 200)
+        self.assertTrue(self.student.groups.filter(name="registrar").exists())
+
+    def test_role_change_invalidates_issued_tokens(self):
+        token = self.token_for("Andrea", "password123")
+        Registrar.grant(self.student)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(self.client.get("/api/users/").status_code, 401)
+
+    def test_outdated_tokens_stay_invalid_without_the_cache(self):
+        token = self.token_for("admin", "admin123")
+        self.admin.groups.remove(Group.objects.get(name="admin"))
+        # Evicted, restarted or another worker's cache
+        cache.clear()
+        self.assertEqual(self.promote(token).status_code, 401)
+
+    def test_deactivated_user_is_rejected(self):
+        token = self.token_for("admin", "admin123")
+        User.objects.filter(pk=self.admin.pk).update(is_active=False)
+        self.assertEqual(self.promote(token).status_code, 401)
+
+    @override_settings(ROLE_VERSION_CACHE="default")
+    def test_role_check_reads_the_shared_cache(self):
+        token = self.token_for("Andrea", "password123")
+        self.promote(token)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.promote(token).status_code, 403)
+
+    @override_settings(ROLE_VERSION_CACHE="default")
+    def test_shared_cache_follows_role_changes_and_deactivation(self):
+        token = self.token_for("admin", "admin123")
+        self.assertEqual(self.promote(token).status_code, 200)
+        Registrar.grant(self.admin)
+        self.assertEqual(self.promote(token).status_code, 401)
+        token = self.token_for("admin", "admin123")
+        self.assertEqual(self.promote(token).status_code, 200)
+        self.admin.is_active = False
+        self.admin.save(update_fields=["is_active"])
+        self.assertEqual(self.promote(token).status_code, 401)
+
+
+class UserDirectoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        groups = [Group.objects.get_or_create(name=name)[0] for name in ("student", "org_officer")]
+        users = User.objects.bulk_create(
+            User(username=f"user{i:03}", email=f"user{i:03}@cmu.edu.ph", institutional_id=f"2025{i:06}")
+            for i in range(60)
+        )
+        Through = User.groups.through
+        Through.objects.bulk_create(
+            Through(baseuser_id=u.pk, group_id=g.pk) for u in users for g in groups
+        )
+        cls.admin = users[0]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_pages_follow_the_cursor(self):
+        resp = self.client.get("/api/users/", {"page_size": 25})
+        self.assertEqual(len(resp.data["results"]), 25)
+        self.assertCountEqual(resp.data["results"][0]["groups"], ["student", "org_officer"])
+        seen = [u["id"] for u in resp.data["results"]]
+        while resp.data["next"]:
+            resp = self.client.get(resp.data["next"])
+            seen += [u["id"] for u in resp.data["results"]]
+        self.assertEqual(len(seen), 60)
+        self.assertEqual(seen, sorted(seen))
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        # Table versions, the page, and the roles the cache is missing
+        for page_size in (5, 50):
+            with self.assertNumQueries(3):
+                resp = self.client.get("/api/users/", {"page_size": page_size})
+            self.assertEqual(len(resp.data["results"]), page_size)
+        # Every role is cached now, only the versions and the page itself are queried
+        with self.assertNumQueries(2):
+            self.client.get("/api/users/", {"page_size": 50})
+
+
+class UserSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        people = [
+            ("jdelacruz", "Juan", "Dela Cruz", "2025000001"),
+            ("maria", "Maria", "Johnson", "2025000002"),
+            ("johnny", "Johnny", "Bautista", "2024000003"),
+            ("lorna", "Lorna", "Reyes", "789789789"),
+        ]
+        for username, first, last, inst_id in people:
+            User.objects.create_user(
+                username=username, first_name=first, last_name=last,
+                email=f"{username}@cmu.edu.ph", institutional_id=inst_id,
+            )
+        cls.viewer = User.objects.get(username="lorna")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def usernames(self, resp):
+        return [u["username"] for u in resp.data["results"]]
+
+    def test_search_matches_name_prefixes(self):
+        resp = self.client.get("/api/users/", {"search": "joh"})
+        self.assertCountEqual(self.usernames(resp), ["maria", "johnny"])
+
+    def test_search_matches_institutional_id_prefix(self):
+        resp = self.client.get("/api/users/search/", {"q": "2025"})
+        self.assertCountEqual(self.usernames(resp), ["jdelacruz", "maria"])
+
+    def test_word_prefixes_match_on_every_backend(self):
+        self.assertEqual(self.usernames(self.client.get("/api/users/", {"search": "cru"})), ["jdelacruz"])
+
+    def test_mid_word_terms_only_match_on_postgres(self):
+        # Substrings on PostgreSQL, word prefixes with FTS5 (see search.py)
+        expected = ["jdelacruz"] if connection.vendor == "postgresql" else []
+        self.assertEqual(self.usernames(self.client.get("/api/users/", {"search": "ruz"})), expected)
+
+    def test_ranked_search_puts_username_hits_first(self):
+        resp = self.client.get("/api/users/search/", {"q": "john", "limit": 5})
+        self.assertEqual(self.usernames(resp), ["johnny", "maria"])
+
+    def test_index_follows_updates(self):
+        User.objects.filter(username="lorna").update(last_name="Tan")
+        self.assertEqual(self.usernames(self.client.get("/api/users/", {"search": "reyes"})), [])
+        self.assertEqual(self.usernames(self.client.get("/api/users/", {"search": "tan"})), ["lorna"])
+
+
+class RosterImportTests(TestCase):
+    ROSTER = (
+        "username,email,password,first_name,last_name,institutional_id,role_type,program,section,year_level,department,position,job_title\n"
+        "s01,s01@cmu.edu.ph,pass1234,Ana,Reyes,2025000101,student,BS IT,IT-1A,1,,,\n"
+        "s02,s02@cmu.edu.ph,pass1234,Ben,Cruz,2025000102,student,BS IT,IT-1B,2,,,\n"
+        "f01,f01@cmu.edu.ph,pass1234,Carla,Santos,F-0001,faculty,,,,CISC,Instructor 1,\n"
+        "t01,t01@cmu.edu.ph,pass1234,Dan,Lim,T-0001,staff,,,,CISC,,registrar\n"
+        ",nobody@cmu.edu.ph,pass1234,No,Name,X-0001,student,,,,,,\n"
+    )
+
+    def run_import(self):
+        import io
+        from .roster import RosterImporter, read_roster
+        return RosterImporter(batch_size=2, workers=0).run(read_roster(io.StringIO(self.ROSTER)))
+
+    def test_import_creates_users_profiles_and_groups(self):
+        importer = self.run_import()
+        self.assertEqual(importer.created, 4)
+        self.assertEqual(len(importer.errors), 1)
+
+        s01 = User.objects.get(username="s01")
+        self.assertTrue(s01.check_password("pass1234"))
+        self.assertEqual(s01.student_profile.program.program_name, "BS IT")
+        self.assertEqual(list(s01.groups.values_list("name", flat=True)), ["student"])
+        self.assertEqual(User.objects.get(username="f01").faculty_profile.position.position_name, "Instructor 1")
+        self.assertEqual(User.objects.get(username="t01").staff_profile.job_title, "registrar")
+
+    def test_reimport_skips_existing_accounts(self):
+        self.run_import()
+        importer = self.run_import()
+        self.assertEqual((importer.created, importer.skipped), (0, 4))
+
+    def test_duplicates_within_a_batch_are_reported(self):
+        import io
+        from .roster import RosterImporter, read_roster
+        roster = '[{"username": "d01", "institutional_id": "D-1"}, {"username": "D01", "institutional_id": "D-2"},' \
+                 ' {"username": "d02", "institutional_id": "d-1"}, ["not", "an", "object"]]'
+        importer = RosterImporter(workers=0).run(read_roster(io.StringIO(roster), "json"))
+        self.assertEqual(importer.created, 1)
+        self.assertEqual([e["row"] for e in importer.errors], [4, 2, 3])
+        self.assertIn("duplicate username", importer.errors[1]["error"])
+        self.assertIn("duplicate institutional_id", importer.errors[2]["error"])
+
+    def test_values_longer_than_their_column_are_reported(self):
+        import io
+        from .roster import RosterImporter, read_roster
+        roster = '{"username": "l01", "institutional_id": "L-1", "suffix": "Junior"}\n' \
+                 '{"username": "l02", "institutional_id": "L-2", "section": "IT-1A-EVENING"}\n' \
+                 '{"username": "l03", "institutional_id": "L-3", "phone_number": "09171234567"}\n'
+        importer = RosterImporter(workers=0).run(read_roster(io.StringIO(roster), "jsonl"))
+        self.assertEqual(importer.created, 1)
+        self.assertEqual([e["row"] for e in importer.errors], [1, 2])
+        self.assertIn("suffix is longer than 5", importer.errors[0]["error"])
+
+    def test_unreadable_uploads_are_rejected(self):
+        import io
+        admin = User.objects.create_user(username="admin", institutional_id="ADM-0001")
+        admin.groups.add(Group.objects.get(name="admin"))
+        client = APIClient()
+        client.force_authenticate(admin)
+        for name, content in [
+            ("roster.json", b'[{"username": "x01",'),
+            ("roster.json", b'{"username": "x01"}'),
+            ("roster.jsonl", b'{"username": "x01", "institutional_id": "X-1"}\n{oops}\n'),
+            ("roster.csv", "username,institutional_id\nJos\u00e9,X-2\n".encode("latin-1")),
+        ]:
+            with self.subTest(name=name, content=content):
+                upload = io.BytesIO(content)
+                upload.name = name
+                resp = client.post(reverse("user-roster-import"), {"file": upload}, format="multipart")
+                self.assertEqual(resp.status_code, 400)
+                self.assertIn("Could not read the roster", resp.data["message"])
+
+
+class BatchRoleChangeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username="admin", institutional_id="ADM-0001")
+        cls.admin.groups.add(Group.objects.get(name="admin"))
+        cls.students = User.objects.bulk_create(
+            User(username=f"s{i}", institutional_id=f"S-{i}") for i in range(5)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def batch(self, action, user_ids, role="org_officer"):
+        return self.client.post(
+            reverse("role-batch"), {"role": role, "action": action, "user_ids": user_ids}, format="json"
+        )
+
+    def test_grant_then_revoke_many(self):
+        ids = [u.pk for u in self.students]
+        OrgOfficer.grant(self.students[0])
+        resp = self.batch("grant", ids + [999999])
+        statuses = {r["user_id"]: r["status"] for r in resp.data["results"]}
+        self.assertEqual(statuses[ids[0]], "already_granted")
+        self.assertEqual(statuses[ids[1]], "granted")
+        self.assertEqual(statuses[999999], "not_found")
+        self.assertEqual(Group.objects.get(name="org_officer").user_set.count(), 5)
+
+        resp = self.batch("revoke", ids[:2])
+        self.assertEqual([r["status"] for r in resp.data["results"]], ["revoked", "revoked"])
+        self.assertEqual(Group.objects.get(name="org_officer").user_set.count(), 3)
+
+    def test_query_count_does_not_depend_on_batch_size(self):
+        self.batch("grant", [self.students[0].pk])
+        # role version, savepoint, users, members, insert, role versions, table version, release
+        with self.assertNumQueries(8):
+            self.batch("grant", [u.pk for u in self.students])
+
+    def test_unknown_role_is_rejected(self):
+        self.assertEqual(self.batch("grant", [self.students[0].pk], role="admin").status_code, 400)
+
+
+class RoleCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="Paolo", institutional_id="123123123", role_type="staff")
+        self.user.groups.add(group_id("staff"))
+
+    def test_hit_costs_no_query(self):
+        version = get_role_version(self.user.pk)
+        role_cache.get(self.user.pk)
+        hits = role_cache.hits
+        with self.assertNumQueries(0):
+            self.assertEqual(resolve_roles(self.user.pk, version), (["staff"], "staff"))
+        self.assertEqual(role_cache.hits, hits + 1)
+
+    def test_change_is_seen_without_dropping_cache_entries(self):
+        resolve_roles(self.user.pk)
+        # As another process would, whose cache invalidate() never touched
+        Membership = Group.user_set.through
+        Membership.objects.create(baseuser_id=self.user.pk, group_id=group_id("registrar"))
+        role_cache.invalidate(self.user.pk)
+        self.assertCountEqual(resolve_roles(self.user.pk)[0], ["staff", "registrar"])
+
+    def test_group_changes_from_either_side_invalidate(self):
+        resolve_roles(self.user.pk)
+        self.user.groups.add(group_id("registrar"))
+        self.assertCountEqual(resolve_roles(self.user.pk)[0], ["staff", "registrar"])
+
+        Group.objects.get(name="registrar").user_set.remove(self.user)
+        self.assertEqual(resolve_roles(self.user.pk)[0], ["staff"])
+
+        Group.objects.get(name="staff").user_set.clear()
+        self.assertEqual(resolve_roles(self.user.pk), ([], None))
+
+    def test_role_change_bumps_token_version(self):
+        before = get_role_version(self.user.pk)
+        Registrar.grant(self.user)
+        self.assertEqual(get_role_version(self.user.pk), before + 1)
+
+    def test_string_ids_from_token_claims(self):
+        self.assertEqual(resolve_roles(str(self.user.pk)), (["staff"], "staff"))
+
+
+class RequestTimingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username="admin", institutional_id="ADM-0001")
+        cls.admin.groups.add(Group.objects.get(name="admin"))
+        cls.student = User.objects.create_user(username="student", institutional_id="S-0001")
+
+    def setUp(self):
+        cache.clear()
+        endpoint_stats.reset()
+        self.client = APIClient()
+
+    def test_server_timing_header_counts_queries(self):
+        self.client.force_authenticate(self.admin)
+        resp = self.client.get(reverse("user-list"))
+        self.assertRegex(resp["Server-Timing"], r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries"$')
+
+    def test_stats_group_requests_by_route(self):
+        self.client.force_authenticate(self.admin)
+        self.client.get(reverse("user-detail", args=[self.admin.pk]))
+        self.client.get(reverse("user-detail", args=[self.student.pk]))
+        stats = self.client.get(reverse("request-stats")).data
+        self.assertEqual(stats["endpoints"]["GET /api/users/<pk>/"]["count"], 2)
+
+    def test_stats_require_admin_role(self):
+        self.client.force_authenticate(self.student)
+        self.assertEqual(self.client.get(reverse("request-stats")).status_code, 403)
+
+    @override_settings(SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged_with_their_sql(self):
+        self.client.force_authenticate(self.admin)
+        with self.assertLogs("middleware.mw", "WARNING") as logs:
+            self.client.get(reverse("user-list"))
+        self.assertIn("SELECT", logs.output[0])
+
+    @override_settings(SLOW_REQUEST_MS=0)
+    def test_streaming_responses_are_not_timed(self):
+        self.client.force_authenticate(self.admin)
+        with self.assertNoLogs("middleware.mw", "WARNING"):
+            resp = self.client.get(reverse("user-export"))
+        self.assertTrue(resp.streaming)
+        self.assertNotIn("Server-Timing", resp)
+
+
+class CampusGeneratorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def generate(self, **kwargs):
+        from .campus import CampusGenerator
+        return CampusGenerator(students=30, faculty=4, staff=3, **kwargs).run()
+
+    def snapshot(self):
+        from .campus import campus_users
+        return list(campus_users().order_by("username").values_list(
+            "username", "first_name", "last_name", "student_profile__section__section_name",
+        ))
+
+    def test_builds_accounts_profiles_and_roles(self):
+        summary = self.generate()
+        self.assertEqual(summary.users, 38)
+        self.assertEqual(User.objects.filter(student_profile__isnull=False).count(), 30)
+        self.assertEqual(User.objects.filter(faculty_profile__position__isnull=False).count(), 4)
+        self.assertEqual(Group.objects.get(name="staff").user_set.count(), 3)
+        self.assertEqual(resolve_roles(User.objects.get(username="campus_admin").pk)[0], ["admin"])
+
+    def test_same_seed_same_campus(self):
+        from .campus import CampusGenerator
+        self.generate(batch_size=7)
+        first = self.snapshot()
+        CampusGenerator().flush()
+        self.generate(batch_size=1000)
+        self.assertEqual(self.snapshot(), first)
+
+
+class RenderingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username="admin", institutional_id="ADM-0001")
+        cls.admin.groups.add(Group.objects.get(name="admin"))
+        User.objects.bulk_create(
+            User(username=f"user{i:03d}", first_name="Ma ria", institutional_id=f"R-{i}") for i in range(60)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_fast_renderer_matches_drf_output(self):
+        data = {"when": datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc), "price": Decimal("1.50"),
+                1: "int key", "name": "Ma ria", "nested": [None, True, 1.5]}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_large_lists_are_gzipped_when_accepted(self):
+        resp = self.client.get(reverse("user-list"), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", resp["Vary"])
+        self.assertEqual(len(json.loads(gzip.decompress(resp.content))["results"]), 50)
+
+    def test_small_or_unaccepted_responses_stay_plain(self):
+        resp = self.client.get(reverse("user-detail", args=[self.admin.pk]), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(resp.has_header("Content-Encoding"))
+        resp = self.client.get(reverse("user-list"), HTTP_ACCEPT_ENCODING="gzip;q=0, identity")
+        self.assertFalse(resp.has_header("Content-Encoding"))
+
+    def test_export_streams_every_user(self):
+        from . import views
+        views.EXPORT_CHUNK, chunk = 25, views.EXPORT_CHUNK
+        try:
+            resp = self.client.get(reverse("user-export"), HTTP_ACCEPT_ENCODING="gzip")
+            body = gzip.decompress(b"".join(resp.streaming_content))
+        finally:
+            views.EXPORT_CHUNK = chunk
+        users = json.loads(body)
+        self.assertEqual(len(users), 61)
+        self.assertEqual(users[-1]["username"], "user059")
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username="admin", institutional_id="ADM-0001")
+        cls.admin.groups.add(Group.objects.get(name="admin"))
+        cls.student = User.objects.create_user(username="student", institutional_id="S-0001")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.url = reverse("user-list")
+
+    def revalidate(self, url=None):
+        etag = self.client.get(url or self.url)["ETag"]
+        return lambda: self.client.get(url or self.url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_list_is_not_modified_from_the_versions_alone(self):
+        again = self.revalidate()
+        with self.assertNumQueries(1):
+            resp = again()
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.content, b"")
+        self.assertTrue(resp["ETag"])
+
+    def test_row_and_role_changes_change_the_etag(self):
+        again = self.revalidate()
+        self.student.first_name = "Changed"
+        self.student.save()
+        self.assertEqual(again().status_code, 200)
+
+        again = self.revalidate()
+        Registrar.grant(self.student)
+        self.assertEqual(again().status_code, 200)
+
+        again = self.revalidate()
+        self.client.post(reverse("role-batch"), {"role": "registrar", "action": "revoke",
+                                                 "user_ids": [self.student.pk]}, format="json")
+        self.assertEqual(again().status_code, 200)
+
+    def test_etag_depends_on_query_and_user(self):
+        list_etag = self.client.get(self.url)["ETag"]
+        self.assertNotEqual(self.client.get(self.url, {"page_size": 1})["ETag"], list_etag)
+        self.client.force_authenticate(self.student)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=list_etag).status_code, 200)
+
+    def test_change_within_the_same_second_is_not_a_304(self):
+        resp = self.client.get(self.url)
+        # Whole seconds can't tell two changes in one second apart, so it isn't sent
+        self.assertNotIn("Last-Modified", resp)
+        self.student.first_name = "Changed"
+        self.student.save()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=resp["ETag"]).status_code, 200)
+
+    def test_versions_are_shared_through_the_database(self):
+        etag = self.client.get(self.url)["ETag"]
+        # Another worker's cache, or this one restarted
+        cache.clear()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        TableVersion.objects.filter(table=User._meta.db_table).update(version=F("version") + 1)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class SparseFieldsetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username="admin", email="admin@cmu.edu.ph", institutional_id="ADM-0001")
+        cls.admin.groups.add(Group.objects.get(name="admin"))
+        program = Program.objects.create(program_name="BS Computer Science")
+        StudentProfile.objects.create(user=cls.admin, program=program, year_level=2)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def serialize_profile(self, query=""):
+        request = Request(APIRequestFactory().get("/profiles/" + query))
+        serializer = StudentProfileSerializer(context={"request": request}, many=True)
+        with CaptureQueriesContext(connection) as ctx:
+            data = serializer.child.optimize_queryset(StudentProfile.objects.all())
+            data = StudentProfileSerializer(data, many=True, context={"request": request}).data
+        return data[0], ctx.captured_queries
+
+    def test_list_selects_only_requested_columns(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get("/api/users/", {"fields": "id,username"})
+        self.assertEqual(resp.data["results"][0], {"id": self.admin.pk, "username": "admin"})
+        # Table versions, then the page; no groups asked for, so no role lookup either
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertNotIn("email", ctx.captured_queries[1]["sql"])
+
+    def test_every_field_by_default(self):
+        row = self.client.get("/api/users/").data["results"][0]
+        self.assertEqual(row["email"], "admin@cmu.edu.ph")
+        self.assertEqual(row["groups"], ["admin"])
+
+    def test_details_are_joined_unless_left_out(self):
+        data, queries = self.serialize_profile()
+        self.assertEqual(data["program_detail"], {"id": data["program"], "program_name": "BS Computer Science"})
+        self.assertIsNone(data["section_detail"])
+        self.assertEqual(len(queries), 1)
+        self.assertIn("users_program", queries[0]["sql"])
+
+        data, queries = self.serialize_profile("?fields=user.username,year_level")
+        self.assertEqual(data, {"user": {"username": "admin"}, "year_level": 2})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("users_program", queries[0]["sql"])
+        self.assertNotIn("email", queries[0]["sql"])
+
+
+class BatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username="admin", institutional_id="ADM-0001")
+        cls.admin.groups.add(Group.objects.get(name="admin"))
+        cls.student = User.objects.create_user(username="student", institutional_id="S-0001")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        token = RoleRefreshToken.for_user(self.admin).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def batch(self, *calls):
+        return self.client.post(reverse("batch"), {"requests": list(calls)}, format="json")
+
+    def test_responses_come_back_in_request_order(self):
+        resp = self.batch(
+            {"id": "before", "path": f"/api/users/{self.student.pk}/"},
+            {"id": "grant", "method": "POST", "path": "/api/users/roles/batch/",
+             "body": {"role": "registrar", "action": "grant", "user_ids": [self.student.pk]}},
+            {"id": "after", "path": f"http://testserver/api/users/{self.student.pk}/?fields=groups"},
+        )
+        self.assertEqual(resp.status_code, 200)
+        before, grant, after = resp.data["responses"]
+        self.assertEqual([r["id"] for r in resp.data["responses"]], ["before", "grant", "after"])
+        self.assertEqual(before["body"]["groups"], [])
+        self.assertEqual(grant["status"], 200)
+        self.assertEqual(after["body"], {"groups": ["registrar"]})
+        self.assertIn("ETag", after["headers"])
+
+    def test_sub_requests_use_the_callers_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RoleRefreshToken.for_user(self.student).access_token}")
+        resp = self.batch({"method": "POST", "path": "/api/users/roles/batch/",
+                           "body": {"role": "registrar", "action": "grant", "user_ids": [self.student.pk]}})
+        self.assertEqual(resp.data["responses"][0]["status"], 403)
+
+    def test_bad_sub_requests_fail_on_their_own(self):
+        resp = self.batch(
+            {"path": "/api/nowhere/"},
+            {"method": "POST", "path": reverse("batch"), "body": {"requests": []}},
+            {"path": reverse("user-export")},
+            {"path": reverse("user-list")},
+        )
+        self.assertEqual([r["status"] for r in resp.data["responses"]], [404, 400, 400, 200])
+        self.assertEqual(self.batch().status_code, 400)
+
+
+NAV = {"parents": [
+    {"id": 1, "name": "Dashboard", "mains": [
+        {"id": 1, "name": "Dashboard", "function": "Dashboard()", "path": "views.Dashboard.Dashboard",
+         "access": ["admin", "student"], "modulars": [
+             {"id": 1, "name": "Admin only", "function": "()", "path": "", "access": ["admin"]},
+             {"id": 2, "name": "Inherited", "function": "()", "path": ""},
+         ]},
+    ]},
+    {"id": 2, "name": "Tools", "mains": [
+        {"id": 2, "name": "Reports", "function": "()", "path": "", "access": "admin", "modulars": []},
+    ]},
+]}
+
+
+class BootstrapTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(username="student", institutional_id="S-0001")
+        cls.student.groups.add(Group.objects.get(name="student"))
+        program = Program.objects.create(program_name="BS Biology")
+        StudentProfile.objects.create(user=cls.student, program=program, year_level=1)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+        self.nav_file = os.path.join(tempfile.mkdtemp(), "navbar.json")
+        self.write_nav(NAV)
+        navigation.path = self.nav_file
+        self.addCleanup(setattr, navigation, "path", None)
+
+    def write_nav(self, definition, mtime=1_700_000_000):
+        with open(self.nav_file, "w") as fh:
+            json.dump(definition, fh)
+        os.utime(self.nav_file, (mtime, mtime))
+
+    def test_profile_roles_and_navigation_in_one_response(self):
+        with self.assertNumQueries(3):
+            resp = self.client.get(reverse("user-bootstrap"))
+        self.assertEqual(resp.data["user"]["username"], "student")
+        self.assertEqual(resp.data["profile_type"], "student")
+        self.assertEqual(resp.data["profile"]["program_detail"]["program_name"], "BS Biology")
+        self.assertEqual((resp.data["roles"], resp.data["primary_role"]), (["student"], "student"))
+        [parent] = resp.data["navigation"]["parents"]
+        self.assertEqual([m["name"] for m in parent["mains"]], ["Dashboard"])
+        self.assertEqual([m["name"] for m in parent["mains"][0]["modulars"]], ["Inherited"])
+        # Assembled once, then served from the cache after the version check
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(reverse("user-bootstrap")).data, resp.data)
+
+    def test_navigation_changes_are_picked_up(self):
+        etag = self.client.get(reverse("user-bootstrap"))["ETag"]
+        changed = json.loads(json.dumps(NAV))
+        changed["parents"][1]["mains"][0]["access"] = ["admin", "student"]
+        self.write_nav(changed, mtime=1_700_000_100)
+        resp = self.client.get(reverse("user-bootstrap"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([p["name"] for p in resp.data["navigation"]["parents"]], ["Dashboard", "Tools"])
+
+    def test_trees_are_built_per_role(self):
+        index = NavigationIndex(self.nav_file)
+        self.assertEqual([p["name"] for p in index.tree_for("admin")["parents"]], ["Dashboard", "Tools"])
+        self.assertEqual(index.tree_for("faculty"), {"parents": []})
+
+    def test_secondary_roles_pages_are_included(self):
+        self.student.groups.add(Group.objects.get(name="admin"))
+        resp = self.client.get(reverse("user-bootstrap"))
+        self.assertEqual(resp.data["primary_role"], "admin")
+        [dashboard, tools] = resp.data["navigation"]["parents"]
+        self.assertEqual([m["name"] for m in dashboard["mains"][0]["modulars"]], ["Admin only", "Inherited"])
+        self.assertEqual([m["name"] for m in tools["mains"]], ["Reports"])
+        index = NavigationIndex(self.nav_file)
+        self.assertEqual(index.tree_for("student", "admin"), index.tree_for("admin", "student"))
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["throttle"].clear()
+        self.client = APIClient()
+        self.url = reverse("user-login")
+        self.user = User.objects.create_user(
+            username="victim", email="victim@cmu.edu.ph", password="password123", institutional_id="T-0001",
+        )
+
+    def login(self, identifier, password="password123", **extra):
+        return self.client.post(self.url, {"identifier": identifier, "password": password}, format="json", **extra)
+
+    def test_failures_lock_the_identifier_before_the_password_check(self):
+        for _ in range(5):
+            self.assertEqual(self.login("victim", "wrong").status_code, 400)
+        with mock.patch.object(User, "check_password") as check_password, self.assertNumQueries(0):
+            resp = self.login("VICTIM")
+        self.assertEqual(resp.status_code, 429)
+        self.assertIn("Retry-After", resp)
+        check_password.assert_not_called()
+        # Other accounts on the same address are unaffected
+        User.objects.create_user(username="bystander", password="password123", institutional_id="T-0002")
+        self.assertEqual(self.login("bystander").status_code, 200)
+
+    def test_failures_elsewhere_do_not_lock_the_owner_out(self):
+        for _ in range(5):
+            self.login("victim", "wrong", REMOTE_ADDR="10.0.0.9")
+        self.assertEqual(self.login("victim", REMOTE_ADDR="10.0.0.9").status_code, 429)
+        self.assertEqual(self.login("victim").status_code, 200)
+
+    def test_successful_login_clears_failures(self):
+        for _ in range(4):
+            self.login("victim", "wrong")
+        self.assertEqual(self.login("victim").status_code, 200)
+        for _ in range(4):
+            self.assertEqual(self.login("victim", "wrong").status_code, 400)
+
+    @override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {"login_ip": "3/m", "login_identifier": "5/15m"},
+    })
+    def test_attempts_are_limited_per_address(self):
+        for n in range(3):
+            self.assertEqual(self.login(f"nobody{n}", "wrong").status_code, 400)
+        self.assertEqual(self.login("victim").status_code, 429)
+        self.assertEqual(self.login("victim", REMOTE_ADDR="10.0.0.2").status_code, 200)
+        # Forwarded-for headers are not trusted without NUM_PROXIES
+        self.assertEqual(self.login("victim", HTTP_X_FORWARDED_FOR="10.0.0.3").status_code, 429)
+
+    @override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {"login_ip": "7/m", "login_identifier": "5/15m"},
+    })
+    def test_refused_attempts_do_not_count_against_the_address(self):
+        for _ in range(5):
+            self.login("victim", "wrong")
+        for _ in range(5):
+            self.assertEqual(self.login("victim", "wrong").status_code, 429)
+        # 5 failures of the 7 the address may have in flight or failed
+        self.assertEqual(self.login("nobody", "wrong").status_code, 400)
+        self.assertEqual(self.login("nobody", "wrong").status_code, 400)
+        self.assertEqual(self.login("nobody", "wrong").status_code, 429)
+
+    def test_sliding_window_weights_the_previous_window(self):
+        counter = SlidingWindowCounter("test", limit=10, window=60)
+        start = 60 * 1000
+        for _ in range(10):
+            counter.hit("a", now=start + 30)
+        self.assertEqual(counter.count("a", now=start + 59), 10)
+        self.assertEqual(counter.count("a", now=start + 75), 7.5)
+        self.assertEqual(counter.count("a", now=start + 105), 2.5)
+        self.assertEqual(counter.count("a", now=start + 121), 0)
+
+
+class IdentifierIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="Andrea", email="Andrea.R@cmu.edu.ph", password="x", institutional_id="CMU-0456",
+        )
+
+    def plan(self, queryset):
+        if connection.vendor == "postgresql":
+            # A handful of rows is always cheaper to scan, ask whether the index can serve it
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def test_lookups_use_the_lower_indexes(self):
+        for field, index in [("username", "users_username_lower_idx"), ("email", "users_email_lower_idx"),
+                             ("institutional_id", "users_inst_id_lower_idx")]:
+            with self.subTest(field=field):
+                plan = self.plan(matching("someone@cmu.edu.ph", [field]))
+                self.assertIn(index, plan)
+                self.assertIn(index, self.plan(with_lower(User.objects.all(), [field]).filter(
+                    **{f"{field}_lower__in": ["a", "b"]})))
+
+    def test_login_lookup_reads_no_table_scan(self):
+        plan = self.plan(matching("andrea.r@CMU.edu.ph", IDENTIFIER_FIELDS))
+        for index in ("users_username_lower_idx", "users_email_lower_idx", "users_inst_id_lower_idx"):
+            self.assertIn(index, plan)
+        self.assertNotIn("SCAN users_baseuser", plan)
+        self.assertNotIn("Seq Scan", plan)
+
+    def test_iexact_cannot_use_them(self):
+        # What the lookups replace, kept here as the reason they exist
+        plan = self.plan(User.objects.filter(username__iexact="andrea"))
+        self.assertNotIn("users_username_lower_idx", plan)
+
+    def test_lookups_ignore_case(self):
+        self.assertEqual(find_user("aNDREA"), self.user)
+        self.assertEqual(find_user("andrea.r@cmu.edu.ph"), self.user)
+        self.assertIsNone(find_user("cmu-0456"))
+        self.assertEqual(find_user("cmu-0456", IDENTIFIER_FIELDS), self.user)
+        self.assertEqual(taken("username", ["ANDREA", "ghost"]), {"andrea"})
+
+    def test_registration_and_roster_reject_case_variants(self):
+        import io
+        from .roster import RosterImporter, read_roster
+        from .views import UserRegistrationAPIView
+        request = APIRequestFactory().post("/", {"username": "ANDREA", "password": "x", "email": "new@cmu.edu.ph"},
+                                           format="json")
+        force_authenticate(request, self.user)
+        self.assertEqual(UserRegistrationAPIView.as_view()(request).status_code, 400)
+        roster = "username,institutional_id\nandrea,CMU-9999\nnew,cmu-0456\nNew,CMU-1000\n"
+        importer = RosterImporter(workers=0).run(read_roster(io.StringIO(roster)))
+        self.assertEqual((importer.created, importer.skipped), (1, 2))
@@ -0,0 +1,28 @@
+# backend/apps/Users/tokens.py
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .roles import get_role_version, resolve_roles
+
+
+class RoleRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry `roles`, `primary_role` and `rv` claims.
+
+    `rv` is the user's BaseUser.role_version; api.authentication rejects access
+    tokens whose version is behind, so a role change forces a refresh.
+    """
+
+    # Set by callers holding a freshly loaded user, read from the database otherwise
+    role_version = None
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        user_id = self[api_settings.USER_ID_CLAIM]
+        # Version first: a change landing in between leaves the token outdated, not wrong
+        version = self.role_version
+        if version is None:
+            version = get_role_version(user_id)
+        access["rv"] = version
+        access["roles"], access["primary_role"] = resolve_roles(user_id, version)
+        return access
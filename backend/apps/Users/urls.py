@@ -1,16 +1,23 @@
 # backend/api/urls.py
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import UserLoginAPIView, PromoteToOfficerAPIView, DemoteOfficerAPIView, UserViewSet, DemoteRegistrarAPIView, PromoteRegistrarAPIView
+from rest_framework_simplejwt.views import TokenRefreshView
+from .views import UserLoginAPIView, PromoteToOfficerAPIView, DemoteOfficerAPIView, UserViewSet, DemoteRegistrarAPIView, PromoteRegistrarAPIView, RosterImportAPIView, BatchRoleChangeAPIView, BootstrapAPIView
 
 router = DefaultRouter()
 router.register(r"", UserViewSet, basename="user")  # → /api/users/
 urlpatterns = [
+    # Before the router, its detail route would swallow "import/"
+    path("import/", RosterImportAPIView.as_view(), name="user-roster-import"),
+    path("me/bootstrap/", BootstrapAPIView.as_view(), name="user-bootstrap"),
     # Points to UserLoginAPI, to handle authentication
     path("", include(router.urls)),
     path('login/api/', UserLoginAPIView.as_view(), name='user-login'),
+    # Trades the refresh token from login for a new access token
+    path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
     path("roles/org-officer/<int:user_id>/promote/", PromoteToOfficerAPIView.as_view()),
     path("roles/org-officer/<int:user_id>/demote/",  DemoteOfficerAPIView.as_view()),
     path("roles/registrar/<int:user_id>/promote/", PromoteRegistrarAPIView.as_view()),
     path("roles/registrar/<int:user_id>/demote/",  DemoteRegistrarAPIView.as_view()),
+    path("roles/batch/", BatchRoleChangeAPIView.as_view(), name="role-batch"),
 ]
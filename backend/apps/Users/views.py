@@ -4,10 +4,29 @@ from rest_framework.response import Response
 from rest_framework import status,permissions, viewsets, filters
 from django.contrib.auth import authenticate,get_user_model
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from api.conditional import ConditionalGetMixin
+from api.fieldsets import DynamicFieldsViewMixin
+from api.pagination import IdCursorPagination
+from api.permissions import IsAdminRole
+from api.renderers import stream_json_array
+from api.throttling import LoginIdentifierThrottle, LoginIPThrottle, SlidingWindowThrottleMixin
+from .lookups import taken
+from .models import FacultyDepartment, FacultyProfile, Position, Program, Section, StaffProfile, StudentProfile
+from .navigation import navigation
+from .roles import resolve_roles
+from .roster import RosterFormatError, import_uploaded_roster
+from .search import UserSearchFilter, ranked_user_ids, DEFAULT_LIMIT, MAX_LIMIT
 from .serializers import (
-    BaseUserSerializer, LoginSerializer
+    BaseUserSerializer, LoginSerializer, BatchRoleChangeSerializer,
+    FacultyProfileSerializer, StaffProfileSerializer, StudentProfileSerializer,
 )
 
 # Create your views here.
@@ -31,21 +50,28 @@ role.charfield(choices.data)
 
 '''
 
-class UserLoginAPIView(APIView):
+class UserLoginAPIView(SlidingWindowThrottleMixin, APIView):
+    # Stale Authorization headers must not block a fresh login
+    authentication_classes = []
     permission_classes = [permissions.AllowAny]
+    # Checked before the password is, see api/throttling.py
+    throttle_classes = [LoginIPThrottle, LoginIdentifierThrottle]
 
     def post(self, request):
-        ser = LoginSerializer(data=request.data)
-        ser.is_valid(raise_exception=True)
-        data = ser.validated_data
-
+        ser = LoginSerializer(data=request.data, context={"request": request})
         if not ser.is_valid():
+            for throttle in self.get_throttles():
+                throttle.record_failure(request)
             return Response({"errors": ser.errors}, status=status.HTTP_400_BAD_REQUEST)
+        for throttle in self.get_throttles():
+            throttle.record_success(request)
+        data = ser.validated_data
 
         user = data["user"]
         return Response({
             "message": "Login successful",
             "access_token": data["access_token"],
+            "refresh_token": data["refresh_token"],
             "roles": data["roles"],
             "primary_role": data["primary_role"],
             "user": BaseUserSerializer(user).data,
@@ -92,12 +118,14 @@ class UserLoginAPIView(APIView):
 #             'username': user.username,
 #         }, status=status.HTTP_200_OK)
 
-class UserProfileAPIView(APIView):
+class UserProfileAPIView(ConditionalGetMixin, APIView):
     
     # Handles fetching and updating the user profile.
     # This requires the user to be authenticated.
-    
+    # Needs the real BaseUser row, so it skips the stateless token user
+    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    conditional_models = (User,)
 
     def get(self, request):
         user = request.user
@@ -130,10 +158,11 @@ class UserRegistrationAPIView(APIView):
         if not username or not password or not email:
             return Response({"message": "Username, password, and email are required."}, status=status.HTTP_400_BAD_REQUEST)
 
-        if User.objects.filter(username=username).exists():
+        # Login ignores case, so names that differ only in case would collide
+        if taken("username", [username]):
             return Response({"message": "Username already exists."}, status=status.HTTP_400_BAD_REQUEST)
 
-        if User.objects.filter(email=email).exists():
+        if taken("email", [email]):
             return Response({"message": "Email is already registered."}, status=status.HTTP_400_BAD_REQUEST)
 
         user = User.objects.create_user(username=username, email=email, password=password)
@@ -145,12 +174,29 @@ class UserRegistrationAPIView(APIView):
         }, status=status.HTTP_201_CREATED)
     
 # Method na admin ra makagamit or some sort
-from .services import OrgOfficer, Registrar
+from .services import OrgOfficer, Registrar, change_role
 
 User = get_user_model()
 
+class RosterImportAPIView(APIView):
+    """Bulk import accounts from an uploaded roster (multipart field `file`)."""
+    permission_classes = [IsAdminRole]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        uploaded = request.FILES.get("file")
+        if uploaded is None:
+            return Response({"message": "Upload the roster as the 'file' field."}, status=status.HTTP_400_BAD_REQUEST)
+        # Hashed in this process, a pool per request would fork cpu_count
+        # workers out of the web server; large rosters go through import_roster
+        try:
+            summary = import_uploaded_roster(uploaded, workers=0)
+        except RosterFormatError as e:
+            return Response({"message": f"Could not read the roster: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(summary, status=status.HTTP_201_CREATED if summary["created"] else status.HTTP_200_OK)
+
 class PromoteToOfficerAPIView(APIView):
-    permission_classes = [permissions.IsAdminUser]
+    permission_classes = [IsAdminRole]
 
     def post(self, request, user_id):
         user = User.objects.get(pk=user_id)
@@ -158,7 +204,7 @@ class PromoteToOfficerAPIView(APIView):
         return Response({"message": "User promoted to org_officer"}, status=200)
 
 class DemoteOfficerAPIView(APIView):
-    permission_classes = [permissions.IsAdminUser]
+    permission_classes = [IsAdminRole]
 
     def post(self, request, user_id):
         user = User.objects.get(pk=user_id)
@@ -166,23 +212,142 @@ class DemoteOfficerAPIView(APIView):
         return Response({"message": "User removed from org_officer"}, status=200)
     
 class PromoteRegistrarAPIView(APIView):
-    permission_classes = [permissions.IsAdminUser]
+    permission_classes = [IsAdminRole]
     def post(self, request, user_id):
         user= User.objects.get(pk=user_id)
         Registrar.grant(user)
         return Response({"message": "User promoted to Registrar"}, status=200)
 class DemoteRegistrarAPIView(APIView):
-    permission_classes = [permissions.IsAdminUser]
+    permission_classes = [IsAdminRole]
     def post(self, request, user_id):
         user= User.objects.get(pk=user_id)
         Registrar.revoke(user)
         return Response({"message": "User retired from Registrar"}, status=200)
     
+class BatchRoleChangeAPIView(APIView):
+    """Grant or revoke a sub-role for many users in one call.
+
+    Body: {"role": "org_officer" | "registrar", "action": "grant" | "revoke", "user_ids": [1, 2, 3]}
+    """
+    permission_classes = [IsAdminRole]
+
+    def post(self, request):
+        ser = BatchRoleChangeSerializer(data=request.data)
+        if not ser.is_valid():
+            return Response({"errors": ser.errors}, status=status.HTTP_400_BAD_REQUEST)
+        data = ser.validated_data
+        outcome = change_role(data["role"], data["user_ids"], grant=data["action"] == "grant")
+        return Response({
+            "role": data["role"],
+            "action": data["action"],
+            "results": [{"user_id": pk, "status": result} for pk, result in outcome.items()],
+        }, status=status.HTTP_200_OK)
+
 from .serializers import AdminUserListSerializer
-class UserViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = User.objects.all().order_by("id")
+
+# Rows serialized per piece of a streamed export
+EXPORT_CHUNK = 2000
+
+class UserViewSet(ConditionalGetMixin, DynamicFieldsViewMixin, viewsets.ReadOnlyModelViewSet):
+    # Narrowed to the serializer's (or ?fields=) columns by DynamicFieldsViewMixin;
+    # groups come from the role cache (roles.RoleCache)
+    queryset = User.objects.order_by("id")
     serializer_class = AdminUserListSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["username", "email", "first_name", "last_name"]
-    ordering_fields = ["id", "username", "email", "first_name", "last_name"]
+    pagination_class = IdCursorPagination
+    # ?search= goes through the trigram / FTS5 indexes (see search.py)
+    filter_backends = [UserSearchFilter, filters.OrderingFilter]
+    # Cursor pagination needs a unique ordering to stay stable
+    ordering_fields = ["id", "username"]
+    # Rows and role memberships, the groups column comes from the latter
+    conditional_models = (User, User.groups.through)
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """Top matches for ?q=, best first, e.g. /api/users/search/?q=jo&limit=10"""
+        try:
+            limit = min(int(request.query_params.get("limit", DEFAULT_LIMIT)), MAX_LIMIT)
+        except ValueError:
+            limit = DEFAULT_LIMIT
+        ids = ranked_user_ids(request.query_params.get("q", ""), limit=max(limit, 1))
+        users = self.get_queryset().in_bulk(ids)
+        results = [users[pk] for pk in ids if pk in users]
+        return Response({"results": self.get_serializer(results, many=True).data})
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAdminRole])
+    def export(self, request):
+        """Every user (honours ?search= and ?ordering=) as one JSON array, streamed EXPORT_CHUNK rows at a time."""
+        queryset = self.filter_queryset(self.get_queryset())
+
+        def chunks():
+            batch = []
+            for user in queryset.iterator(chunk_size=EXPORT_CHUNK):
+                batch.append(user)
+                if len(batch) == EXPORT_CHUNK:
+                    # One role cache lookup per chunk
+                    yield self.get_serializer(batch, many=True).data
+                    batch = []
+            if batch:
+                yield self.get_serializer(batch, many=True).data
+
+        return StreamingHttpResponse(stream_json_array(chunks()), content_type="application/json")
+
+# Assembled bootstrap payloads, keyed by their ETag so a change never serves a stale one
+BOOTSTRAP_CACHE_TIMEOUT = 60 * 15
+
+# Reverse one-to-ones and their lookups, all joined into the user query
+PROFILE_RELATED = (
+    "student_profile__program", "student_profile__section",
+    "faculty_profile__faculty_department", "faculty_profile__position",
+    "staff_profile__faculty_department",
+)
+
+# attribute, serializer
+PROFILES = (
+    ("student_profile", StudentProfileSerializer),
+    ("faculty_profile", FacultyProfileSerializer),
+    ("staff_profile", StaffProfileSerializer),
+)
+
+class BootstrapAPIView(ConditionalGetMixin, APIView):
+    """Everything the desktop shell needs after login: user, profile, roles and the
+    navigation tree of every role they hold, in one conditional, cached response."""
+    permission_classes = [IsAuthenticated]
+    conditional_models = (
+        User, User.groups.through, StudentProfile, FacultyProfile, StaffProfile,
+        Program, Section, FacultyDepartment, Position,
+    )
+
+    def get_versions(self, request):
+        return super().get_versions(request) + [navigation.version()]
+
+    def get(self, request):
+        key = f"users:bootstrap:{self.etag}"
+        data = cache.get(key)
+        if data is None:
+            data = self.build(request.user.pk)
+            cache.set(key, data, BOOTSTRAP_CACHE_TIMEOUT)
+        return Response(data, status=status.HTTP_200_OK)
+
+    def build(self, user_id):
+        user = User.objects.select_related(*PROFILE_RELATED).get(pk=user_id)
+        roles, primary_role = resolve_roles(user.pk, user.role_version)
+        profile_type, profile = None, None
+        for attr, serializer_class in PROFILES:
+            try:
+                instance = getattr(user, attr)
+            except ObjectDoesNotExist:
+                continue
+            fields = [f for f in serializer_class.Meta.fields if f not in ("user", "user_id")]
+            profile_type = attr.removesuffix("_profile")
+            profile = serializer_class(instance, fields=fields).data
+            break
+        return {
+            "user": BaseUserSerializer(user).data,
+            "profile_type": profile_type,
+            "profile": profile,
+            "roles": roles,
+            "primary_role": primary_role,
+            # Every role's pages, the client's Router opens secondary roles' pages too
+            "navigation": navigation.tree_for(*roles),
+        }
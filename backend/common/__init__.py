@@ -1 +1 @@
-from constants import API_BASE_URL
\ No newline at end of file
+from .constants import API_BASE_URL
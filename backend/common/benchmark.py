@@ -0,0 +1,101 @@
+"""
+Small timing helpers shared by the benchmark management commands.
+"""
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list, 0 for an empty one."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(latencies, elapsed):
+    """Requests per second and latency percentiles in milliseconds."""
+    count = len(latencies)
+    return {
+        "requests": count,
+        "seconds": round(elapsed, 3),
+        "rps": round(count / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies, default=0) * 1000, 2),
+    }
+
+
+def run_concurrent(make_worker, requests, concurrency=1):
+    """
+    Run `requests` calls spread over `concurrency` threads and summarize them.
+
+    make_worker() is called once per thread and returns the callable that
+    performs a single request, so each thread can hold its own client (and
+    therefore its own database connection). A call raising stops the run.
+    """
+    latencies = []
+    lock = threading.Lock()
+    share, extra = divmod(requests, concurrency)
+
+    def worker(count):
+        call = make_worker()
+        local = []
+        for _ in range(count):
+            start = time.perf_counter()
+            call()
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    counts = [share + (1 if i < extra else 0) for i in range(concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker, count) for count in counts if count]:
+            future.result()
+    return summarize(latencies, time.perf_counter() - start)
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalServer:
+    """
+    The Django app served over real HTTP from a background thread.
+
+    Binds a free port on localhost by default; each client connection gets its
+    own thread and database connection, as under runserver.
+
+        with LocalServer() as server:
+            requests.get(server.url + "/api/users/")
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self.httpd = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.httpd.server_port}"
+
+    def __enter__(self):
+        self.httpd = ThreadedWSGIServer((self.host, self.port), QuietRequestHandler, allow_reuse_address=False)
+        self.httpd.set_app(get_wsgi_application())
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
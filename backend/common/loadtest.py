@@ -0,0 +1,287 @@
+"""
+Desktop client sessions for the loadtest command.
+
+Each virtual client logs in through /api/users/login/api/ like the desktop
+app, then keeps picking a weighted action for its role until the run ends.
+A 401 (expired token, or roles changed under it) is answered with a
+refresh and a retry, as services/api_client.py does on the frontend; again
+if the roles changed once more in between, which the admins' role toggles
+do to the clients' own accounts.
+
+New feature endpoints get an action in ACTIONS; the report picks them up
+by their label.
+
+With `flood`, attacker threads send wrong-password logins as fast as they
+can during the second half of the run while a probe logs the campus admin
+in once a second throughout, so the login latency before and during the
+flood can be compared.
+"""
+import random
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from apps.Users.campus import CAMPUS_ADMIN, CAMPUS_PASSWORD, LAST_NAMES
+
+from .benchmark import percentile
+
+LOGIN = "POST /api/users/login/api/"
+REFRESH = "POST /api/users/token/refresh/"
+LOGIN_BEFORE_FLOOD = LOGIN + " (before flood)"
+LOGIN_DURING_FLOOD = LOGIN + " (during flood)"
+FLOOD = LOGIN + " (flood)"
+# Seconds between the probe's logins, well inside the per-address login rate
+PROBE_INTERVAL = 1.0
+# Refreshes one request may go through before its 401 counts as an error
+MAX_RENEWALS = 2
+
+
+class Recorder:
+    """Latencies and errors per endpoint label, shared by all clients."""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def record(self, label, elapsed, ok):
+        with self._lock:
+            self.latencies.setdefault(label, []).append(elapsed)
+            if not ok:
+                self.errors[label] = self.errors.get(label, 0) + 1
+
+    def report(self, elapsed):
+        endpoints = {}
+        for label, latencies in sorted(self.latencies.items()):
+            errors = self.errors.get(label, 0)
+            endpoints[label] = {
+                "requests": len(latencies),
+                "errors": errors,
+                "error_rate": round(errors / len(latencies), 4),
+                "rps": round(len(latencies) / elapsed, 2),
+                "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            }
+        total = sum(e["requests"] for e in endpoints.values())
+        errors = sum(e["errors"] for e in endpoints.values())
+        return {
+            "seconds": round(elapsed, 2),
+            "requests": total,
+            "errors": errors,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+class Session:
+    """One desktop client: a pooled HTTP session and its tokens."""
+
+    def __init__(self, base_url, username, role, recorder, rng):
+        self.base_url = base_url.rstrip("/")
+        self.username = username
+        self.role = role
+        self.recorder = recorder
+        self.rng = rng
+        self.http = requests.Session()
+        self.access = None
+        self.refresh_token = None
+        # Ids seen in listings, targets for detail and role actions
+        self.user_ids = []
+
+    def request(self, label, method, path, renewals=MAX_RENEWALS, **kwargs):
+        headers = {"Authorization": f"Bearer {self.access}"} if self.access else {}
+        start = time.perf_counter()
+        try:
+            resp = self.http.request(method, self.base_url + path, headers=headers, timeout=30, **kwargs)
+        except requests.RequestException:
+            self.recorder.record(label, time.perf_counter() - start, ok=False)
+            return None
+        if resp.status_code == 401 and renewals and self.refresh_token and self.refresh():
+            # Token renewal is part of normal client life, only the retried call is counted
+            return self.request(label, method, path, renewals=renewals - 1, **kwargs)
+        self.recorder.record(label, time.perf_counter() - start, ok=resp.status_code < 400)
+        return resp
+
+    def login(self, label=LOGIN):
+        resp = self.request(label, "POST", "/api/users/login/api/", renewals=0,
+                            json={"identifier": self.username, "password": CAMPUS_PASSWORD})
+        if resp is None or resp.status_code != 200:
+            return False
+        body = resp.json()
+        self.access, self.refresh_token = body["access_token"], body["refresh_token"]
+        return True
+
+    def refresh(self):
+        self.access = None
+        resp = self.request(REFRESH, "POST", "/api/users/token/refresh/", renewals=0,
+                            json={"refresh": self.refresh_token})
+        if resp is None or resp.status_code != 200:
+            return False
+        self.access = resp.json()["access"]
+        return True
+
+    def target(self):
+        return self.rng.choice(self.user_ids) if self.user_ids else None
+
+
+class SourceAddressAdapter(HTTPAdapter):
+    """Connects from the given local address, so each attacker is its own client to the throttles."""
+
+    def __init__(self, address, **kwargs):
+        self.address = address
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["source_address"] = (self.address, 0)
+        super().init_poolmanager(*args, **kwargs)
+
+
+def list_users(session):
+    resp = session.request("GET /api/users/", "GET", "/api/users/")
+    if resp is None or resp.status_code != 200:
+        return
+    body = resp.json()
+    session.user_ids = [user["id"] for user in body["results"] if user["groups"] == ["student"]]
+    # Some clients scroll on to the next page
+    if body.get("next") and session.rng.random() < 0.3:
+        next_page = urlsplit(body["next"])
+        session.request("GET /api/users/?cursor", "GET", f"{next_page.path}?{next_page.query}")
+
+
+def search_users(session):
+    term = session.rng.choice(LAST_NAMES).split()[-1][:session.rng.randint(3, 5)]
+    session.request("GET /api/users/search/", "GET", "/api/users/search/", params={"q": term})
+
+
+def user_detail(session):
+    pk = session.target()
+    if pk:
+        session.request("GET /api/users/<pk>/", "GET", f"/api/users/{pk}/")
+
+
+def toggle_officer(session):
+    pk = session.target()
+    if pk:
+        session.request("POST /api/users/roles/org-officer/<user_id>/promote/", "POST",
+                        f"/api/users/roles/org-officer/{pk}/promote/")
+        session.request("POST /api/users/roles/org-officer/<user_id>/demote/", "POST",
+                        f"/api/users/roles/org-officer/{pk}/demote/")
+
+
+@dataclass
+class Action:
+    weight: int
+    roles: tuple
+    run: callable
+
+
+ACTIONS = [
+    Action(40, ("admin", "student"), list_users),
+    Action(30, ("admin", "student"), search_users),
+    Action(20, ("admin", "student"), user_detail),
+    Action(10, ("admin",), toggle_officer),
+]
+
+
+class LoadTest:
+    """
+    `clients` concurrent sessions, `admins` of them as the campus admin, for
+    `duration` seconds, against a campus of `students` (seed_campus --students).
+    """
+
+    def __init__(self, base_url, clients=10, admins=1, duration=30.0, think_time=0.0, seed=0, flood=0,
+                 flood_addresses=1, students=30000):
+        self.base_url = base_url
+        self.clients = clients
+        self.students = students
+        self.admins = min(admins, clients)
+        self.duration = duration
+        self.think_time = think_time
+        self.seed = seed
+        self.flood = flood
+        # Attackers share this many source addresses, 1 for a burst from a single host
+        self.flood_addresses = max(flood_addresses, 1)
+        self.recorder = Recorder()
+        # Status code -> count of the attackers' responses
+        self.flood_statuses = {}
+        self._flood_lock = threading.Lock()
+
+    def run(self):
+        start = time.perf_counter()
+        deadline = start + self.duration
+        threads = [
+            threading.Thread(target=self._client, args=(n, deadline), daemon=True)
+            for n in range(self.clients)
+        ]
+        if self.flood:
+            flood_start = start + self.duration / 2
+            threads.append(threading.Thread(target=self._login_probe, args=(flood_start, deadline), daemon=True))
+            threads += [
+                threading.Thread(target=self._attacker, args=(n, flood_start, deadline), daemon=True)
+                for n in range(self.flood)
+            ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        report = self.recorder.report(time.perf_counter() - start)
+        if self.flood:
+            report["flood"] = {
+                "attackers": self.flood,
+                "addresses": self.flood_addresses,
+                "statuses": {str(code): n for code, n in sorted(self.flood_statuses.items())},
+            }
+        return report
+
+    def _client(self, n, deadline):
+        rng = random.Random(self.seed * 1000 + n)
+        if n < self.admins:
+            session = Session(self.base_url, CAMPUS_ADMIN, "admin", self.recorder, rng)
+        else:
+            session = Session(self.base_url, f"stu{n + 1:06d}", "student", self.recorder, rng)
+        if not session.login():
+            return
+        actions = [a for a in ACTIONS if session.role in a.roles]
+        weights = [a.weight for a in actions]
+        while time.perf_counter() < deadline:
+            rng.choices(actions, weights)[0].run(session)
+            if self.think_time:
+                time.sleep(rng.uniform(0, 2 * self.think_time))
+
+    def _login_probe(self, flood_start, deadline):
+        session = Session(self.base_url, CAMPUS_ADMIN, "admin", self.recorder, random.Random(self.seed))
+        while time.perf_counter() < deadline:
+            session.login(LOGIN_BEFORE_FLOOD if time.perf_counter() < flood_start else LOGIN_DURING_FLOOD)
+            time.sleep(PROBE_INTERVAL)
+
+    def _attacker(self, n, flood_start, deadline):
+        rng = random.Random(self.seed * 1000 + 500 + n)
+        http = requests.Session()
+        if urlsplit(self.base_url).hostname in ("127.0.0.1", "localhost"):
+            # Any 127.x address reaches a local server; on a remote one attackers share the clients' address
+            address = n % self.flood_addresses
+            http.mount("http://", SourceAddressAdapter(f"127.0.{address // 250}.{address % 250 + 2}"))
+        statuses = {}
+        time.sleep(max(flood_start - time.perf_counter(), 0))
+        while time.perf_counter() < deadline:
+            # Existing students past the ones the clients use, wrong passwords
+            student = rng.randint(self.clients + 1, max(self.students, self.clients + 1))
+            payload = {"identifier": f"stu{student:06d}", "password": "guess"}
+            start = time.perf_counter()
+            try:
+                resp = http.post(self.base_url.rstrip("/") + "/api/users/login/api/", json=payload, timeout=30)
+                status = resp.status_code
+            except requests.RequestException:
+                status = 0
+            # Rejected is what an attack should get, anything else counts as an error
+            self.recorder.record(FLOOD, time.perf_counter() - start, ok=status in (400, 429))
+            statuses[status] = statuses.get(status, 0) + 1
+        with self._flood_lock:
+            for status, count in statuses.items():
+                self.flood_statuses[status] = self.flood_statuses.get(status, 0) + count
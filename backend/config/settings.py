@@ -177,10 +177,15 @@ INSTALLED_APPS = [
     # TODO: Add your apps here
     # CORS Headers - tried to fix backend conn, should work if front and back runs on different ports
     'corsheaders',
+    'api.apps.ApiConfig',
     'apps.Users.apps.UsersConfig',
 ]
 
 MIDDLEWARE = [
+    # First, so the timing covers the rest of the stack
+    'middleware.mw.RequestTimingMiddleware',
+    # Before anything else that touches the response body
+    'middleware.compression.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware', 
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -193,6 +198,8 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'config.urls'
 AUTH_USER_MODEL='users.BaseUser'
+# Username or email, case-insensitive, see apps/Users/backends.py
+AUTHENTICATION_BACKENDS = ['apps.Users.backends.IdentifierBackend']
 
 TEMPLATES = [
     {
@@ -226,12 +233,12 @@ WSGI_APPLICATION = 'core.wsgi.application'
 #     }
 # }
 
+# Connection reuse, pooling and SQLite pragmas come from environment variables,
+# see core/database.py. Set DB_ENGINE=postgresql to run against PostgreSQL.
+from core.database import database_settings
+
 DATABASES={
-    'default':{
-        'ENGINE':'django.db.backends.sqlite3',
-        'NAME':BASE_DIR/'db.sqlite3'
-        
-    }
+    'default': database_settings(BASE_DIR, engine='sqlite3')
 }
 
 
@@ -281,11 +288,35 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 #Added this lines
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Authorizes from the token's role claims; role version and active flag
+        # from ROLE_VERSION_CACHE, or one indexed user read per request without it
+        'api.authentication.RoleClaimsAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson when installed, DRF's stdlib json otherwise (api/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Login throttles (api/throttling.py): failed or running attempts per address, failures per identifier and address
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '30/m',
+        'login_identifier': '5/15m',
+    },
+    # Proxies in front of the server; 0 trusts only REMOTE_ADDR so X-Forwarded-For can't dodge the throttles
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
+    # Read by middleware.compression.CompressionMiddleware; br needs the brotli package
+    'COMPRESSION': {
+        'MIN_SIZE': 1024,
+        'ENCODINGS': ['br', 'gzip'],
+    },
 }
 
 from datetime import timedelta
@@ -306,5 +337,36 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
     'USER_ID_FIELD': 'id',
     'USER_ID_CLAIM': 'user_id',
+    'TOKEN_USER_CLASS': 'api.authentication.RoleTokenUser',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.Users.serializers.RoleTokenRefreshSerializer',
 }
 CORS_ALLOW_ALL_ORIGINS = True
+
+# Request timing (middleware/mw.py): requests slower than this are logged
+# with their SLOW_REQUEST_SQL slowest queries
+SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', 500))
+SLOW_REQUEST_SQL = 3
+# Requests kept per endpoint for the percentiles at /api/stats/requests/
+REQUEST_STATS_WINDOW = 1000
+
+# Throttle counters get their own bounded cache so a flood can't evict the role cache.
+# Per process; use a shared backend (Redis, memcached) for both when running several workers.
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'throttle',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+THROTTLE_CACHE = 'throttle'
+# Shared cache alias (Redis, Memcached) for the role version checked on
+# every request; None reads the user row instead
+ROLE_VERSION_CACHE = None
+
+# /api/batch/ (api/batch.py): sub-requests per call, and how many GETs run at once
+BATCH_MAX_REQUESTS = 20
+BATCH_MAX_WORKERS = 4
+
+# The desktop client's nav definition; /api/users/me/bootstrap/ serves it filtered per role
+NAVIGATION_FILE = BASE_DIR.parent / 'frontend' / 'utils' / 'navbar.json'
@@ -0,0 +1,126 @@
+# backend/middleware/compression.py
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # optional, gzip only without it
+    brotli = None
+
+DEFAULTS = {
+    # Bodies smaller than this go out as is, compressing them costs more than it saves
+    "MIN_SIZE": 1024,
+    # Server preference, the first one the client accepts wins
+    "ENCODINGS": ["br", "gzip"],
+    "GZIP_LEVEL": 6,
+    "BROTLI_QUALITY": 5,
+    "CONTENT_TYPES": ["application/json", "text/"],
+}
+
+
+def compression_settings():
+    return {**DEFAULTS, **getattr(settings, "REST_FRAMEWORK", {}).get("COMPRESSION", {})}
+
+
+def accepted_encodings(header):
+    """Codings from an Accept-Encoding header, q=0 entries left out."""
+    accepted = set()
+    for part in header.split(","):
+        coding, *params = part.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding.strip() and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class Compressor:
+    """Incremental gzip or brotli, one instance per response."""
+
+    def __init__(self, encoding, config):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=config["BROTLI_QUALITY"])
+        else:
+            # wbits 16+ writes the gzip header and trailer
+            self._zlib = zlib.compressobj(config["GZIP_LEVEL"], zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        # Sync flush so each streamed chunk reaches the client right away
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+    def whole(self, data):
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """
+    Negotiated brotli or gzip for API responses above MIN_SIZE, including
+    streamed ones. Configured under REST_FRAMEWORK["COMPRESSION"].
+
+    Goes right after RequestTimingMiddleware, before anything that reads or
+    writes the response body.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = compression_settings()
+        self.encodings = [e for e in self.config["ENCODINGS"] if e != "br" or brotli is not None]
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.has_header("Content-Encoding") or response.status_code == 304:
+            return response
+        content_type = response.get("Content-Type", "")
+        if not any(content_type.startswith(t) for t in self.config["CONTENT_TYPES"]):
+            return response
+        if not response.streaming and len(response.content) < self.config["MIN_SIZE"]:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        accepted = accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        encoding = next((e for e in self.encodings if e in accepted), None)
+        if encoding is None:
+            return response
+
+        compressor = Compressor(encoding, self.config)
+        if response.streaming:
+            response.streaming_content = self._stream(compressor, response.streaming_content)
+            del response.headers["Content-Length"]
+        else:
+            compressed = compressor.whole(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # The bytes differ from the uncompressed ones, RFC 9110 wants a weak ETag
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def _stream(self, compressor, chunks):
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
@@ -0,0 +1,136 @@
+# backend/middleware/mw.py
+import logging
+import re
+import threading
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.db import connection
+
+from common.benchmark import percentile
+
+logger = logging.getLogger(__name__)
+
+# Router routes are regexes, "api/users/(?P<pk>[^/.]+)/$" reads as "api/users/<pk>/",
+# path() converters are dropped, "<int:user_id>" reads as "<user_id>"
+NAMED_GROUP = re.compile(r"\(\?P<(\w+)>[^)]*\)|<\w+:(\w+)>")
+
+
+class EndpointStats:
+    """Rolling window of the last `window` requests per endpoint, kept in process memory."""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, wall, db, queries):
+        with self._lock:
+            self._samples[endpoint].append((wall, db, queries))
+
+    def snapshot(self):
+        """{endpoint: count, p50/p95/p99 wall ms, average db ms and queries}, slowest p95 first."""
+        with self._lock:
+            samples = {endpoint: list(rows) for endpoint, rows in self._samples.items()}
+        stats = {}
+        for endpoint, rows in samples.items():
+            walls = [wall for wall, _, _ in rows]
+            stats[endpoint] = {
+                "count": len(rows),
+                "p50_ms": round(percentile(walls, 50) * 1000, 2),
+                "p95_ms": round(percentile(walls, 95) * 1000, 2),
+                "p99_ms": round(percentile(walls, 99) * 1000, 2),
+                "avg_db_ms": round(sum(db for _, db, _ in rows) / len(rows) * 1000, 2),
+                "avg_queries": round(sum(queries for _, _, queries in rows) / len(rows), 1),
+            }
+        return dict(sorted(stats.items(), key=lambda item: item[1]["p95_ms"], reverse=True))
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+
+endpoint_stats = EndpointStats(getattr(settings, "REQUEST_STATS_WINDOW", 1000))
+
+
+class QueryTimer:
+    """connection.execute_wrapper that adds up the time and count of every query."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            self.queries.append((elapsed, sql))
+
+    def slowest(self, limit):
+        return sorted(self.queries, key=lambda query: query[0], reverse=True)[:limit]
+
+
+def route_label(route):
+    """Readable form of a resolver route, "api/users/(?P<pk>[^/.]+)/$" -> "/api/users/<pk>/"."""
+    route = NAMED_GROUP.sub(lambda m: f"<{m.group(1) or m.group(2)}>", route)
+    return "/" + route.replace("^", "").rstrip("$")
+
+
+def endpoint_name(request):
+    """Method plus URL pattern, so /api/users/5/ and /api/users/6/ share a bucket."""
+    match = getattr(request, "resolver_match", None)
+    if not match or not match.route:
+        return f"{request.method} <unresolved>"
+    return f"{request.method} {route_label(match.route)}"
+
+
+class RequestTimingMiddleware:
+    """
+    Measures wall time, DB time and query count for every request.
+
+    Adds a Server-Timing header, logs requests slower than SLOW_REQUEST_MS with
+    their slowest queries and feeds endpoint_stats (read at /api/stats/requests/).
+    Keep it first in MIDDLEWARE so the other middleware are included in the timing.
+
+    Streaming responses (the CSV export) are skipped: their body, and most of
+    their queries, are produced after this returns, so the numbers would only
+    cover building the response.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, "SLOW_REQUEST_MS", 500)
+        self.slow_sql = getattr(settings, "SLOW_REQUEST_SQL", 3)
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        start = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        wall = time.perf_counter() - start
+        if response.streaming:
+            return response
+
+        response["Server-Timing"] = (
+            f'total;dur={wall * 1000:.1f}, '
+            f'db;dur={timer.duration * 1000:.1f};desc="{timer.count} queries"'
+        )
+        endpoint = endpoint_name(request)
+        endpoint_stats.record(endpoint, wall, timer.duration, timer.count)
+
+        if wall * 1000 >= self.slow_ms:
+            slowest = "".join(
+                f"\n  {elapsed * 1000:.1f}ms {sql}" for elapsed, sql in timer.slowest(self.slow_sql)
+            )
+            logger.warning(
+                "Slow request %s (%s) %d: %.1fms, %d queries in %.1fms%s",
+                endpoint, request.get_full_path(), response.status_code,
+                wall * 1000, timer.count, timer.duration * 1000, slowest,
+            )
+        return response
@@ -6,6 +6,7 @@ django.setup()
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
+from apps.Users.lookups import IDENTIFIER_FIELDS, find_user
 from apps.Users.models import Program, Section, StudentProfile, StaffProfile, FacultyProfile, FacultyDepartment, Position
 User = get_user_model()
 import requests
@@ -13,13 +14,11 @@ from datetime import date
 
 # Get a user
 def get_user(identifier):
-    # Fetch user by id, username, or email.
+    # Fetch user by id, username, email or institutional id, ignoring case.
     # Returns User instance or None.
     if isinstance(identifier, int):
         return User.objects.filter(pk=identifier).first()
-    if "@" in identifier:
-        return User.objects.filter(email__iexact=identifier).first()
-    return User.objects.filter(username__iexact=identifier).first() 
+    return find_user(identifier, IDENTIFIER_FIELDS)
 def assign_role(identifier, new_role):
     """Since roles are defaulted to student upon creation, use this method to change it.
     identifier - username
@@ -0,0 +1,176 @@
+# backend/tests/query_budget.py
+"""
+Query budgets for every endpoint registered in core/urls.py.
+
+Each budget says how an endpoint is called and the most queries one call may
+run. run_budget() seeds SMALL and LARGE datasets, calls the endpoint against
+both and reports the query count and response size of each; tests/test.py
+fails when a budget is exceeded, when the count grows with the row count (an
+N+1) or when an endpoint has no budget at all. New app endpoints must be
+added to BUDGETS (or SKIPPED with a reason).
+
+Set QUERY_BUDGET_REPORT=path.json to keep the measurements.
+"""
+import io
+from dataclasses import dataclass, field
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver
+from django.urls.resolvers import URLResolver
+from rest_framework.test import APIClient
+
+from apps.Users.campus import CAMPUS_ADMIN, CAMPUS_PASSWORD, CampusGenerator, campus_users
+from apps.Users.roles import ROLES, SUB_ROLES, group_id
+from apps.Users.tokens import RoleRefreshToken
+from middleware.mw import route_label
+
+User = get_user_model()
+
+URLCONF = "core.urls"
+SMALL, LARGE = 5, 40
+
+
+@dataclass
+class Budget:
+    queries: int
+    # Callables taking the Dataset, so ids come from the rows just seeded
+    kwargs: callable = None
+    data: callable = None
+    format: str = "json"
+    # Dataset attribute of the account to authenticate as, None for anonymous
+    user: str = "admin"
+    status: int = 200
+
+
+@dataclass
+class Dataset:
+    admin: object
+    student: object
+    users: list = field(default_factory=list)
+
+
+def roster_upload(dataset):
+    roster = "username,email,password,first_name,last_name,institutional_id,role_type\n" \
+             "budget_new,budget_new@cmu.edu.ph,pass1234,New,Student,B-NEW-1,student\n"
+    upload = io.BytesIO(roster.encode())
+    upload.name = "roster.csv"
+    return {"file": upload}
+
+
+def refresh_payload(dataset):
+    return {"refresh": str(RoleRefreshToken.for_user(dataset.admin))}
+
+
+def startup_batch(dataset):
+    return {"requests": [
+        {"id": "users", "path": "/api/users/"},
+        {"id": "student", "path": f"/api/users/{dataset.student.pk}/"},
+    ]}
+
+
+def target(dataset):
+    return {"user_id": dataset.student.pk}
+
+
+# Calls made with a token start with one query for the user's role_version
+# and is_active (api/authentication.py), counted in every budget below
+BUDGETS = {
+    # Anonymous: user by username or email, role cache miss
+    "POST /api/users/login/api/": Budget(
+        2, user=None, data=lambda d: {"identifier": CAMPUS_ADMIN, "password": CAMPUS_PASSWORD},
+    ),
+    # Active user check, role version, role cache miss
+    "POST /api/users/token/refresh/": Budget(3, user=None, data=refresh_payload),
+    # Table versions for the ETag, one page, roles for the whole page in one query
+    "GET /api/users/": Budget(4),
+    "GET /api/users/search/": Budget(5, data=lambda d: {"q": "stu"}),
+    "GET /api/users/<pk>/": Budget(4, kwargs=lambda d: {"pk": d.student.pk}),
+    # Streamed, the users then the roles of each EXPORT_CHUNK rows
+    "GET /api/users/export/": Budget(4),
+    # Table versions, then the user with every profile joined in; cached afterwards
+    "GET /api/users/me/bootstrap/": Budget(3, user="student"),
+    # Four lookup tables, two duplicate checks, one insert per table in a savepoint, table versions
+    "POST /api/users/import/": Budget(13, format="multipart", data=roster_upload, status=201),
+    # Membership change, then the target's role version and the table version bumps
+    "POST /api/users/roles/org-officer/<user_id>/promote/": Budget(6, kwargs=target),
+    "POST /api/users/roles/org-officer/<user_id>/demote/": Budget(5, kwargs=target),
+    "POST /api/users/roles/registrar/<user_id>/promote/": Budget(6, kwargs=target),
+    "POST /api/users/roles/registrar/<user_id>/demote/": Budget(5, kwargs=target),
+    "POST /api/users/roles/batch/": Budget(
+        8, data=lambda d: {"role": "registrar", "action": "grant", "user_ids": [u.pk for u in d.users]},
+    ),
+    # In-memory stats, roles come from the token
+    "GET /api/stats/requests/": Budget(1),
+    # The sub-requests' own budgets, plus the caller's token check
+    "POST /api/batch/": Budget(8, data=startup_batch),
+}
+
+SKIPPED = {
+    "/admin/": "Django admin, not part of the API",
+    "/api/users/<format>": "Shadowed by the user list route",
+}
+
+
+def registered_routes(urlconf=URLCONF):
+    """route label -> view class for every pattern, minus format suffix variants."""
+    def walk(resolver, prefix):
+        for pattern in resolver.url_patterns:
+            route = prefix + str(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern, route)
+            elif "format" not in route:
+                yield route_label(route), pattern.callback
+
+    routes = {}
+    for label, callback in walk(get_resolver(urlconf), ""):
+        if not any(label.startswith(skipped) for skipped in SKIPPED):
+            routes.setdefault(label, getattr(callback, "cls", callback))
+    return routes
+
+
+def seed(rows):
+    """A seed_campus campus with `rows` students (and a couple of faculty and staff)."""
+    # Group ids are cached per process, warm them so no budget pays for the first lookup
+    for name in ROLES + SUB_ROLES:
+        group_id(name)
+    CampusGenerator(students=rows, faculty=2, staff=2).run()
+    students = list(campus_users().filter(role_type="student").order_by("id"))
+    return Dataset(admin=User.objects.get(username=CAMPUS_ADMIN), student=students[0], users=students[1:])
+
+
+def measure(label, budget, dataset):
+    """(queries, response bytes, status) of one call, role cache cold apart from the caller."""
+    method, route = label.split(" ", 1)
+    path = route
+    for name, value in (budget.kwargs(dataset) if budget.kwargs else {}).items():
+        path = path.replace(f"<{name}>", str(value))
+    data = budget.data(dataset) if budget.data else None
+
+    client = APIClient()
+    cache.clear()
+    if budget.user:
+        user = getattr(dataset, budget.user)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {RoleRefreshToken.for_user(user).access_token}")
+    with CaptureQueriesContext(connection) as queries:
+        if method == "GET":
+            resp = client.get(path, data)
+        else:
+            resp = getattr(client, method.lower())(path, data, format=budget.format)
+        # Streamed responses run their queries while the body is read
+        body = b"".join(resp.streaming_content) if resp.streaming else resp.content
+    return len(queries), len(body), resp.status_code
+
+
+def run_budget(label, budget):
+    """Measurements at SMALL and LARGE row counts, each seeded and rolled back."""
+    results = {}
+    for rows in (SMALL, LARGE):
+        with transaction.atomic():
+            dataset = seed(rows)
+            queries, size, status = measure(label, budget, dataset)
+            transaction.set_rollback(True)
+        results[rows] = {"queries": queries, "bytes": size, "status": status}
+    return results
@@ -0,0 +1,74 @@
+# backend/tests/test.py
+import json
+import os
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import LiveServerTestCase, TestCase, override_settings
+
+from apps.Users.campus import CampusGenerator
+from common.loadtest import FLOOD, LOGIN_BEFORE_FLOOD, LOGIN_DURING_FLOOD, LoadTest
+
+from .query_budget import BUDGETS, LARGE, SMALL, URLCONF, registered_routes, run_budget
+
+# Hashing dominates the login budget's run time, not its query count
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@override_settings(ROOT_URLCONF=URLCONF, PASSWORD_HASHERS=FAST_HASHERS)
+class QueryBudgetTests(TestCase):
+    report = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        path = os.environ.get("QUERY_BUDGET_REPORT")
+        if path and cls.report:
+            with open(path, "w") as fh:
+                json.dump(cls.report, fh, indent=2)
+
+    def test_every_endpoint_has_a_budget(self):
+        budgeted = {label.split(" ", 1)[1] for label in BUDGETS}
+        missing = sorted(set(registered_routes()) - budgeted)
+        self.assertEqual(missing, [], "Declare a query budget in tests/query_budget.py")
+
+    def test_endpoints_stay_within_budget(self):
+        for label, budget in BUDGETS.items():
+            with self.subTest(label):
+                results = run_budget(label, budget)
+                self.report[label] = {"budget": budget.queries, **results}
+                small, large = results[SMALL], results[LARGE]
+
+                self.assertEqual(large["status"], budget.status)
+                self.assertLessEqual(large["queries"], budget.queries, f"{label} is over budget")
+                self.assertEqual(
+                    large["queries"], small["queries"],
+                    f"{label} runs more queries with {LARGE} rows than with {SMALL}",
+                )
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class LoadTestSmokeTests(LiveServerTestCase):
+    # Keeps the role groups from the data migration for the tests that follow
+    serialized_rollback = True
+
+    def test_sessions_cover_the_user_endpoints(self):
+        CampusGenerator(students=10, faculty=1, staff=1).run()
+        report = LoadTest(self.live_server_url, clients=3, admins=1, duration=1.5, students=10).run()
+
+        self.assertEqual(report["errors"], 0)
+        self.assertEqual(report["endpoints"]["POST /api/users/login/api/"]["requests"], 3)
+        self.assertIn("GET /api/users/", report["endpoints"])
+
+    @override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {"login_ip": "5/m", "login_identifier": "5/15m"},
+    })
+    def test_flood_is_throttled_without_failing_real_logins(self):
+        caches["throttle"].clear()
+        CampusGenerator(students=10, faculty=1, staff=1).run()
+        report = LoadTest(self.live_server_url, clients=1, admins=1, duration=2, flood=2, students=10).run()
+
+        self.assertEqual(report["endpoints"][FLOOD]["errors"], 0)
+        self.assertGreater(report["flood"]["statuses"].get("429", 0), 0)
+        self.assertEqual(report["endpoints"][LOGIN_BEFORE_FLOOD]["errors"], 0)
+        self.assertEqual(report["endpoints"][LOGIN_DURING_FLOOD]["errors"], 0)
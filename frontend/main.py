@@ -1,46 +1,81 @@
 import sys
 import os
+# First, so VHUB_STARTUP_PROFILE can time every import after it
+from startup_profile import profiler
 # Set project root by moving up one level from frontend/
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))  # C:\Users\Yuri\Desktop\v-hub-tester
 sys.path.insert(0, project_root)  # Insert at start to override other paths
 print(f"Main: Updated sys.path to {sys.path}")  # Debug print
 
+from PyQt6.QtCore import pyqtSignal
 from PyQt6.QtWidgets import QApplication, QMainWindow, QGridLayout, QWidget
 from views.Login.login import LoginWidget
 from services.auth_service import AuthService
-from widgets.layout_manager import LayoutManager
-from router.router import Router
+# The dashboard shell (router, layout, API client) is imported after login, see open_dashboard()
+profiler.mark("imports done")
 
 class MainWindow(QMainWindow):
+    # Emitted from whichever thread found the refresh token rejected, delivered on the UI thread
+    session_expired = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.auth_service = AuthService()
-        self.login_widget = LoginWidget()
         # Store session data
         self.user_session = None
 
-        self.setCentralWidget(self.login_widget)
-
-        self.setWindowTitle("CISC Virtual Hub - Login")
+        self.show_login()
         self.setGeometry(100, 100, 900, 600)
 
+        self.session_expired.connect(self.back_to_login)
+        self.auth_service.tokens.on_expired(self.session_expired.emit)
+
+    def show_login(self, message=None):
+        self.login_widget = LoginWidget()
         self.login_widget.login_successful.connect(self.open_dashboard)
+        if message:
+            self.login_widget.password_error_label.setText(message)
+            self.login_widget.password_error_label.show()
+        self.setCentralWidget(self.login_widget)
+        self.setWindowTitle("CISC Virtual Hub - Login")
+
+    def back_to_login(self):
+        """The session can't be renewed (refresh token expired or revoked), sign in again."""
+        if self.user_session is None:
+            return
+        from services.api_client import validator_cache
+        print(f"MainWindow: Session of {self.user_session['username']} expired, back to login")
+        self.user_session = None
+        self.layout_manager.router.clear_pages()
+        # Responses cached for the previous user
+        validator_cache.clear()
+        # Back to QMainWindow's own, open_dashboard() replaced it
+        self.__dict__.pop("resizeEvent", None)
+        self.show_login("Your session has expired. Please log in again.")
 
     def open_dashboard(self, result):
         print(f"Login OK for {result.username} | roles={result.roles} | primary={result.primary_role}")
+        profiler.mark("login succeeded")
+        from widgets.layout_manager import LayoutManager
+        from router.router import Router
+
         # Store user session data
         self.user_session = {
             "username": result.username,
             "roles": result.roles,
             "primary_role": result.primary_role,
-            "token": result.token
+            "token": result.token,
+            "refresh_token": result.refresh_token,
         }
+        self.load_bootstrap()
+        profiler.mark("bootstrap loaded")
 
         # Initialize Router with user session data
         router = Router(
             user_role=self.user_session["primary_role"],
             user_session=self.user_session
         )
+        profiler.mark("router built")
 
         # Create main layout and content widget for LayoutManager
         main_layout = QGridLayout()
@@ -71,9 +106,40 @@ class MainWindow(QMainWindow):
 
         # Navigate to the Dashboard page (main_id=1 in navbar.json)
         router.navigate(page_id=1, is_modular=False)
+        profiler.mark("dashboard built")
+        profiler.mark_first_paint(router.stack.currentWidget(), "dashboard painted")
+
+    def load_bootstrap(self):
+        """Profile and role-filtered navigation in one call; navbar.json stays the fallback."""
+        import requests
+        from services import api_client
+        from utils.db_helper import use_navigation
+        try:
+            r = api_client.get("users/me/bootstrap/")
+        except requests.RequestException as e:
+            print(f"MainWindow: Bootstrap unavailable, using local navigation: {e}")
+            return
+        if r.status_code != 200:
+            print(f"MainWindow: Bootstrap failed with HTTP {r.status_code}, using local navigation")
+            return
+        data = r.json()
+        self.user_session.update({
+            "user": data.get("user"),
+            "profile": data.get("profile"),
+            "profile_type": data.get("profile_type"),
+            "roles": data.get("roles", self.user_session["roles"]),
+            "primary_role": data.get("primary_role") or self.user_session["primary_role"],
+            "navigation": data.get("navigation"),
+        })
+        if data.get("navigation") is not None:
+            use_navigation(data["navigation"])
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    profiler.mark("QApplication created")
+    # Closed before reaching the dashboard, still write what was recorded
+    app.aboutToQuit.connect(profiler.finish)
     main_window = MainWindow()
     main_window.show()
+    profiler.mark("login window shown")
     sys.exit(app.exec())
\ No newline at end of file
@@ -1,12 +1,18 @@
 from PyQt6.QtWidgets import QStackedWidget, QLabel, QVBoxLayout, QWidget
 from PyQt6.QtGui import QFont
-from utils.db_helper import NavigationDataHelper, get_path_for_main, get_path_for_modular
+from utils.db_helper import get_navigation, use_navigation
 from importlib import import_module
+from collections import OrderedDict
+import inspect
 import os
 import sys
+import time
+
+# Pages kept alive at once, the rest are rebuilt when navigated back to
+MAX_LIVE_PAGES = int(os.environ.get("VHUB_MAX_LIVE_PAGES", "6"))
 
 class Router:
-    def __init__(self, user_role, user_session=None):
+    def __init__(self, user_role, user_session=None, max_pages=MAX_LIVE_PAGES):
         # Ensure sys.path includes project root
         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
         if project_root not in sys.path:
@@ -15,121 +21,153 @@ class Router:
         print(f"Router: sys.path: {sys.path}")
 
         self.stack = QStackedWidget()
-        self.nav_helper = NavigationDataHelper(json_file="navbar.json")
+        # The shared index, over the bootstrap response's tree when there is one, navbar.json otherwise
+        if (user_session or {}).get("navigation") is not None:
+            use_navigation(user_session["navigation"])
+        self.nav_helper = get_navigation()
         self.user_role = user_role
         self.user_session = user_session or {}  # Store session data
-        self.page_map = {}
-        self._page_classes = self._build_page_classes()
-        self._preload_pages()
+        # Pages are built on first navigate() and kept while among the
+        # max_pages most recently shown; evicted pages that define
+        # save_state() get it back through restore_state() when rebuilt
+        self.max_pages = max_pages
+        self.pages = OrderedDict()
+        self._saved_state = {}
+        # Page key -> construction times in ms, one entry per build
+        self.build_times = {}
+        # Page classes are imported on first use, see _page_class()
+        self._page_classes = {}
+
+        # Default "Access Denied" page, never evicted
+        self.access_denied = self._create_default_widget("Access Denied", "You do not have permission to view this page.")
+        self.stack.addWidget(self.access_denied)
+
+        # Every role the user holds opens its pages, not just the primary one.
+        # self.access is the role-access matrix the Sidebar draws from too.
+        self.set_roles([user_role, *self.user_session.get("roles", [])])
 
-    def _build_page_classes(self):
-        page_classes = {}
-        for parent in self.nav_helper.data["parents"]:
-            parent_name = parent["name"]
-            parent_id = parent["id"]
-            print(f"Router: Processing parent '{parent_name}' (ID: {parent_id})")
-            for main in parent["mains"]:
-                main_id = main["id"]
-                function_str = main["function"]
-                class_name = function_str.replace("()", "")
-                module_path = get_path_for_main(main_id)
-                print(f"Router: Processing main ID {main_id} ({class_name}), path: {module_path}")
-                try:
-                    if module_path:
-                        file_path = os.path.join(os.path.dirname(__file__), "..", module_path.replace(".", "/") + ".py")
-                        print(f"Router: Checking file {file_path}, exists: {os.path.exists(file_path)}")
-                        module = import_module(module_path)
-                        page_class = getattr(module, class_name)
-                        print(f"Router: Successfully loaded {class_name} from {module_path}")
-                        page_classes[f"main_{main_id}"] = page_class
-                    else:
-                        print(f"Router: No path for main ID {main_id}, skipping {class_name}")
-                except (ImportError, AttributeError) as e:
-                    print(f"Router: Failed to import {class_name} from {module_path}: {e}")
-                except Exception as e:
-                    print(f"Router: Unexpected error for {class_name}: {e}")
-        return page_classes
-    
-    def _preload_pages(self):
-        # Default "Access Denied" page
-        access_denied_widget = self._create_default_widget("Access Denied", "You do not have permission to view this page.")
-        self.stack.addWidget(access_denied_widget)
-        self.page_map["access_denied"] = 0
+    def _page_class(self, key):
+        """Import the page class for `key` through its nav `path`, the first time it is needed."""
+        if key in self._page_classes:
+            return self._page_classes[key]
+        _, _, module_path, class_name = self.routes[key]
+        page_class = None
+        start = time.perf_counter()
+        try:
+            if module_path:
+                module = import_module(module_path)
+                page_class = getattr(module, class_name)
+                print(f"Router: Imported {class_name} from {module_path} in {(time.perf_counter() - start) * 1000:.1f} ms")
+            else:
+                print(f"Router: No path for {key}, skipping {class_name}")
+        except (ImportError, AttributeError) as e:
+            print(f"Router: Failed to import {class_name} from {module_path}: {e}")
+        # Failures are remembered too, a broken module is not retried on every visit
+        self._page_classes[key] = page_class
+        return page_class
 
-        # Valid roles for access
-        valid_roles = {"admin", "staff", "faculty", "student"}
+    def _collect_routes(self):
+        """Page keys the roles can open and where their classes live. Nothing is imported or built here."""
+        routes = {}
+        for _, _, mains in self.access.sections:
+            for (main_id, name, function, _, _), modulars in mains:
+                # Title and text of the fallback page, module path and class to import
+                routes[f"main_{main_id}"] = (name, f"Page for {name}", self.nav_helper.get_path_for_main(main_id),
+                                             function.replace("()", ""))
+                for mod_id, mod_name, mod_function, _ in modulars:
+                    routes[f"mod_{main_id}_{mod_id}"] = (mod_name, f"Sub-page for {mod_name}",
+                                                         self.nav_helper.get_path_for_modular(mod_id),
+                                                         mod_function.replace("()", ""))
+        return routes
 
-        # Load pages from navbar.json
-        for parent in self.nav_helper.data["parents"]:
-            for main in parent["mains"]:
-                main_id = main["id"]
-                access = main["access"]
-                name = main["name"]
-                key = f"main_{main_id}"
-                if (isinstance(access, str) and access == self.user_role and self.user_role in valid_roles) or \
-                (isinstance(access, list) and self.user_role in access and self.user_role in valid_roles):
-                    print(f"Router: Loading page {key} with access {access} for user_role {self.user_role}")
-                    page_class = self._page_classes.get(key)
-                    if page_class:
-                        # Pass user session data to dashboard initialization
-                        page = page_class(
-                            username=self.user_session.get("username", ""),
-                            roles=self.user_session.get("roles", []),
-                            primary_role=self.user_session.get("primary_role", ""),
-                            token=self.user_session.get("token", "")
-                        )
-                    else:
-                        page = self._create_default_widget(name, f"Page for {name}")
-                    index = self.stack.addWidget(page)
-                    self.page_map[key] = index
-                    print(f"Router: Added {key} to page_map at index {index}")
+    def set_roles(self, roles):
+        """Serve what `roles` can open, dropping live pages they can't."""
+        self.roles = list(dict.fromkeys(roles))
+        self.access = self.nav_helper.get_access(self.roles)
+        self.routes = self._collect_routes()
+        for key in [key for key in self.pages if key not in self.routes]:
+            page = self.pages.pop(key)
+            self.stack.removeWidget(page)
+            page.deleteLater()
+            self._saved_state.pop(key, None)
+        if self.stack.currentWidget() not in self.pages.values():
+            self.stack.setCurrentWidget(self.access_denied)
 
-                # Load modulars
-                if "modulars" in main:
-                    for modular in main["modulars"]:
-                        mod_id = modular["id"]
-                        mod_name = modular["name"]
-                        mod_key = f"mod_{main_id}_{mod_id}"
-                        if (isinstance(access, str) and access == self.user_role and self.user_role in valid_roles) or \
-                        (isinstance(access, list) and self.user_role in access and self.user_role in valid_roles):
-                            print(f"Router: Loading modular {mod_key} with access {access} for user_role {self.user_role}")
-                            page_class = self._page_classes.get(mod_key)
-                            if page_class:
-                                # Pass user session data to modulars
-                                page = page_class(
-                                    username=self.user_session.get("username", ""),
-                                    roles=self.user_session.get("roles", []),
-                                    primary_role=self.user_session.get("primary_role", ""),
-                                    token=self.user_session.get("token", "")
-                                )
-                            else:
-                                page = self._create_default_widget(mod_name, f"Sub-page for {mod_name}")
-                            index = self.stack.addWidget(page)
-                            self.page_map[mod_key] = index
-                            print(f"Router: Added {mod_key} to page_map at index {index}")
+    def _build_page(self, key):
+        """Construct the page for `key`, restoring what it saved when it was last evicted."""
+        start = time.perf_counter()
+        page_class = self._page_class(key) if key in self.routes else None
+        page = None
+        if page_class:
+            # Pass user session data to the page
+            session = dict(
+                username=self.user_session.get("username", ""),
+                roles=self.user_session.get("roles", []),
+                primary_role=self.user_session.get("primary_role", ""),
+                token=self.user_session.get("token", "")
+            )
+            try:
+                inspect.signature(page_class).bind(**session)
+            except (TypeError, ValueError):
+                # TypeError: modulars were never imported before, not all of them take
+                # the session arguments. ValueError: no signature to check, e.g. a Qt
+                # class used as is, whose constructor takes none of them either.
+                print(f"Router: {page_class.__name__} takes no session arguments, building {key} without them")
+                session = {}
+            # Anything the page itself raises is a bug in the page, let it surface
+            page = page_class(**session)
+        if page is None and key in self.routes:
+            page = self._create_default_widget(*self.routes[key][:2])
+        elif page is None:
+            page = self._create_default_widget("⚠️ Missing Page", f"No page found for ID {key}")
+        state = self._saved_state.pop(key, None)
+        if state is not None and hasattr(page, "restore_state"):
+            page.restore_state(state)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.build_times.setdefault(key, []).append(elapsed)
+        print(f"Router: Built {key} in {elapsed:.1f} ms")
+        return page
+
+    def _evict(self):
+        """Drop least recently shown pages beyond max_pages, keeping their saved state."""
+        current = self.stack.currentWidget()
+        for key in list(self.pages):
+            if len(self.pages) <= self.max_pages:
+                break
+            page = self.pages[key]
+            if page is current or getattr(page, "keep_alive", False):
+                continue
+            if hasattr(page, "save_state"):
+                self._saved_state[key] = page.save_state()
+            del self.pages[key]
+            self.stack.removeWidget(page)
+            page.deleteLater()
+            print(f"Router: Evicted {key}")
 
     def navigate(self, page_id, is_modular=False, parent_main_id=None):
         key = f"mod_{parent_main_id}_{page_id}" if is_modular else f"main_{page_id}"
-        index = self.page_map.get(key)
-        print(f"Router: Navigating to {key}, index: {index}, page_map: {self.page_map}")
-        if index is not None:
-            self.stack.setCurrentWidget(self.stack.widget(index))
-            
-        else:
-            missing_page = self._create_default_widget("⚠️ Missing Page", f"No page found for ID {key}")
-            index = self.stack.addWidget(missing_page)
-            self.page_map[key] = index
-            self.stack.setCurrentWidget(missing_page)
+        page = self.pages.get(key)
+        print(f"Router: Navigating to {key}, live pages: {list(self.pages)}")
+        if page is None:
+            page = self._build_page(key)
+            self.stack.addWidget(page)
+            self.pages[key] = page
+        # Most recently shown last
+        self.pages.move_to_end(key)
+        self.stack.setCurrentWidget(page)
+        self._evict()
+
+    def page_timings(self):
+        """{page key: (times built, last build ms, slowest build ms)}."""
+        return {key: (len(times), times[-1], max(times)) for key, times in self.build_times.items()}
 
     def clear_pages(self):
-        while self.stack.count() > 0:
-            widget = self.stack.widget(0)
-            self.stack.removeWidget(widget)
-            widget.deleteLater()
-        self.page_map.clear()
-        access_denied = self._create_default_widget("Access Denied", "You do not have permission to view this page.")
-        self.stack.addWidget(access_denied)
-        self.page_map["access_denied"] = 0
+        for page in self.pages.values():
+            self.stack.removeWidget(page)
+            page.deleteLater()
+        self.pages.clear()
+        self._saved_state.clear()
+        self.stack.setCurrentWidget(self.access_denied)
 
     def _create_default_widget(self, title, desc):
         """Fallback widget if class not found."""
@@ -0,0 +1,283 @@
+# Helper for authenticated calls to the Django backend
+# Every request takes its bearer token from the shared token_manager, so a
+# running refresh holds new requests back until the renewed token is ready.
+# All calls go through one ApiClient, whose session keeps connections to the
+# backend alive between calls instead of opening one per request.
+import json
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from services.auth_service import token_manager
+
+API_BASE = "http://127.0.0.1:8000/api/"
+BATCH_URL = API_BASE + "batch/"
+
+
+def build_url(path):
+    if path.startswith("http://") or path.startswith("https://"):
+        return path
+    return API_BASE + path.lstrip("/")
+
+
+class ValidatorCache:
+    """Last 200 response of each GET URL, kept with its ETag.
+
+    The backend's ETags come from its table version counters (api/conditional.py)
+    and it sends no Last-Modified. GETs send the stored ETag as If-None-Match;
+    when the backend answers 304 the stored response is handed back, so callers
+    always see a normal 200 response.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def headers_for(self, key):
+        with self._lock:
+            resp = self._entries.get(key)
+            if resp is None:
+                return {}
+            self._entries.move_to_end(key)
+        return {"If-None-Match": resp.headers["ETag"]}
+
+    def store(self, key, resp):
+        if not resp.headers.get("ETag"):
+            return
+        with self._lock:
+            self._entries[key] = resp
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+validator_cache = ValidatorCache()
+
+
+class LatencyMetrics:
+    """Response times per endpoint, with ids in the path folded into {id}."""
+    SAMPLES = 256
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    @staticmethod
+    def endpoint(method, url):
+        path = re.sub(r"/\d+(?=/|$)", "/{id}", urlsplit(url).path)
+        return f"{method.upper()} {path}"
+
+    def record(self, endpoint, elapsed_ms, failed=False):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = {"count": 0, "errors": 0, "samples": deque(maxlen=self.SAMPLES)}
+            stats["count"] += 1
+            stats["errors"] += failed
+            stats["samples"].append(elapsed_ms)
+
+    def snapshot(self):
+        """{endpoint: count, errors and ms percentiles over the last SAMPLES calls}."""
+        with self._lock:
+            endpoints = {name: (stats["count"], stats["errors"], sorted(stats["samples"]))
+                         for name, stats in self._endpoints.items()}
+        report = {}
+        for name, (count, errors, samples) in endpoints.items():
+            report[name] = {
+                "count": count,
+                "errors": errors,
+                "p50_ms": round(samples[len(samples) // 2], 1),
+                "p95_ms": round(samples[min(int(len(samples) * 0.95), len(samples) - 1)], 1),
+                "max_ms": round(samples[-1], 1),
+            }
+        return report
+
+    def clear(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+class ApiClient:
+    """Pooled keep-alive session to the backend.
+
+    Adds the bearer token from `tokens` to every call (unless auth=False),
+    retries idempotent calls with exponential backoff on connection errors
+    and 502/503/504, renews the token once on a 401, revalidates GETs against
+    the validator cache and records each endpoint's latency in `metrics`.
+    """
+    # POST and PATCH are not retried, the backend may have applied them
+    RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    RETRY_STATUSES = (502, 503, 504)
+
+    def __init__(self, tokens=None, cache=None, retries=2, backoff=0.3, pool_size=10, timeout=10):
+        self.tokens = tokens
+        self.cache = cache if cache is not None else ValidatorCache()
+        self.timeout = timeout
+        self.metrics = LatencyMetrics()
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries, connect=retries, read=retries, status=retries,
+            backoff_factor=backoff, status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=self.RETRY_METHODS, raise_on_status=False,
+        )
+        # One host, so one pool; pool_size connections for concurrent callers
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _auth_header(self, auth):
+        return self.tokens.auth_header() if auth and self.tokens is not None else {}
+
+    def _send(self, method, url, headers, timeout, auth, **kwargs):
+        resp = self._timed(method, url, headers, timeout, **kwargs)
+        # Token expired between the check and the call, renew once and retry
+        if resp.status_code == 401 and auth and self.tokens is not None and self.tokens.refresh():
+            headers.update(self.tokens.auth_header())
+            resp = self._timed(method, url, headers, timeout, **kwargs)
+        return resp
+
+    def _timed(self, method, url, headers, timeout, **kwargs):
+        endpoint = self.metrics.endpoint(method, url)
+        start = time.perf_counter()
+        try:
+            resp = self.session.request(method, url, headers=headers, timeout=timeout, **kwargs)
+        except requests.RequestException:
+            self.metrics.record(endpoint, (time.perf_counter() - start) * 1000, failed=True)
+            raise
+        self.metrics.record(endpoint, (time.perf_counter() - start) * 1000, failed=resp.status_code >= 500)
+        return resp
+
+    def request(self, method, path, timeout=None, auth=True, **kwargs):
+        url = build_url(path)
+        timeout = self.timeout if timeout is None else timeout
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers.update(self._auth_header(auth))
+        if method.upper() != "GET" or kwargs.get("stream"):
+            return self._send(method, url, headers, timeout, auth, **kwargs)
+
+        # Conditional GET: the URL with its query string identifies the copy
+        key = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+        resp = self._send(method, url, {**self.cache.headers_for(key), **headers}, timeout, auth, **kwargs)
+        if resp.status_code == 304:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+            # Evicted in between, ask again without validators
+            resp = self._send(method, url, headers, timeout, auth, **kwargs)
+        if resp.status_code == 200:
+            self.cache.store(key, resp)
+        return resp
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request("PATCH", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def batch(self, calls, timeout=30):
+        """Send several calls in one round trip, responses come back in order.
+
+        Each call is a path (GET) or a dict with "path" and optionally "method",
+        "params" and "json", e.g. batch(["users/", {"method": "POST", "path": ...}]).
+        GETs revalidate against the validator cache like get() does. Raises
+        requests.HTTPError when the batch as a whole is rejected.
+        """
+        subs, keys = [], []
+        for call in calls:
+            if isinstance(call, str):
+                call = {"path": call}
+            method = call.get("method", "GET").upper()
+            url = requests.Request("GET", build_url(call["path"]), params=call.get("params")).prepare().url
+            parts = urlsplit(url)
+            sub = {"method": method, "path": parts.path + (f"?{parts.query}" if parts.query else "")}
+            if "json" in call:
+                sub["body"] = call["json"]
+            key = url if method == "GET" else None
+            if key:
+                sub["headers"] = self.cache.headers_for(key)
+            subs.append(sub)
+            keys.append(key)
+
+        resp = self.request("POST", BATCH_URL, timeout=timeout, json={"requests": subs})
+        resp.raise_for_status()
+        results = []
+        for key, item in zip(keys, resp.json()["responses"]):
+            if key and item["status"] == 304 and self.cache.get(key) is not None:
+                results.append(self.cache.get(key))
+                continue
+            result = BatchResponse(item["status"], item["headers"], item["body"])
+            if key and result.status_code == 200:
+                self.cache.store(key, result)
+            results.append(result)
+        return results
+
+    def close(self):
+        self.session.close()
+
+
+class BatchResponse:
+    """One sub-response of batch(), read like a requests.Response."""
+
+    def __init__(self, status_code, headers, body):
+        self.status_code = status_code
+        self.headers = headers
+        self._body = body
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        return self._body
+
+    @property
+    def text(self):
+        return self._body if isinstance(self._body, str) else json.dumps(self._body)
+
+
+# The client every service and view shares, and its module-level shortcuts
+client = ApiClient(tokens=token_manager, cache=validator_cache)
+
+
+def request(method, path, **kwargs):
+    return client.request(method, path, **kwargs)
+
+
+def get(path, **kwargs):
+    return client.get(path, **kwargs)
+
+
+def post(path, **kwargs):
+    return client.post(path, **kwargs)
+
+
+def batch(calls, timeout=30):
+    return client.batch(calls, timeout=timeout)
+
+
+def latency_report():
+    return client.metrics.snapshot()
@@ -1,17 +1,156 @@
 # Auth service for login, stll needs modification or even refactorization, error on self.base_url
+import base64
+import json
+import threading
+import time
+
 import requests
 
+REFRESH_URL = "http://127.0.0.1:8000/api/users/token/refresh/"
+
+
+def _token_expiry(token):
+    """Read the exp claim of a JWT without verifying it (the backend does that)."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload))["exp"]
+    except (AttributeError, IndexError, KeyError, ValueError):
+        # Unknown expiry, assume a short lifetime so we renew early
+        return time.time() + 300
+
+
+class TokenManager:
+    """Holds the JWT pair for the session and renews the access token before it expires.
+
+    Only one refresh runs at a time; callers asking for a token while it runs
+    wait for it instead of starting their own. When the backend rejects the
+    refresh token (401: expired, or the user is gone) the tokens are cleared
+    and the on_expired() listeners are called, so the UI can ask for a login.
+    """
+    REFRESH_MARGIN = 60  # seconds before expiry
+
+    def __init__(self, refresh_url=REFRESH_URL):
+        self.refresh_url = refresh_url
+        self.access_token = None
+        self.refresh_token = None
+        self.expires_at = 0
+        self._cond = threading.Condition()
+        self._refreshing = False
+        self._last_refresh_ok = False
+        self._timer = None
+        self._expired_listeners = []
+
+    def on_expired(self, callback):
+        """Call `callback()` once the session can't be renewed. It may run on the refresh timer's thread."""
+        self._expired_listeners.append(callback)
+
+    def set_tokens(self, access_token, refresh_token=None):
+        with self._cond:
+            self.access_token = access_token
+            if refresh_token:
+                self.refresh_token = refresh_token
+            self.expires_at = _token_expiry(access_token) if access_token else 0
+        self._schedule_refresh()
+
+    def clear(self):
+        with self._cond:
+            self.access_token = None
+            self.refresh_token = None
+            self.expires_at = 0
+        self._cancel_timer()
+
+    def get_access_token(self):
+        with self._cond:
+            while self._refreshing:
+                self._cond.wait()
+            expiring = time.time() >= self.expires_at - self.REFRESH_MARGIN
+            needs_refresh = bool(self.refresh_token) and expiring
+            token = self.access_token
+        if needs_refresh and self.refresh():
+            with self._cond:
+                token = self.access_token
+        return token
+
+    def auth_header(self):
+        token = self.get_access_token()
+        return {"Authorization": f"Bearer {token}"} if token else {}
+
+    def refresh(self):
+        """Renew the access token, returns True on success."""
+        with self._cond:
+            if self._refreshing:
+                while self._refreshing:
+                    self._cond.wait()
+                return self._last_refresh_ok
+            if not self.refresh_token:
+                return False
+            self._refreshing = True
+            refresh_token = self.refresh_token
+
+        access, rotated, rejected = None, None, False
+        try:
+            # Imported here, api_client itself needs this module's token_manager
+            from services.api_client import client
+            resp = client.post(self.refresh_url, json={"refresh": refresh_token}, auth=False)
+            if resp.status_code == 200:
+                body = resp.json()
+                access, rotated = body.get("access"), body.get("refresh")
+            rejected = resp.status_code == 401
+        except (requests.RequestException, ValueError):
+            # Backend unreachable, the tokens may still be good once it is back
+            pass
+
+        with self._cond:
+            if access:
+                self.access_token = access
+                self.refresh_token = rotated or self.refresh_token
+                self.expires_at = _token_expiry(access)
+            self._last_refresh_ok = bool(access)
+            self._refreshing = False
+            self._cond.notify_all()
+
+        if access:
+            self._schedule_refresh()
+        elif rejected:
+            self.clear()
+            for callback in list(self._expired_listeners):
+                callback()
+        return bool(access)
+
+    def _schedule_refresh(self):
+        self._cancel_timer()
+        if not self.refresh_token:
+            return
+        delay = max(self.expires_at - self.REFRESH_MARGIN - time.time(), 0)
+        self._timer = threading.Timer(delay, self.refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+# One token store for the whole client, AuthService and every API call share it
+token_manager = TokenManager()
+
+
 class AuthService:
     def __init__(self):
         # should point to core-urls, then core-urls to api-urls.py, then api-urls.py to user_api.py then handle login logic
         # self.base_url = 'http://localhost:8000/api/users/login/api/'
         self.base_url = "http://127.0.0.1:8000/api/users/login/api/"
+        self.tokens = token_manager
 
     def login(self, username, password):
         """Authenticate user by sending a POST request to the Django backend."""
         payload = {"identifier": username, "password": password}
         try:
-            resp = requests.post(self.base_url, json=payload, timeout=10)
+            # The shared pooled session, so the calls after login reuse its connection
+            from services.api_client import client
+            resp = client.post(self.base_url, json=payload, auth=False)
         
             try:
                 body = resp.json()
@@ -20,9 +159,12 @@ class AuthService:
 
             if resp.status_code == 200:
                 token = body.get("access_token")
+                refresh_token = body.get("refresh_token")
                 roles = body.get("roles", [])
                 primary_role = body.get("primary_role")
-                return LoginResult(True, username=username, token=token, roles=roles, primary_role=primary_role)
+                self.tokens.set_tokens(token, refresh_token)
+                return LoginResult(True, username=username, token=token, refresh_token=refresh_token,
+                                   roles=roles, primary_role=primary_role)
 
             msg = body.get("message") or body.get("detail")
             if not msg and "errors" in body:
@@ -60,10 +202,11 @@ class AuthService:
 
 
 class LoginResult:
-    def __init__(self, ok, username=None, token=None, roles=None, primary_role=None, error=None):
+    def __init__(self, ok, username=None, token=None, refresh_token=None, roles=None, primary_role=None, error=None):
         self.ok = ok
         self.username = username
         self.token = token
+        self.refresh_token = refresh_token
         self.roles = roles or []
         self.primary_role = primary_role
         self.error = error
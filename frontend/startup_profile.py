@@ -0,0 +1,161 @@
+"""
+Cold-start profiler for the desktop client.
+
+Run with VHUB_STARTUP_PROFILE set (to a report path, or to 1 for
+startup_profile.json in the working directory). It times every module
+import from the moment it is enabled and marks the startup phases main.py
+reports, from QApplication creation to the first paint of the dashboard,
+then writes both to the report. Unset, every call here is a no-op.
+"""
+import importlib.abc
+import json
+import os
+import sys
+import time
+
+ENV_FLAG = "VHUB_STARTUP_PROFILE"
+DEFAULT_REPORT = "startup_profile.json"
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wraps a module's loader to time its execution, nested imports included."""
+
+    def __init__(self, loader, profiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # The module sees its real loader, this wrapper only lives for the import
+        module.__loader__ = module.__spec__.loader = self._loader
+        self._profiler._enter()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._leave(module.__name__, start)
+
+    def __getattr__(self, name):
+        # get_resource_reader(), get_source() and the like
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self._profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    def __init__(self, report_path):
+        self.report_path = report_path
+        self.origin = time.perf_counter()
+        self.phases = []
+        # (module, started at, inclusive ms, own ms)
+        self.imports = []
+        self._children = [0.0]
+        self._finder = _TimingFinder(self)
+        self._written = False
+
+    def _ms(self, since=None):
+        return (time.perf_counter() - (self.origin if since is None else since)) * 1000
+
+    def _enter(self):
+        self._children.append(0.0)
+
+    def _leave(self, name, start):
+        total = self._ms(start)
+        children = self._children.pop()
+        self._children[-1] += total
+        self.imports.append((name, (start - self.origin) * 1000, total, total - children))
+
+    def install(self):
+        sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    def mark(self, phase):
+        self.phases.append((phase, self._ms()))
+        print(f"StartupProfiler: {phase} at {self.phases[-1][1]:.1f} ms")
+
+    def mark_first_paint(self, widget, phase="first paint"):
+        """Mark `phase` and write the report when `widget` is first painted."""
+        from PyQt6.QtCore import QEvent, QObject
+
+        profiler = self
+
+        class _FirstPaint(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Type.Paint:
+                    obj.removeEventFilter(self)
+                    profiler.mark(phase)
+                    profiler.finish()
+                return False
+
+        # Kept on the widget so it lives as long as the filter is installed
+        widget._startup_paint_filter = _FirstPaint(widget)
+        widget.installEventFilter(widget._startup_paint_filter)
+
+    def report(self):
+        by_own = sorted(self.imports, key=lambda row: row[3], reverse=True)
+        return {
+            "total_ms": round(self.phases[-1][1] if self.phases else self._ms(), 1),
+            "phases": [{"phase": name, "at_ms": round(at, 1)} for name, at in self.phases],
+            "import_ms": round(sum(row[3] for row in self.imports), 1),
+            "imports": [
+                {"module": name, "at_ms": round(at, 1), "total_ms": round(total, 2), "self_ms": round(own, 2)}
+                for name, at, total, own in by_own
+            ],
+        }
+
+    def finish(self):
+        """Stop timing imports and write the report, once."""
+        if self._written:
+            return
+        self._written = True
+        self.uninstall()
+        report = self.report()
+        with open(self.report_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"StartupProfiler: {len(report['imports'])} imports took {report['import_ms']} ms, "
+              f"report written to {os.path.abspath(self.report_path)}")
+        for row in report["imports"][:10]:
+            print(f"StartupProfiler:   {row['self_ms']:8.2f} ms  {row['module']}")
+
+
+class _Disabled:
+    def mark(self, phase):
+        pass
+
+    def mark_first_paint(self, widget, phase="first paint"):
+        pass
+
+    def finish(self):
+        pass
+
+
+def _from_env():
+    value = os.environ.get(ENV_FLAG, "")
+    if not value or value == "0":
+        return _Disabled()
+    profiler = StartupProfiler(DEFAULT_REPORT if value == "1" else value)
+    profiler.install()
+    return profiler
+
+
+# Import this module before anything else for the import timeline to be complete
+profiler = _from_env()
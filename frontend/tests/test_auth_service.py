@@ -0,0 +1,46 @@
+"""TokenManager tests, no backend needed. Run from frontend/ like test_router.py."""
+import unittest
+from unittest import mock
+
+from services.auth_service import TokenManager
+
+
+def refresh_answer(status_code, body=None):
+    response = mock.Mock(status_code=status_code)
+    response.json.return_value = body or {}
+    return mock.patch("services.api_client.client.post", return_value=response)
+
+
+class TokenManagerTests(unittest.TestCase):
+    def setUp(self):
+        self.tokens = TokenManager()
+        self.tokens.set_tokens("access", "refresh")
+        self.expired = mock.Mock()
+        self.tokens.on_expired(self.expired)
+
+    def tearDown(self):
+        self.tokens.clear()
+
+    def test_rejected_refresh_token_ends_the_session(self):
+        with refresh_answer(401):
+            self.assertFalse(self.tokens.refresh())
+        self.assertIsNone(self.tokens.access_token)
+        self.assertIsNone(self.tokens.refresh_token)
+        self.expired.assert_called_once_with()
+
+    def test_unreachable_backend_keeps_the_session(self):
+        import requests
+        with mock.patch("services.api_client.client.post", side_effect=requests.ConnectionError):
+            self.assertFalse(self.tokens.refresh())
+        self.assertEqual(self.tokens.refresh_token, "refresh")
+        self.expired.assert_not_called()
+
+    def test_renewed_access_token_is_stored(self):
+        with refresh_answer(200, {"access": "renewed"}):
+            self.assertTrue(self.tokens.refresh())
+        self.assertEqual(self.tokens.access_token, "renewed")
+        self.expired.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""RoleAccess tests over a small navigation tree. Run from frontend/ like test_router.py."""
+import unittest
+
+from utils.db_helper import NavigationDataHelper
+
+TREE = {"parents": [
+    {"id": 1, "name": "Home", "mains": [
+        {"id": 1, "name": "Dashboard", "function": "Dashboard()", "path": "", "access": ["student", "admin"],
+         "modulars": [
+             {"id": 1, "name": "Overview", "function": "Overview()", "path": ""},
+             {"id": 2, "name": "Audit", "function": "Audit()", "path": "", "access": "admin"},
+         ]},
+        {"id": 2, "name": "Grades", "function": "Grades()", "path": "", "access": "student"},
+    ]},
+    {"id": 2, "name": "Admin", "mains": [
+        {"id": 3, "name": "Accounts", "function": "Accounts()", "path": "", "access": "admin"},
+    ]},
+]}
+
+
+def names(access):
+    """Section -> main -> modular names of a RoleAccess, in navigation order."""
+    return [
+        (parent_name, [(main_row[1], [row[1] for row in modulars]) for main_row, modulars in mains])
+        for _, parent_name, mains in access.sections
+    ]
+
+
+class RoleAccessTests(unittest.TestCase):
+    def setUp(self):
+        self.nav = NavigationDataHelper(data=TREE)
+
+    def test_sections_hold_only_what_the_role_may_open(self):
+        access = self.nav.get_access(["student"])
+        self.assertEqual(names(access), [("Home", [("Dashboard", ["Overview"]), ("Grades", [])])])
+        self.assertTrue(access.allows("mod_1_1"))
+        self.assertFalse(access.allows("mod_1_2"))
+        self.assertFalse(access.allows("main_3"))
+
+    def test_modulars_inherit_their_main_access(self):
+        self.assertEqual(self.nav.get_access(["admin"]).pages,
+                         {"main_1", "mod_1_1", "mod_1_2", "main_3"})
+
+    def test_roles_add_up(self):
+        access = self.nav.get_access(["student", "admin"])
+        self.assertEqual(names(access), [
+            ("Home", [("Dashboard", ["Overview", "Audit"]), ("Grades", [])]),
+            ("Admin", [("Accounts", [])]),
+        ])
+        self.assertIs(self.nav.get_access(["admin", "student"]), access)
+
+    def test_unknown_roles_see_nothing(self):
+        access = self.nav.get_access(["super_admin"])
+        self.assertEqual(access.sections, [])
+        self.assertEqual(access.pages, frozenset())
+
+    def test_new_tree_rebuilds_the_access(self):
+        before = self.nav.get_access(["student"])
+        self.nav.use_data({"parents": [TREE["parents"][1]]})
+        self.assertIsNot(self.nav.get_access(["student"]), before)
+        self.assertEqual(self.nav.get_access(["student"]).sections, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
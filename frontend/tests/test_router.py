@@ -0,0 +1,183 @@
+"""
+Router tests, headless (Qt's offscreen platform). Run from frontend/:
+
+    python -m unittest discover -s tests -t .
+"""
+import json
+import os
+import sys
+import unittest
+from importlib import import_module
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+FRONTEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Like main.py, some views import through the frontend package
+if os.path.dirname(FRONTEND) not in sys.path:
+    sys.path.append(os.path.dirname(FRONTEND))
+
+try:
+    from PyQt6.QtWidgets import QApplication, QLabel, QWidget
+except ImportError:
+    raise unittest.SkipTest("PyQt6 is not installed")
+
+from router.router import Router
+from utils.db_helper import get_navigation
+
+NAVBAR = os.path.join(FRONTEND, "utils", "navbar.json")
+
+app = QApplication.instance() or QApplication([])
+
+
+def session_for(role):
+    return {"username": f"test_{role}", "roles": [role], "primary_role": role, "token": ""}
+
+
+def no_users():
+    # AdminDashboard loads the user list on construction, there is no backend here
+    response = mock.Mock(status_code=200)
+    response.json.return_value = {"results": [], "next": None}
+    return mock.patch("views.Dashboard.AdminDashboard.api_client.get", return_value=response)
+
+
+class NavbarSmokeTests(unittest.TestCase):
+    def setUp(self):
+        get_navigation().reload_data()
+
+    def entries(self):
+        with open(NAVBAR, encoding="utf-8") as f:
+            data = json.load(f)
+        for parent in data["parents"]:
+            for main in parent["mains"]:
+                yield f"main_{main['id']}", main
+                for modular in main.get("modulars", []):
+                    yield f"mod_{main['id']}_{modular['id']}", {**modular, "access": modular.get("access", main["access"])}
+
+    def test_every_entry_resolves_and_constructs_for_its_roles(self):
+        for key, entry in self.entries():
+            access = [entry["access"]] if isinstance(entry["access"], str) else entry["access"]
+            for role in access:
+                with self.subTest(page=key, role=role), no_users():
+                    if entry["path"]:
+                        self.import_page(entry["path"])
+                    router = Router(role, session_for(role))
+                    self.assertIn(key, router.routes)
+                    page_class = router._page_class(key)
+                    if entry["path"]:
+                        self.assertIsNotNone(page_class, f"{entry['path']} has no {entry['function']}")
+                    router.navigate(*self.navigate_args(key))
+                    page = router.stack.currentWidget()
+                    self.assertIsNot(page, router.access_denied)
+                    if page_class:
+                        self.assertIsInstance(page, page_class)
+
+    def import_page(self, path):
+        # The Router only prints import errors, surface them here
+        try:
+            import_module(path)
+        except ImportError as e:
+            if "resources_rc" in str(e):
+                # Generated, not checked in: pyside6-rcc assets/org_assets.qrc into ui/Organization/
+                self.skipTest(f"{path} needs the compiled Qt resources: {e}")
+            raise
+
+    @staticmethod
+    def navigate_args(key):
+        parts = key.split("_")
+        if parts[0] == "main":
+            return (int(parts[1]),)
+        return int(parts[2]), True, int(parts[1])
+
+    def test_pages_without_a_signature_are_built_without_session(self):
+        router = Router("student", session_for("student"))
+        # Qt classes raise ValueError from inspect.signature
+        router._page_classes["main_1"] = QLabel
+        router.navigate(1)
+        self.assertIsInstance(router.stack.currentWidget(), QLabel)
+
+
+class CounterPage(QWidget):
+    """A page with state to lose: a number the user has moved."""
+
+    def __init__(self, username, roles, primary_role, token):
+        super().__init__()
+        self.value = 0
+
+    def save_state(self):
+        return {"value": self.value}
+
+    def restore_state(self, state):
+        self.value = state["value"]
+
+
+class PinnedPage(CounterPage):
+    keep_alive = True
+
+
+class EvictionTests(unittest.TestCase):
+    def setUp(self):
+        get_navigation().reload_data()
+        self.router = Router("admin", session_for("admin"), max_pages=2)
+        for main_id in range(1, 6):
+            self.router._page_classes[f"main_{main_id}"] = CounterPage
+
+    def page(self, main_id):
+        return self.router.pages.get(f"main_{main_id}")
+
+    def test_least_recently_shown_page_is_evicted_with_its_state(self):
+        self.router.navigate(1)
+        self.page(1).value = 7
+        self.router.navigate(2)
+        self.router.navigate(3)
+        self.assertEqual(list(self.router.pages), ["main_2", "main_3"])
+        self.assertEqual(self.router._saved_state, {"main_1": {"value": 7}})
+
+        self.router.navigate(1)
+        self.assertEqual(self.page(1).value, 7)
+        self.assertEqual(self.router.page_timings()["main_1"][0], 2)
+        self.assertNotIn("main_1", self.router._saved_state)
+
+    def test_revisiting_keeps_a_page_alive(self):
+        self.router.navigate(1)
+        first = self.page(1)
+        self.router.navigate(2)
+        self.router.navigate(1)
+        self.router.navigate(3)
+        self.assertIs(self.page(1), first)
+        self.assertIsNone(self.page(2))
+
+    def test_keep_alive_pages_are_never_evicted(self):
+        self.router._page_classes["main_1"] = PinnedPage
+        for main_id in (1, 2, 3, 4):
+            self.router.navigate(main_id)
+        self.assertEqual(list(self.router.pages), ["main_1", "main_4"])
+
+    def test_dropped_roles_drop_their_pages_and_state(self):
+        self.router.navigate(1)
+        self.router.navigate(2)
+        self.router.navigate(3)
+        # The student pages go; the evicted Dashboard (main_1) is still open to staff
+        self.router.set_roles(["staff"])
+        self.assertEqual(list(self.router.pages), [])
+        self.assertIn("main_1", self.router._saved_state)
+        self.assertIs(self.router.stack.currentWidget(), self.router.access_denied)
+
+    def test_admin_dashboard_gets_its_rows_back(self):
+        self.router._page_classes.pop("main_1")
+        users = [{"id": n, "username": f"user{n}", "groups": ["student"]} for n in range(3)]
+        with no_users():
+            self.router.navigate(1)
+            self.page(1).dashboard_widget.populate_table(users)
+            self.page(1).dashboard_widget.next_users_url = "http://127.0.0.1:8000/api/users/?cursor=abc"
+            self.router.navigate(2)
+            self.router.navigate(3)
+            self.assertIsNone(self.page(1))
+            self.router.navigate(1)
+        dashboard = self.page(1).dashboard_widget
+        self.assertEqual(dashboard.users, users)
+        self.assertEqual(dashboard.table.rowCount(), 3)
+        self.assertTrue(dashboard.load_more_btn.isEnabled())
+
+
+if __name__ == "__main__":
+    unittest.main()
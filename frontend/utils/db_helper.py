@@ -1,70 +1,154 @@
+import hashlib
 import json
 import os
 import sys
 
+
+class RoleAccess:
+    """
+    What a set of roles can open, in navigation order: `sections` is
+    [(parent_id, parent_name, [(main_row, [modular_row, ...]), ...]), ...]
+    with the same row tuples as get_main_by_parent() and get_modular_by_main(),
+    `pages` the keys ("main_<id>", "mod_<main id>_<id>") the Router serves.
+    """
+    def __init__(self, roles, sections, pages):
+        self.roles = roles
+        self.sections = sections
+        self.pages = pages
+
+    def allows(self, page_key):
+        return page_key in self.pages
+
+
 class NavigationDataHelper:
-    def __init__(self, json_file="frontend/utils/navbar.json"):
+    """
+    navbar.json (or the session's tree from the backend) indexed by id.
+
+    Parents, mains and modulars are kept in id -> node dicts with their parent
+    links, and each role's visible pages in a set, so every lookup is a dict
+    access. reload_data() re-reads the file only when its mtime or size moved
+    and rebuilds the index only when its content hash did.
+    """
+    def __init__(self, json_file="frontend/utils/navbar.json", data=None):
         # Try default path, then fallback to project root or relative paths
         self.json_file = json_file
         self._data = None
-        self._load_data()
-
-    def _load_data(self):
+        self._stamp = None
+        self._digest = None
+        if data is not None:
+            # Tree already filtered by the backend (/api/users/me/bootstrap/), no file to parse
+            self.use_data(data)
+        else:
+            self._load_data()
+
+    def _resolve_path(self):
         absolute_path = os.path.abspath(self.json_file)
-        print(f"NavigationDataHelper: Current working directory: {os.getcwd()}")
-        print(f"NavigationDataHelper: Attempting to load JSON from {absolute_path}, exists: {os.path.exists(absolute_path)}")
-
+        if os.path.exists(absolute_path):
+            return absolute_path
+        print(f"NavigationDataHelper: {absolute_path} not found from {os.getcwd()}, trying alternatives")
         # Try alternative paths if the default fails
-        if not os.path.exists(absolute_path):
-            alternative_paths = [
-                os.path.join(os.path.dirname(os.path.abspath(__file__)), "navbar.json"),
-                os.path.join(os.getcwd(), "navbar.json"),
-                os.path.join(os.getcwd(), "frontend", "navbar.json")
-            ]
-            for alt_path in alternative_paths:
-                print(f"NavigationDataHelper: Trying alternative path: {alt_path}, exists: {os.path.exists(alt_path)}")
-                if os.path.exists(alt_path):
-                    self.json_file = alt_path
-                    absolute_path = alt_path
-                    break
-
-        if not os.path.exists(absolute_path):
-            print(f"NavigationDataHelper: ERROR: File {absolute_path} does not exist. Check file path and working directory.")
+        alternative_paths = [
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "navbar.json"),
+            os.path.join(os.getcwd(), "navbar.json"),
+            os.path.join(os.getcwd(), "frontend", "navbar.json")
+        ]
+        for alt_path in alternative_paths:
+            if os.path.exists(alt_path):
+                self.json_file = alt_path
+                return alt_path
+        print(f"NavigationDataHelper: ERROR: File {absolute_path} does not exist. Check file path and working directory.")
+        return absolute_path
+
+    @staticmethod
+    def _validate(data):
+        if not isinstance(data, dict) or "parents" not in data:
+            raise ValueError("Invalid JSON structure: 'parents' key missing")
+
+        # Validate access, function, and path fields
+        for parent in data["parents"]:
+            for main in parent["mains"]:
+                if "access" not in main:
+                    raise ValueError(f"Missing 'access' field in main item {main['id']}")
+                if not (isinstance(main["access"], str) or isinstance(main["access"], list)):
+                    raise ValueError(f"Invalid 'access' field in main item {main['id']}")
+                if "function" not in main or not isinstance(main["function"], str) or not main["function"].endswith("()"):
+                    raise ValueError(f"Invalid 'function' field in main item {main['id']}: must be a string ending with '()'")
+                if "path" not in main or not isinstance(main["path"], str):
+                    raise ValueError(f"Missing or invalid 'path' field in main item {main['id']}")
+
+                # Validate modulars if present
+                for modular in main.get("modulars", []):
+                    if "function" not in modular or not isinstance(modular["function"], str) or not modular["function"].endswith("()"):
+                        raise ValueError(f"Invalid 'function' field in modular item {modular['id']}: must be a string ending with '()'")
+                    if "path" not in modular or not isinstance(modular["path"], str):
+                        raise ValueError(f"Missing or invalid 'path' field in modular item {modular['id']}")
 
+    def _load_data(self):
+        absolute_path = self._resolve_path()
         try:
-            with open(self.json_file, "r") as f:
-                data = json.load(f)
-            print(f"NavigationDataHelper: Loaded navbar.json: {data}")
-            if not isinstance(data, dict) or "parents" not in data:
-                raise ValueError("Invalid JSON structure: 'parents' key missing")
-
-            # Validate access, function, and path fields
-            for parent in data["parents"]:
-                for main in parent["mains"]:
-                    if "access" not in main:
-                        raise ValueError(f"Missing 'access' field in main item {main['id']}")
-                    if not (isinstance(main["access"], str) or isinstance(main["access"], list)):
-                        raise ValueError(f"Invalid 'access' field in main item {main['id']}")
-                    if "function" not in main or not isinstance(main["function"], str) or not main["function"].endswith("()"):
-                        raise ValueError(f"Invalid 'function' field in main item {main['id']}: must be a string ending with '()'")
-                    if "path" not in main or not isinstance(main["path"], str):
-                        raise ValueError(f"Missing or invalid 'path' field in main item {main['id']}")
-
-                    # Validate modulars if present
-                    for modular in main.get("modulars", []):
-                        if "function" not in modular or not isinstance(modular["function"], str) or not modular["function"].endswith("()"):
-                            raise ValueError(f"Invalid 'function' field in modular item {modular['id']}: must be a string ending with '()'")
-                        if "path" not in modular or not isinstance(modular["path"], str):
-                            raise ValueError(f"Missing or invalid 'path' field in modular item {modular['id']}")
-
-            self._data = data
-            print(f"✓ Navigation data loaded from {absolute_path}, parents found: {len(data['parents'])}")
-        except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
+            st = os.stat(absolute_path)
+            stamp = (st.st_mtime_ns, st.st_size)
+            if stamp == self._stamp and self._data is not None:
+                return
+            with open(absolute_path, "rb") as f:
+                raw = f.read()
+            digest = hashlib.blake2b(raw, digest_size=16).digest()
+            self._stamp = stamp
+            if digest == self._digest and self._data is not None:
+                # Touched but not changed
+                return
+            data = json.loads(raw)
+            self._validate(data)
+            self._index(data)
+            self._digest = digest
+            print(f"✓ Navigation data loaded from {absolute_path}: {self.get_navigation_summary()}")
+        except (OSError, json.JSONDecodeError, ValueError) as e:
             print(f"❌ Error loading JSON: {e}")
-            self._data = {"parents": []}  # Fallback to empty structure
-            print("Using fallback empty navigation data")
+            if self._data is None:
+                self._index({"parents": []})  # Fallback to empty structure
+                print("Using fallback empty navigation data")
+            else:
+                print("Keeping the previously loaded navigation data")
+
+    def _index(self, data):
+        parents, mains, modulars = {}, {}, {}
+        mains_by_parent, modulars_by_main, visible = {}, {}, {}
+        for p in data["parents"]:
+            parents[p["id"]] = (p["id"], p["name"])
+            mains_by_parent[p["id"]] = []
+            for m in p["mains"]:
+                main_row = (m["id"], m["name"], m["function"], m["access"], p["id"])
+                mains[m["id"]] = (m, main_row)
+                mains_by_parent[p["id"]].append(main_row)
+                modulars_by_main[m["id"]] = []
+                access = [m["access"]] if isinstance(m["access"], str) else m["access"]
+                for role in access:
+                    visible.setdefault(role, set()).add(f"main_{m['id']}")
+                for mod in m.get("modulars", []):
+                    modulars[mod["id"]] = (mod, (mod["id"], mod["name"], mod["function"], m["id"]))
+                    mod_access = mod.get("access", m["access"])
+                    modulars_by_main[m["id"]].append((mod["id"], mod["name"], mod.get("function", ""), mod_access))
+                    for role in [mod_access] if isinstance(mod_access, str) else mod_access:
+                        visible.setdefault(role, set()).add(f"mod_{m['id']}_{mod['id']}")
+        self._data = data
+        self._parents = parents
+        self._mains = mains
+        self._modulars = modulars
+        self._mains_by_parent = mains_by_parent
+        self._modulars_by_main = modulars_by_main
+        self._visible = {role: frozenset(keys) for role, keys in visible.items()}
+        # frozenset of roles -> RoleAccess, built on first ask
+        self._access = {}
+
+    def use_data(self, data):
+        """Serve `data` (the backend's role-filtered tree) instead of the file."""
+        if data is self._data:
+            return
+        self._index(data)
+        self._stamp = self._digest = None
 
     def reload_data(self):
+        """Pick up changes to the file, a no-op when it is unchanged."""
         self._load_data()
 
     @property
@@ -72,62 +156,66 @@ class NavigationDataHelper:
         return self._data
 
     def get_path_for_main(self, main_id):
-        for parent in self.data["parents"]:
-            for main in parent["mains"]:
-                if main["id"] == main_id:
-                    return main.get("path", "")
-        print(f"NavigationDataHelper: No path found for main ID {main_id}")
-        return ""
+        entry = self._mains.get(main_id)
+        if entry is None:
+            print(f"NavigationDataHelper: No path found for main ID {main_id}")
+            return ""
+        return entry[0].get("path", "")
 
     def get_path_for_modular(self, modular_id):
-        for parent in self.data["parents"]:
-            for main in parent["mains"]:
-                for modular in main["modulars"]:
-                    if modular["id"] == modular_id:
-                        return modular.get("path", "")
-        print(f"NavigationDataHelper: No path found for modular ID {modular_id}")
-        return ""
+        entry = self._modulars.get(modular_id)
+        if entry is None:
+            print(f"NavigationDataHelper: No path found for modular ID {modular_id}")
+            return ""
+        return entry[0].get("path", "")
 
     def get_all_parents(self):
-        parents = [(p["id"], p["name"]) for p in self.data["parents"]]
-        print(f"NavigationDataHelper: Returning {len(parents)} parents: {parents}")
-        return parents
+        return list(self._parents.values())
 
     def get_parent_by_id(self, parent_id):
-        for p in self.data["parents"]:
-            if p["id"] == parent_id:
-                return (p["id"], p["name"])
-        return None
+        return self._parents.get(parent_id)
 
     def get_main_by_parent(self, parent_id):
-        for p in self.data["parents"]:
-            if p["id"] == parent_id:
-                return [(m["id"], m["name"], m["function"], m["access"], parent_id)
-                        for m in p["mains"]]
-        return []
+        return list(self._mains_by_parent.get(parent_id, ()))
 
     def get_main_by_id(self, main_id):
-        for p in self.data["parents"]:
-            for m in p["mains"]:
-                if m["id"] == main_id:
-                    return (m["id"], m["name"], m["function"], m["access"], p["id"])
-        return None
+        entry = self._mains.get(main_id)
+        return entry[1] if entry else None
 
     def get_modular_by_main(self, main_id):
-        for p in self.data["parents"]:
-            for m in p["mains"]:
-                if m["id"] == main_id:
-                    return [(mod["id"], mod["name"], mod.get("function", ""), mod.get("access", m["access"]))
-                            for mod in m["modulars"]]
-        return []
+        return list(self._modulars_by_main.get(main_id, ()))
 
     def get_modular_by_id(self, modular_id):
-        for p in self.data["parents"]:
-            for m in p["mains"]:
-                for mod in m["modulars"]:
-                    if mod["id"] == modular_id:
-                        return (mod["id"], mod["name"], mod["function"], m["id"])
-        return None
+        entry = self._modulars.get(modular_id)
+        return entry[1] if entry else None
+
+    def get_visible_pages(self, role):
+        """Page keys ("main_<id>", "mod_<main id>_<id>") `role` may open."""
+        return self._visible.get(role, frozenset())
+
+    def can_access(self, role, page_key):
+        return page_key in self._visible.get(role, ())
+
+    def get_access(self, roles):
+        """RoleAccess for a user holding all of `roles`, built once per set of roles."""
+        key = frozenset(roles)
+        access = self._access.get(key)
+        if access is not None:
+            return access
+        pages = frozenset().union(*(self._visible.get(role, ()) for role in key))
+        sections = []
+        for parent_id, parent_name in self._parents.values():
+            mains = []
+            for main_row in self._mains_by_parent[parent_id]:
+                main_id = main_row[0]
+                if f"main_{main_id}" not in pages:
+                    continue
+                modulars = [row for row in self._modulars_by_main[main_id] if f"mod_{main_id}_{row[0]}" in pages]
+                mains.append((main_row, modulars))
+            if mains:
+                sections.append((parent_id, parent_name, mains))
+        access = self._access[key] = RoleAccess(sorted(key), sections, pages)
+        return access
 
     def get_page_function(self, table, page_id):
         if table == "parent":
@@ -154,7 +242,7 @@ class NavigationDataHelper:
             for m in p["mains"]:
                 if search_term in m["name"].lower():
                     results.append({"table": "main", "id": m["id"], "name": m["name"]})
-                for mod in m["modulars"]:
+                for mod in m.get("modulars", []):
                     if search_term in mod["name"].lower():
                         results.append({"table": "modular", "id": mod["id"], "name": mod["name"]})
         return results
@@ -163,13 +251,9 @@ class NavigationDataHelper:
         return self.data
 
     def get_navigation_summary(self):
-        parent_count = len(self.data["parents"])
-        main_count = sum(len(p["mains"]) for p in self.data["parents"])
-        modular_count = sum(
-            len(m["modulars"])
-            for p in self.data["parents"]
-            for m in p["mains"]
-        )
+        parent_count = len(self._parents)
+        main_count = len(self._mains)
+        modular_count = len(self._modulars)
         return {
             "parents": parent_count,
             "mains": main_count,
@@ -177,15 +261,22 @@ class NavigationDataHelper:
             "total": parent_count + main_count + modular_count
         }
 
-# Global instance and convenience functions
+# Global instance and convenience functions, shared by the Router and the Sidebar
 _nav_helper = NavigationDataHelper()
 
+def get_navigation():
+    return _nav_helper
+
 def load_data():
     return _nav_helper.data
 
 def reload_navigation_data():
     _nav_helper.reload_data()
 
+def use_navigation(data):
+    """Serve the session's role-filtered tree from the backend instead of navbar.json."""
+    _nav_helper.use_data(data)
+
 def get_all_parents():
     return _nav_helper.get_all_parents()
 
@@ -217,4 +308,10 @@ def get_path_for_main(main_id):
     return _nav_helper.get_path_for_main(main_id)
 
 def get_path_for_modular(modular_id):
-    return _nav_helper.get_path_for_modular(modular_id)
\ No newline at end of file
+    return _nav_helper.get_path_for_modular(modular_id)
+
+def get_visible_pages(role):
+    return _nav_helper.get_visible_pages(role)
+
+def get_access(roles):
+    return _nav_helper.get_access(roles)
\ No newline at end of file
@@ -1,4 +1,5 @@
 import requests
+from services import api_client
 from PyQt6.QtWidgets import (
     QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton,
     QTableWidget, QTableWidgetItem, QMessageBox
@@ -16,12 +17,18 @@ class AdminDashboard(QWidget):
         # ---- config your API base + endpoints here ----
         self.api_base = "http://127.0.0.1:8000/api/"
         self.users_url = self.api_base + "users/"
+        # Cursor link to the next page of users, None once everything is loaded
+        self.next_users_url = None
+        # Rows shown in the table, as the API returned them
+        self.users = []
         self.promote_url_tmpl = self.api_base +"users/" + "roles/org-officer/{user_id}/promote/"
         self.demote_url_tmpl  = self.api_base +"users/" + "roles/org-officer/{user_id}/demote/"
         self.promote_registrar = self.api_base +"users/" + "roles/registrar/{user_id}/promote/"
         self.demote_registrar = self.api_base +"users/" + "roles/registrar/{user_id}/demote/"
+        # Applies one role change to every selected user in a single request
+        self.batch_roles_url = self.api_base + "users/roles/batch/"
 
-        self.headers = {"Authorization": f"Bearer {self.token}"}
+        # Bearer token comes from the shared token manager so refreshed tokens are picked up
 
         self.setWindowTitle("Dashboard")
         self.resize(900, 600)
@@ -36,18 +43,21 @@ class AdminDashboard(QWidget):
         self.table = QTableWidget(0, 6, self)
         self.table.setHorizontalHeaderLabels(["ID", "Username", "Email", "First Name", "Last Name", "Groups"])
         self.table.setSelectionBehavior(self.table.SelectionBehavior.SelectRows)
-        self.table.setSelectionMode(self.table.SelectionMode.SingleSelection)
+        self.table.setSelectionMode(self.table.SelectionMode.ExtendedSelection)
         self.table.setEditTriggers(self.table.EditTrigger.NoEditTriggers)
         self.table.horizontalHeader().setStretchLastSection(True)
 
         # Buttons
         btns = QHBoxLayout()
         self.refresh_btn = QPushButton("Refresh")
+        self.load_more_btn = QPushButton("Load more")
+        self.load_more_btn.setEnabled(False)
         self.add_registrar=QPushButton("Promote to Registrar")
         self.remove_registrar=QPushButton("Retire from Registrar")
         self.promote_btn = QPushButton("Promote to org_officer")
         self.demote_btn  = QPushButton("Remove org_officer")
         btns.addWidget(self.refresh_btn)
+        btns.addWidget(self.load_more_btn)
         btns.addStretch()
         btns.addWidget(self.add_registrar)
         btns.addWidget(self.remove_registrar)
@@ -62,6 +72,7 @@ class AdminDashboard(QWidget):
 
         # Signals
         self.refresh_btn.clicked.connect(self.load_users)
+        self.load_more_btn.clicked.connect(self.load_more_users)
         self.add_registrar.clicked.connect(lambda: self.change_Registrar(True))
         self.remove_registrar.clicked.connect(lambda: self.change_Registrar(False))
         self.promote_btn.clicked.connect(lambda: self.change_officer(True))
@@ -83,8 +94,15 @@ class AdminDashboard(QWidget):
     #         self._error(f"Cannot reach backend: {e}")
 
     def load_users(self):
+        self._fetch_users(self.users_url, append=False)
+
+    def load_more_users(self):
+        if self.next_users_url:
+            self._fetch_users(self.next_users_url, append=True)
+
+    def _fetch_users(self, url, append):
         try:
-            r = requests.get(self.users_url, headers=self.headers, timeout=10)
+            r = api_client.get(url)
             if r.status_code != 200:
                 return self._error(f"Load users failed: HTTP {r.status_code} {r.text[:200]}")
 
@@ -93,19 +111,26 @@ class AdminDashboard(QWidget):
             # Handle both paginated (dict) and non-paginated (list)
             if isinstance(data, dict):
                 users = data.get("results", [])
+                self.next_users_url = data.get("next")
             elif isinstance(data, list):
                 users = data
+                self.next_users_url = None
             else:
                 users = []
+                self.next_users_url = None
 
-            self.populate_table(users)
+            self.populate_table(users, append=append)
+            self.load_more_btn.setEnabled(bool(self.next_users_url))
 
         except requests.RequestException as e:
             self._error(f"Cannot reach backend: {e}")
 
 
-    def populate_table(self, users):
-        self.table.setRowCount(0)
+    def populate_table(self, users, append=False):
+        if not append:
+            self.table.setRowCount(0)
+            self.users = []
+        self.users.extend(users)
         for u in users:
             # expected fields: id, username, email, first_name, last_name, groups (list of names)
             row = self.table.rowCount()
@@ -129,27 +154,48 @@ class AdminDashboard(QWidget):
                 self.table.setItem(row, col, item)
         self.table.resizeColumnsToContents()
 
-    def selected_user_id(self):
+    # -------- Router page state --------
+    def save_state(self):
+        """Loaded rows, cursor and scroll position, handed back to restore_state() when the Router rebuilds the page."""
+        return {
+            "users": list(self.users),
+            "next_users_url": self.next_users_url,
+            "scroll": self.table.verticalScrollBar().value(),
+        }
+
+    def restore_state(self, state):
+        self.populate_table(state["users"])
+        self.next_users_url = state["next_users_url"]
+        self.load_more_btn.setEnabled(bool(self.next_users_url))
+        self.table.verticalScrollBar().setValue(state["scroll"])
+
+    def selected_user_ids(self):
         rows = self.table.selectionModel().selectedRows()
         if not rows:
-            self._info("Select a user first.")
-            return None
-        row = rows[0].row()
-        item = self.table.item(row, 0)
-        return item.data(Qt.ItemDataRole.UserRole)
-    def change_Registrar(self, promote):
-        user_id = self.selected_user_id()
-        if user_id is None:
+            self._info("Select at least one user first.")
+            return []
+        return [self.table.item(r.row(), 0).data(Qt.ItemDataRole.UserRole) for r in rows]
+
+    def change_role(self, role, promote):
+        user_ids = self.selected_user_ids()
+        if not user_ids:
             return
-        url = (self.promote_registrar if promote else self.demote_registrar).format(user_id=user_id)
+        payload = {"role": role, "action": "grant" if promote else "revoke", "user_ids": user_ids}
         try:
-            r = requests.post(url, headers=self.headers, timeout=10)
-            if r.status_code not in (200, 201):
+            r = api_client.post(self.batch_roles_url, json=payload)
+            if r.status_code != 200:
                 return self._error(f"Role change failed: HTTP {r.status_code} {r.text[:200]}")
-            self._info(r.json().get("message", "Success"))
+            results = r.json().get("results", [])
+            summary = {}
+            for res in results:
+                summary[res["status"]] = summary.get(res["status"], 0) + 1
+            self._info(", ".join(f"{count} {status.replace('_', ' ')}" for status, count in summary.items()))
             self.load_users()
         except requests.RequestException as e:
             self._error(f"Cannot reach backend: {e}")
+
+    def change_Registrar(self, promote):
+        self.change_role("registrar", promote)
     # def removeRegistrar(self, promote):
     #     user_id = self.selected_user_id()
     #     if user_id is None:
@@ -165,18 +211,7 @@ class AdminDashboard(QWidget):
     #         self._error(f"Cannot reach backend: {e}")
 
     def change_officer(self, promote: bool):
-        user_id = self.selected_user_id()
-        if user_id is None:
-            return
-        url = (self.promote_url_tmpl if promote else self.demote_url_tmpl).format(user_id=user_id)
-        try:
-            r = requests.post(url, headers=self.headers, timeout=10)
-            if r.status_code not in (200, 201):
-                return self._error(f"Role change failed: HTTP {r.status_code} {r.text[:200]}")
-            self._info(r.json().get("message", "Success"))
-            self.load_users()
-        except requests.RequestException as e:
-            self._error(f"Cannot reach backend: {e}")
+        self.change_role("org_officer", promote)
 
     # -------- UI helpers --------
     def _info(self, msg):
@@ -34,6 +34,17 @@ class Dashboard(QWidget):
         # Add the dashboard widget to the layout
         layout.addWidget(dashboard_widget)
         self.setLayout(layout)
+        self.dashboard_widget = dashboard_widget
+
+    # The Router saves and restores page state through these, see router.Router._evict
+    def save_state(self):
+        if hasattr(self.dashboard_widget, "save_state"):
+            return self.dashboard_widget.save_state()
+        return None
+
+    def restore_state(self, state):
+        if hasattr(self.dashboard_widget, "restore_state"):
+            self.dashboard_widget.restore_state(state)
 
     def _create_default_widget(self, title, desc):
         """Create a fallback widget for invalid roles."""
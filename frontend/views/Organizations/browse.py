@@ -11,6 +11,9 @@ from views.Organizations.admin_organization import Admin
 print(f"Browse: Imported Student={Student is not None}, Faculty={Faculty is not None}, Officer={Officer is not None}, Admin={Admin is not None}")
 
 class Browse(QWidget):
+    # The organization views can't save their state yet, so the Router never evicts this page
+    keep_alive = True
+
     def __init__(self, username="", roles=None, primary_role="", token=""):
         super().__init__()
         print(f"Browse: Initializing for username={username}, primary_role={primary_role}, roles={roles}")
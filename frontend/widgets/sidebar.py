@@ -1,11 +1,10 @@
 import os
 from PyQt6.QtCore import Qt, QPoint
 from PyQt6.QtWidgets import QFrame, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QMenu, QScrollArea, QWidget, QSizePolicy
-from utils.db_helper import get_all_parents, get_main_by_parent, get_modular_by_main, get_access_level
 
 class CollapsibleSection(QFrame):
     def __init__(self, icon, text, router, user_role, parent_sidebar=None,
-                sub_indent=20, sub_spacing=2, sub_button_padding=8):
+                sub_indent=20, sub_spacing=2, sub_button_padding=8, mains=()):
         super().__init__()
         self.router = router
         self.user_role = user_role
@@ -39,56 +38,37 @@ class CollapsibleSection(QFrame):
         self.sub_layout.setSpacing(1)
         self.sub_layout.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
 
-        # Populate sub-items from database, filtered by access
-        parents = get_all_parents()
-        print(f"CollapsibleSection: Found {len(parents)} parents: {parents}")
-        for parent_id, parent_name in parents:
-            if parent_name == text:
-                mains = get_main_by_parent(parent_id)
-                print(f"CollapsibleSection: Found {len(mains)} mains for parent '{parent_name}': {mains}")
-                for main_id, main_name, _, access, _ in mains:
-                    # Check if user_role is in access (string or list)
-                    if (isinstance(access, str) and (access == self.user_role or self.user_role == "super_admin")) or \
-                    (isinstance(access, list) and (self.user_role in access or self.user_role == "super_admin")):
-                        print(f"CollapsibleSection: Adding main '{main_name}' (ID: {main_id}) to section '{text}'")
-
-                        # Container for the sub-item row
-                        row_container = QFrame()
-                        row_container.setObjectName("subRowContainer")
-
-                        row_layout = QHBoxLayout(row_container)
-                        row_layout.setContentsMargins(0, 0, 0, 0)
-                        row_layout.setSpacing(0)
-
-                        # Main clickable button that spans most of the width
-                        main_sub_btn = QPushButton(main_name)
-                        main_sub_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-                        main_sub_btn.setObjectName("subMainButton")
-                        main_sub_btn.setStyleSheet(f"padding: {sub_button_padding}px 35px;")
-                        main_sub_btn.clicked.connect(lambda checked, id=main_id: self.router.navigate(id))
-
-                        row_layout.addWidget(main_sub_btn, 1)  # Takes up most space
-
-                        # Optional popup button for modulars
-                        modulars = get_modular_by_main(main_id)
-                        print(f"CollapsibleSection: Found {len(modulars)} modulars for main '{main_name}': {modulars}")
-                        if modulars:
-                            # Filter modulars by inherited access
-                            filtered_modulars = [
-                                mod for mod in modulars
-                                if (isinstance(access, str) and (access == self.user_role or self.user_role == "super_admin")) or
-                                (isinstance(access, list) and (self.user_role in access or self.user_role == "super_admin"))
-                            ]
-                            print(f"CollapsibleSection: Filtered {len(filtered_modulars)} modulars for main '{main_name}': {filtered_modulars}")
-                            if filtered_modulars:
-                                popup_btn = QPushButton("▶")
-                                popup_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-                                popup_btn.setObjectName("popupButton")
-                                popup_btn.clicked.connect(lambda _, mods=filtered_modulars, mid=main_id: self.show_house_system_popup(popup_btn, mods, mid))
-                                row_layout.addWidget(popup_btn, 0)
-
-                        self.sub_layout.addWidget(row_container)
-                        self.sub_items.append(row_container)
+        # Populate sub-items from the role-access matrix, already filtered by access
+        for (main_id, main_name, _, _, _), modulars in mains:
+            print(f"CollapsibleSection: Adding main '{main_name}' (ID: {main_id}) to section '{text}'")
+
+            # Container for the sub-item row
+            row_container = QFrame()
+            row_container.setObjectName("subRowContainer")
+
+            row_layout = QHBoxLayout(row_container)
+            row_layout.setContentsMargins(0, 0, 0, 0)
+            row_layout.setSpacing(0)
+
+            # Main clickable button that spans most of the width
+            main_sub_btn = QPushButton(main_name)
+            main_sub_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+            main_sub_btn.setObjectName("subMainButton")
+            main_sub_btn.setStyleSheet(f"padding: {sub_button_padding}px 35px;")
+            main_sub_btn.clicked.connect(lambda checked, id=main_id: self.router.navigate(id))
+
+            row_layout.addWidget(main_sub_btn, 1)  # Takes up most space
+
+            # Optional popup button for modulars
+            if modulars:
+                popup_btn = QPushButton("▶")
+                popup_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+                popup_btn.setObjectName("popupButton")
+                popup_btn.clicked.connect(lambda _, btn=popup_btn, mods=modulars, mid=main_id: self.show_house_system_popup(btn, mods, mid))
+                row_layout.addWidget(popup_btn, 0)
+
+            self.sub_layout.addWidget(row_container)
+            self.sub_items.append(row_container)
 
         # Keep section closed by default, even with sub-items
         self.sub_container.setVisible(False)
@@ -211,29 +191,22 @@ class Sidebar(QFrame):
 
         # Add sections to content
         self.sections = []
-        parents = get_all_parents()
-        print(f"Sidebar: Found {len(parents)} parents: {parents}")
-        for parent_id, parent_name in parents:
-            mains = get_main_by_parent(parent_id)
-            print(f"Sidebar: Found {len(mains)} mains for parent '{parent_name}': {mains}")
-            has_accessible_main = any(
-                (isinstance(access, str) and (access == self.user_role or self.user_role == "super_admin")) or
-                (isinstance(access, list) and (self.user_role in access or self.user_role == "super_admin"))
-                for _, _, _, access, _ in mains
-            )
-            if has_accessible_main:
-                icon_map = {
-                    "Dashboard": "🏠",
-                    "Academics": "📚", 
-                    "Organizations": "👥",
-                    "Campus": "🏫",
-                }
-                icon = icon_map.get(parent_name, "🛠️")
-
-                section = CollapsibleSection(icon, parent_name, self.router, self.user_role, self)
-                self.sections.append(section)
-                self.content_layout.addWidget(section)
-                print(f"Sidebar: Added section '{parent_name}' with icon '{icon}'")
+        # The Router's role-access matrix: only parents with something the user's roles can open
+        sections = self.router.access.sections
+        print(f"Sidebar: {len(sections)} sections for roles {self.router.access.roles}")
+        icon_map = {
+            "Dashboard": "🏠",
+            "Academics": "📚", 
+            "Organizations": "👥",
+            "Campus": "🏫",
+        }
+        for _, parent_name, mains in sections:
+            icon = icon_map.get(parent_name, "🛠️")
+
+            section = CollapsibleSection(icon, parent_name, self.router, self.user_role, self, mains=mains)
+            self.sections.append(section)
+            self.content_layout.addWidget(section)
+            print(f"Sidebar: Added section '{parent_name}' with icon '{icon}'")
 
         self.content_layout.addStretch()
 